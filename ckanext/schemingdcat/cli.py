@@ -378,11 +378,10 @@ def clean_stats(verbose):
 @click.option("-v", "--verbose", is_flag=True, help='Enable verbose output.')
 def update_stats(verbose):
     """
-    Cleans the statistics table by deleting all existing records and recreating the table.
+    Recomputes all the statistics of the statistics table from the current data.
 
-    This command performs a complete reset of the statistics table used by the SchemingDCAT extension.
-    It deletes all existing records to ensure a fresh state and then recreates the table schema.
-    Use this command with caution, as it will remove all existing statistics data.
+    When the statistics are updated incrementally (`ckanext.schemingdcat.open_data_statistics.incremental`),
+    run this command periodically (e.g. with cron) to reconcile the counters with the catalogue.
 
     Args:
         verbose (bool): Enables verbose output if set.
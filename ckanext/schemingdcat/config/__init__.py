@@ -99,6 +99,12 @@ __all__ = [
     'CQL_QUERY_DEFAULT',
     'CQL_SEARCH_TERM_DEFAULT',
     'OUTPUT_SCHEMA',
+    'CSW_PAGE_SIZE',
+    'CSW_PAGE_WORKERS',
+    'CSW_PAGE_RETRIES',
+    'CSW_PAGE_RETRY_DELAY',
+    'CSW_MODIFIED_PROPERTY',
+    'CSW_EXTRACTION_WORKERS',
     'INSPIRE_HVD_CATEGORY',
     'INSPIRE_HVD_APPLICABLE_LEGISLATION',
 ]
\ No newline at end of file
@@ -13,6 +13,15 @@ CSW_DEFAULT_LIMIT = None
 CQL_QUERY_DEFAULT = 'csw:AnyText'
 CQL_SEARCH_TERM_DEFAULT = None
 OUTPUT_SCHEMA = 'http://www.isotc211.org/2005/gmd'
+CSW_PAGE_SIZE = 75
+# GetRecords pages requested at the same time, and retries of a failed page
+CSW_PAGE_WORKERS = 4
+CSW_PAGE_RETRIES = 2
+CSW_PAGE_RETRY_DELAY = 2
+# Queryable of the modified-since constraint of the incremental harvests
+CSW_MODIFIED_PROPERTY = 'apiso:Modified'
+# Worker processes of the record extraction, 0 extracts the records in the gather process
+CSW_EXTRACTION_WORKERS = 0
 
 # Define normalized protocol constants
 DOWNLOAD_PROTOCOL = "WWW:DOWNLOAD"
@@ -2,6 +2,7 @@ from ckanext.schemingdcat.harvesters.base import SchemingDCATHarvester
 from ckanext.schemingdcat.harvesters.ckan import SchemingDCATCKANHarvester
 from ckanext.schemingdcat.harvesters.xls import SchemingDCATXLSHarvester
 from ckanext.schemingdcat.harvesters.sql.postgres import SchemingDCATPostgresHarvester
+from ckanext.schemingdcat.harvesters.sql.sqlite import SchemingDCATSQLiteHarvester
 from ckanext.schemingdcat.harvesters.csw import SchemingDCATCSWHarvester
 
-__all__ = ['SchemingDCATHarvester', 'SchemingDCATCKANHarvester', 'SchemingDCATXLSHarvester', 'SchemingDCATPostgresHarvester', 'SchemingDCATCSWHarvester']
\ No newline at end of file
+__all__ = ['SchemingDCATHarvester', 'SchemingDCATCKANHarvester', 'SchemingDCATXLSHarvester', 'SchemingDCATPostgresHarvester', 'SchemingDCATSQLiteHarvester', 'SchemingDCATCSWHarvester']
\ No newline at end of file
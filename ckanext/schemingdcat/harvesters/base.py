@@ -1,3 +1,4 @@
+import copy
 import logging
 import uuid
 from functools import lru_cache
@@ -15,11 +16,15 @@ from urllib.parse import urlparse
 from urllib.error import URLError, HTTPError
 import mimetypes
 import requests
+import sqlalchemy as sa
+import numpy as np
+import pandas as pd
 
 import ckan.logic as logic
 from ckan.model import Session
 from ckan.logic.schema import default_create_package_schema
 from ckan.lib.navl.validators import ignore_missing, ignore
+from ckan.lib.munge import munge_title_to_name
 from ckan import plugins as p
 from ckan import model
 from ckantoolkit import config
@@ -66,6 +71,7 @@ class SchemingDCATHarvester(HarvesterBase):
     _remote_schema = None
     _local_schema_name = None
     _remote_schema_name = None
+    _list_fields_excluded = ()
     _supported_schemas = set()
     _readme = "https://github.com/mjanez/ckanext-schemingdcat?tab=readme-ov-file"
     config = None
@@ -76,6 +82,11 @@ class SchemingDCATHarvester(HarvesterBase):
     _source_date_format = '%Y-%m-%d'
     _dataset_default_values = {}
     _distribution_default_values = {}
+    _bulk_chunk_size = 1000
+    _content_hash_excluded_fields = ('name',)
+    _names_taken = set()
+    _names_seeded = set()
+    _name_counters = {}
     _field_mapping_validator = FieldMappingValidator()
     _field_mapping_validator_versions = _field_mapping_validator.validators.keys()
     _field_mapping_info = {
@@ -143,6 +154,63 @@ class SchemingDCATHarvester(HarvesterBase):
         else:
             self.config = {}
 
+    def _get_config_hash(self):
+        """
+        Returns a stable hash of the harvest source config, so the state stored by a previous
+        gather stage (e.g. validators of the remote file, watermarks) is not reused after the
+        config has changed.
+
+        Returns:
+            str: The SHA256 hex digest of the config.
+        """
+        content = json.dumps(self.config or {}, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _get_source_state(self, source_id, key):
+        """
+        Returns the state stored by a previous gather stage in an extra of the harvest source
+        (e.g. validators of the remote file, watermarks).
+
+        Args:
+            source_id (str): The harvest source id.
+            key (str): The key of the extra.
+
+        Returns:
+            dict: The stored state, empty if there is none or it is not valid JSON.
+        """
+        extra = model.Session.query(model.PackageExtra) \
+            .filter(model.PackageExtra.package_id == source_id) \
+            .filter(model.PackageExtra.key == key) \
+            .first()
+        if not extra or not extra.value:
+            return {}
+
+        try:
+            state = json.loads(extra.value)
+        except ValueError:
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _set_source_state(self, source_id, key, value):
+        """
+        Stores the state of a gather stage in an extra of the harvest source, as JSON.
+
+        Args:
+            source_id (str): The harvest source id.
+            key (str): The key of the extra.
+            value (dict): The state.
+        """
+        value = json.dumps(value)
+        extra = model.Session.query(model.PackageExtra) \
+            .filter(model.PackageExtra.package_id == source_id) \
+            .filter(model.PackageExtra.key == key) \
+            .first()
+        if extra:
+            extra.value = value
+        else:
+            model.Session.add(model.PackageExtra(package_id=source_id, key=key, value=value))
+        model.Session.commit()
+
     def _set_basic_validate_config(self, config):
         """
         Validates and sets the basic configuration for the harvester.
@@ -690,6 +758,188 @@ class SchemingDCATHarvester(HarvesterBase):
     
         return standardized_dataset
 
+    @lru_cache(maxsize=8)
+    def _get_list_fields(self, schema_type="dataset"):
+        """
+        Retrieves the fields of the local schema whose values are lists (e.g. tags, groups or multiple
+        choice fields), computed once per schema.
+
+        Args:
+            schema_type (str, optional): The type of schema. Defaults to 'dataset'.
+
+        Returns:
+            frozenset: The names of the list fields.
+        """
+        schema = self._get_local_schema(schema_type)
+        list_fields = {'groups'} | {
+            field['field_name']
+            for field in schema['dataset_fields']
+            if any(keyword in field.get(field_type, '').lower() for keyword in ['list', 'multiple', 'tag_string', 'tag', 'group'] for field_type in ['validators', 'output_validators', 'preset']) or 'groups' in field['field_name'].lower()
+        }
+        return frozenset(list_fields - set(self._list_fields_excluded))
+
+    @staticmethod
+    def _set_string_to_list(value):
+        """
+        Converts a comma-separated string into a list of items.
+
+        Args:
+            value (str): The comma-separated string to convert.
+
+        Returns:
+            list: A list of items, with leading and trailing whitespace removed from each item,
+                  and leading dashes from each item.
+
+        Example:
+            >>> _set_string_to_list('apple, banana, -orange')
+            ['apple', 'banana', 'orange']
+        """
+        return [x.strip(" -") for x in value.split(',') if x.strip()]
+
+    def _split_list_column(self, column):
+        """
+        Converts the comma-separated strings of a DataFrame column into lists of items.
+
+        Each distinct string is split only once with `_set_string_to_list`, and every row gets its
+        own copy of the list. Values that are not strings are kept as they are.
+
+        Args:
+            column (pd.Series): The column to split.
+
+        Returns:
+            pd.Series: The column with lists of items.
+        """
+        if pd.api.types.infer_dtype(column, skipna=False) == 'string':
+            codes, uniques = pd.factorize(column)
+            lists = [self._set_string_to_list(value) for value in uniques]
+            return pd.Series([lists[code][:] for code in codes], index=column.index, dtype=object)
+
+        is_string = (column.map(type) == str).to_numpy()
+        if not is_string.any():
+            return column
+
+        codes, uniques = pd.factorize(column[is_string])
+        lists = [self._set_string_to_list(value) for value in uniques]
+
+        values = column.tolist()
+        for position, code in zip(np.flatnonzero(is_string), codes):
+            values[position] = lists[code][:]
+        return pd.Series(values, index=column.index, dtype=object)
+
+    def _split_list_columns(self, df):
+        """
+        Converts the values of the list fields of the local schema (see `_get_list_fields`) from
+        comma-separated strings into lists, column by column.
+
+        Args:
+            df (pd.DataFrame): The datasets DataFrame, with the local schema field names.
+
+        Returns:
+            pd.DataFrame: The DataFrame with the list fields split.
+        """
+        list_fields = self._get_list_fields()
+        for column in df.columns:
+            if column in list_fields and not pd.api.types.is_numeric_dtype(df[column]):
+                df[column] = self._split_list_column(df[column])
+        return df
+
+    def _add_distributions_and_datadictionaries_to_datasets(self, table_datasets, table_distributions_grouped, table_datadictionaries_grouped, identifier_field='identifier', alternate_identifier_field='alternate_identifier', inspire_id_field='inspire_id', datadictionary_id_field="id", matched_ids=None):
+        """
+        Add distributions (CKAN resources) and datadictionaries to each dataset object.
+
+        Builds a single index from every identifier of the datasets to their positions, and then
+        attaches each group of distributions (and their datadictionaries) in one pass over the groups.
+        Distributions and datadictionaries that do not match any dataset/distribution are reported.
+
+        Args:
+            table_datasets (list): List of dataset objects.
+            table_distributions_grouped (dict): Dictionary of distributions grouped by dataset identifier.
+            table_datadictionaries_grouped (dict): Dictionary of datadictionaries grouped by distribution identifier.
+            identifier_field (str, optional): Field name for the identifier. Defaults to 'identifier'.
+            alternate_identifier_field (str, optional): Field name for the alternate identifier. Defaults to 'alternate_identifier'.
+            inspire_id_field (str, optional): Field name for the inspire id. Defaults to 'inspire_id'.
+            datadictionary_id_field (str, optional): Field name for the datadictionary id. Defaults to 'id'.
+            matched_ids (dict, optional): The ids of the distributions and datadictionaries groups already
+                matched, updated by this method. If provided, the orphan rows are not reported here (e.g. the
+                datasets are processed in chunks), see `_report_orphan_rows`.
+
+        Returns:
+            list: List of dataset objects with distributions (CKAN resources) and datadictionaries added.
+
+        Notes:
+            If 'dataset_id_field' is specified in the Harvester configuration, it will be used as the only identifier field.
+            Otherwise, distributions are matched on 'identifier_field', 'alternate_identifier_field' and 'inspire_id_field'.
+            If the same id is used by several fields, the first field in that order wins.
+        """
+        dataset_id_field = (self.config or {}).get('dataset_id_field', None)
+        id_fields = [dataset_id_field] if dataset_id_field else [identifier_field, alternate_identifier_field, inspire_id_field]
+
+        report_orphans = matched_ids is None
+        if matched_ids is None:
+            matched_ids = {'distributions': set(), 'datadictionaries': set()}
+        table_datadictionaries_grouped = table_datadictionaries_grouped or {}
+
+        try:
+            datasets = [{**d, 'resources': []} for d in table_datasets]
+
+            # Index every identifier of the datasets: id -> (priority of the id field, dataset positions)
+            dataset_index = {}
+            for priority, id_field in enumerate(id_fields):
+                for position, dataset in enumerate(datasets):
+                    dataset_id = dataset.get(id_field)
+                    if not dataset_id:
+                        continue
+                    indexed = dataset_index.get(dataset_id)
+                    if indexed is None:
+                        dataset_index[dataset_id] = (priority, [position])
+                    elif indexed[0] == priority:
+                        indexed[1].append(position)
+
+            for dataset_id, distributions in (table_distributions_grouped or {}).items():
+                indexed = dataset_index.get(dataset_id)
+                if indexed is None:
+                    continue
+                matched_ids['distributions'].add(dataset_id)
+
+                for position in indexed[1]:
+                    resources = datasets[position]['resources']
+                    for dr in distributions:
+                        datadictionaries = table_datadictionaries_grouped.get(dr.get(datadictionary_id_field), [])
+                        if datadictionaries:
+                            matched_ids['datadictionaries'].add(dr[datadictionary_id_field])
+                        resources.append({**dr, 'datadictionaries': datadictionaries})
+
+        except Exception as e:
+            log.error("Error while adding distributions and datadictionaries to datasets: %s", str(e))
+            raise
+
+        if report_orphans:
+            self._report_orphan_rows(table_distributions_grouped, table_datadictionaries_grouped, matched_ids)
+
+        return datasets
+
+    @staticmethod
+    def _report_orphan_rows(table_distributions_grouped, table_datadictionaries_grouped, matched_ids):
+        """
+        Logs the distributions and datadictionaries that do not match any dataset/distribution.
+
+        Args:
+            table_distributions_grouped (dict): Dictionary of distributions grouped by dataset identifier.
+            table_datadictionaries_grouped (dict): Dictionary of datadictionaries grouped by distribution identifier.
+            matched_ids (dict): The ids of the distributions and datadictionaries groups that were matched.
+
+        Returns:
+            dict: The ids of the orphan groups of distributions and datadictionaries.
+        """
+        orphans = {}
+        for kind, grouped in (('distributions', table_distributions_grouped), ('datadictionaries', table_datadictionaries_grouped)):
+            orphans[kind] = [group_id for group_id in (grouped or {}) if group_id not in matched_ids[kind]]
+            if orphans[kind]:
+                orphan_rows = sum(len(grouped[group_id]) for group_id in orphans[kind])
+                log.warning('%s %s rows do not match any %s, ids: %s', orphan_rows, kind, 'dataset' if kind == 'distributions' else 'distribution', orphans[kind][:20])
+
+        return orphans
+
     def _standardize_df_fields_from_field_mapping(self, df, field_mapping):
         """
         Standardizes the DataFrame columns based on the field_mapping.
@@ -697,84 +947,97 @@ class SchemingDCATHarvester(HarvesterBase):
         Args:
             df (pd.DataFrame): The DataFrame to standardize.
             field_mapping (dict): A dictionary mapping the current column names to the desired column names.
+
+        Returns:
+            tuple: The standardized DataFrame and a copy of the field_mapping with the standardized field names.
+        """
+        plan = self._get_field_mapping_plan(field_mapping)
+        return self._apply_field_mapping_plan(df, plan), plan['field_mapping']
+
+    def _get_field_mapping_plan(self, field_mapping):
+        """
+        Computes the renames and merges of columns that standardize the DataFrames of a field_mapping.
+
+        The field_mapping is not modified, so the plan can be computed once and applied to each chunk
+        of rows read from a source with `_apply_field_mapping_plan`.
+
+        Args:
+            field_mapping (dict): A dictionary mapping the current column names to the desired column names.
+
+        Returns:
+            dict: The plan, with the column renames, the merged columns and a copy of the field_mapping
+                with the standardized field names.
         """
 
-        def rename_and_update(df, old_name, new_name, value_dict):
+        def rename_and_update(renames, old_name, new_name, value_dict):
             if isinstance(old_name, list):
                 # If old_name is a list, iterate over its elements
                 for name in old_name:
-                    df.rename(columns={name: new_name}, inplace=True)
+                    renames[name] = new_name
             else:
-                df.rename(columns={old_name: new_name}, inplace=True)
+                renames[old_name] = new_name
             value_dict['field_name'] = new_name
 
-        def merge_values(row, fields):
-            """
-            Merges the values of specified fields in a row into a single string.
+        field_mapping = copy.deepcopy(field_mapping)
+        plan = {
+            'field_mapping': field_mapping,
+            'use_field_positions': False,
+            'renames': {},
+            'merged_columns': {},
+        }
+        if field_mapping is None:
+            return plan
 
-            This function takes a dictionary (row) and a list of fields. It checks if each field is present in the row.
-            If the field value is a list, it joins the list into a string with comma separators.
-            If the field value is a string and contains a comma, it strips the string of leading and trailing whitespace.
-            If the field value is neither a list nor a string with a comma, it converts the value to a string and strips it of leading and trailing whitespace.
-            Finally, it joins all the field values into a single string with comma separators.
+        # Check if any field mapping contains 'field_position'
+        plan['use_field_positions'] = any('field_position' in value for value in field_mapping.values())
+        renames = plan['renames']
+        merged_columns = plan['merged_columns']
 
-            Args:
-                row (dict): The row of data as a dictionary.
-                fields (list): The list of fields to merge.
+        for key, value in field_mapping.items():
+            if 'field_position' in value:
+                if isinstance(value['field_position'], list):
+                    merged_columns[key] = value['field_position']
+                else:
+                    rename_and_update(renames, value['field_position'], key, value)
+            elif 'field_name' in value:
+                if isinstance(value['field_name'], list):
+                    merged_columns[key] = value['field_name']
+                else:
+                    rename_and_update(renames, value['field_name'], key, value)
+            elif isinstance(value, dict) and 'languages' in value:
+                for lang, lang_value in value['languages'].items():
+                    if 'field_position' in lang_value:
+                        rename_and_update(renames, lang_value['field_position'].upper(), f"{key}-{lang}", lang_value)
+                    elif 'field_name' in lang_value:
+                        rename_and_update(renames, lang_value['field_name'], f"{key}-{lang}", lang_value)
+                    # translated_fields only str
 
-            Returns:
-                str: The merged field values as a single string.
+        return plan
 
-            """
-            merged = []
-            for field in fields:
-                if field in row:  # Check if the field is in the row
-                    val = row[field]
-                    if isinstance(val, list):
-                        merged.append(','.join(str(v).strip() for v in val))
-                    elif isinstance(val, str) and ',' in val:
-                        merged.append(val.strip())
-                    else:
-                        merged.append(str(val).strip())
-            return ','.join(merged)
+    def _apply_field_mapping_plan(self, df, plan):
+        """
+        Standardizes the DataFrame columns with a plan of `_get_field_mapping_plan`.
 
-        removed_columns = []
+        Args:
+            df (pd.DataFrame): The DataFrame to standardize.
+            plan (dict): The plan of the field_mapping.
+
+        Returns:
+            pd.DataFrame: The standardized DataFrame.
+        """
+        field_mapping = plan['field_mapping']
         reserved_columns = ['dataset_id', 'identifier', 'resource_id', 'datadictionary_id']
 
         if field_mapping is not None:
-            # Check if any field mapping contains 'field_position'
-            if any('field_position' in value for value in field_mapping.values()):
+            if plan['use_field_positions']:
                 # Map the DataFrame columns to spreadsheet format
                 df = self._map_dataframe_columns_to_spreadsheet_format(df)
 
-            for key, value in field_mapping.items():
-                if 'field_position' in value:
-                    if isinstance(value['field_position'], list):
-                        # Merge fields
-                        # Apply the function to each row in the dataframe
-                        df[key] = df.apply(lambda row: merge_values(row, value['field_position']), axis=1)
-                        # Drop the original value columns
-                        for field in value['field_position']:
-                            df.drop(field, axis=1, inplace=True)
-                    else:
-                        rename_and_update(df, value['field_position'], key, value)
-                elif 'field_name' in value:
-                    if isinstance(value['field_name'], list):
-                        # Merge fields
-                        # Apply the function to each row in the dataframe
-                        df[key] = df.apply(lambda row: merge_values(row, value['field_name']), axis=1)
-                        # Drop the original value columns
-                        for field in value['field_name']:
-                            df.drop(field, axis=1, inplace=True)
-                    else:
-                        rename_and_update(df, value['field_name'], key, value)
-                elif isinstance(value, dict) and 'languages' in value:
-                    for lang, lang_value in value['languages'].items():
-                        if 'field_position' in lang_value:
-                            rename_and_update(df, lang_value['field_position'].upper(), f"{key}-{lang}", lang_value)
-                        elif 'field_name' in lang_value:
-                            rename_and_update(df, lang_value['field_name'], f"{key}-{lang}", lang_value)
-                        # translated_fields only str
+            merged_columns = {key: self._merge_columns(df, fields) for key, fields in plan['merged_columns'].items()}
+            merged_fields = [field for fields in plan['merged_columns'].values() for field in fields]
+
+            # Drop the original value columns of the merged fields, rename and add the merged columns
+            df = df.drop(columns=merged_fields, errors='ignore').rename(columns=plan['renames']).assign(**merged_columns)
 
         # Calculate the difference between the DataFrame columns and the field_mapping keys
         log.debug('field_mapping: %s', field_mapping)
@@ -791,7 +1054,40 @@ class SchemingDCATHarvester(HarvesterBase):
 
         log.warning(f"Removed unused columns from remote sheet: {removed_columns}")
 
-        return df, field_mapping
+        return df
+
+    @staticmethod
+    def _merge_columns(df, fields):
+        """
+        Merges the values of the specified columns into a single comma-separated string column.
+
+        Column-wise version of merging the fields of each row: list values are joined with commas,
+        any other value is converted to a string and stripped of leading and trailing whitespace,
+        and missing values are merged as empty strings. Fields that are not columns of the
+        DataFrame are ignored.
+
+        Args:
+            df (pd.DataFrame): The DataFrame with the columns to merge.
+            fields (list): The list of columns to merge.
+
+        Returns:
+            pd.Series: The merged values of each row.
+        """
+        parts = []
+        for field in fields:
+            if field not in df.columns:
+                continue
+            column = df[field]
+            values = column.fillna('').astype(str).str.strip()
+            if column.dtype == object:
+                is_list = column.map(type) == list
+                if is_list.any():
+                    values[is_list] = column[is_list].map(lambda val: ','.join(str(v).strip() for v in val))
+            parts.append(values)
+
+        if not parts:
+            return pd.Series('', index=df.index, dtype=object)
+        return parts[0].str.cat(parts[1:], sep=',') if len(parts) > 1 else parts[0]
 
     def _validate_remote_schema(
         self,
@@ -1949,6 +2245,124 @@ class SchemingDCATHarvester(HarvesterBase):
 
         return name
 
+    @staticmethod
+    def _name_from_title(title):
+        """
+        Generates the ideal CKAN name for a title, as `HarvesterBase._gen_new_name` does.
+
+        Args:
+            title (str): The dataset title.
+
+        Returns:
+            str: The munged name.
+        """
+        return re.sub('-+', '-', munge_title_to_name(title))
+
+    def _init_name_allocator(self, datasets):
+        """
+        Initializes the name allocator used by `_allocate_name` for a gather stage.
+
+        The set of taken names is seeded with the existing package names that share the
+        names generated from the titles of the datasets without name, retrieved in chunked
+        bulk queries instead of one query per dataset.
+
+        Args:
+            datasets (list): The dataset dicts to be named.
+
+        Returns:
+            None
+        """
+        self._names_taken = set()
+        self._name_counters = {}
+        self._names_seeded = set()
+
+        candidates = self._seed_names_for_datasets(datasets)
+
+        log.debug('Name allocator seeded with %s existing names for %s candidates', len(self._names_taken), len(candidates))
+
+    def _seed_names_for_datasets(self, datasets):
+        """
+        Seeds the name allocator with the existing package names that share the names
+        generated from the titles of the datasets without name. Used by the gather stages
+        that name their datasets in batches (e.g. a page of CSW records at a time).
+
+        Args:
+            datasets (list): The dataset dicts to be named.
+
+        Returns:
+            set: The names generated from the titles.
+        """
+        candidates = {
+            self._name_from_title(dataset['title'])
+            for dataset in datasets
+            if not dataset.get('name') and isinstance(dataset.get('title'), str)
+        }
+        self._seed_names_taken(candidates)
+        return candidates
+
+    def _seed_names_taken(self, names):
+        """
+        Adds to the taken names the existing package names equal to the given names or
+        sharing them as prefix (`<name>-<suffix>`), in chunked bulk queries.
+
+        Args:
+            names (set): The candidate names.
+
+        Returns:
+            None
+        """
+        names = sorted(set(names) - self._names_seeded)
+        chunk_size = self._get_bulk_chunk_size()
+
+        for start in range(0, len(names), chunk_size):
+            chunk = names[start:start + chunk_size]
+            query = model.Session.query(model.Package.name) \
+                .filter(sa.or_(
+                    model.Package.name.in_(chunk),
+                    *[model.Package.name.like(f'{name}-%') for name in chunk]
+                ))
+            self._names_taken.update(name for name, in query)
+
+        self._names_seeded.update(names)
+
+    def _allocate_name(self, name=None, title=None):
+        """
+        Allocates a unique name for a dataset in the current gather stage.
+
+        If the dataset has no name, it is generated from the title. Names already taken
+        get a numeric suffix, using a per-name counter so repeated names are resolved in
+        constant time.
+
+        Args:
+            name (str, optional): The dataset name, if any.
+            title (str, optional): The dataset title, used if there is no name.
+
+        Returns:
+            str: The allocated unique name.
+
+        Raises:
+            ValueError: If neither name nor title are provided.
+        """
+        if not name:
+            if not isinstance(title, str) or not title:
+                raise ValueError('Dataset name could not be generated. Need at least: name or title')
+            name = self._name_from_title(title)
+            if name not in self._names_seeded:
+                # Title changed after the allocator was seeded (e.g. translated fields)
+                self._seed_names_taken({name})
+
+        allocated = name
+        if allocated in self._names_taken:
+            counter = self._name_counters.get(name, 0)
+            while allocated in self._names_taken:
+                counter += 1
+                suffix = f'-{counter}'
+                allocated = name[:model.PACKAGE_NAME_MAX_LENGTH - len(suffix)] + suffix
+            self._name_counters[name] = counter
+
+        self._names_taken.add(allocated)
+        return allocated
+
     def _fill_translated_properties(self, package_dict):
         """
         Fills properties without the _translated suffix using the default language or the first available translation.
@@ -1979,6 +2393,187 @@ class SchemingDCATHarvester(HarvesterBase):
     
         return package_dict
 
+    def _get_bulk_chunk_size(self):
+        """
+        Returns the number of harvest objects persisted per bulk statement.
+
+        Uses the ``bulk_chunk_size`` option of the harvest source config if set,
+        otherwise the class default ``_bulk_chunk_size``.
+
+        Returns:
+            int: The chunk size.
+        """
+        try:
+            chunk_size = int((self.config or {}).get("bulk_chunk_size", self._bulk_chunk_size))
+        except (TypeError, ValueError):
+            chunk_size = self._bulk_chunk_size
+        return max(chunk_size, 1)
+
+    def _get_content_hash(self, dataset_dict):
+        """
+        Generates a stable hash of a normalized dataset dict.
+
+        The dict is serialized with sorted keys together with the harvest source config,
+        so a change in the field mapping or default values also changes the hash. Fields
+        that are regenerated on every run (e.g. `name`) are excluded.
+
+        Args:
+            dataset_dict (dict): The dataset dict gathered from the source.
+
+        Returns:
+            str: The SHA256 hex digest of the normalized dataset dict.
+        """
+        normalized = {
+            key: value for key, value in dataset_dict.items()
+            if key not in self._content_hash_excluded_fields
+        }
+        content = json.dumps(
+            {'config': self.config or {}, 'dataset': normalized},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(',', ':'),
+            default=str
+        )
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _get_current_content_hashes(self, harvest_source_id):
+        """
+        Retrieves the content hashes stored on the current harvest objects of a source.
+
+        Args:
+            harvest_source_id (str): The harvest source id.
+
+        Returns:
+            dict: A dict of content hashes by GUID.
+        """
+        query = model.Session.query(HarvestObject.guid, HarvestObjectExtra.value) \
+            .join(HarvestObjectExtra, HarvestObjectExtra.harvest_object_id == HarvestObject.id) \
+            .filter(HarvestObject.current == True) \
+            .filter(HarvestObject.harvest_source_id == harvest_source_id) \
+            .filter(HarvestObjectExtra.key == 'content_hash')
+
+        return {guid: content_hash for guid, content_hash in query}
+
+    def _save_harvest_objects(self, harvest_job, new, change, delete, datasets_to_harvest, guid_to_package_id, current_hashes=None):
+        """
+        Persists the harvest objects of a gather stage using chunked bulk statements.
+
+        Each chunk inserts its `HarvestObject` rows and their `status` and `content_hash`
+        extras in two bulk INSERTs and commits once. The objects previously harvested for the
+        GUIDs to delete stay current, the import stage flags them as not current once their
+        package is deleted (see `_set_deleted_objects_not_current`).
+
+        GUIDs to update whose content hash matches the one of the current harvest object
+        are skipped, unless the `force_all` option is set.
+
+        Args:
+            harvest_job (HarvestJob): The harvest job object.
+            new (set): GUIDs to create.
+            change (set): GUIDs to update.
+            delete (set): GUIDs to delete (in the DB but not in the source).
+            datasets_to_harvest (dict): Dataset dicts of the source by GUID.
+            guid_to_package_id (dict): Package ids of the current harvest objects by GUID.
+            current_hashes (dict, optional): Content hashes of the current harvest objects by GUID.
+                Retrieved from the DB if not provided, gather stages that save their objects in
+                batches pass them to retrieve them only once.
+
+        Returns:
+            list: A list of dicts with the `id`, `name` and `identifier` of each harvest object created.
+        """
+        source_id = harvest_job.source_id or harvest_job.source.id
+        force_all = (self.config or {}).get('force_all', False) is True
+        if not change or force_all:
+            current_hashes = {}
+        elif current_hashes is None:
+            current_hashes = self._get_current_content_hashes(source_id)
+        rows = []
+        unchanged = 0
+
+        for status, guids in (('new', new), ('change', change)):
+            for guid in guids:
+                dataset = datasets_to_harvest.get(guid)
+                if not dataset:
+                    log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
+                    continue
+                content_hash = self._get_content_hash(dataset)
+                if status == 'change' and current_hashes.get(guid) == content_hash:
+                    unchanged += 1
+                    continue
+                rows.append((guid, status, dataset, guid_to_package_id.get(guid), content_hash))
+
+        if unchanged:
+            log.info('Skipped %s unchanged datasets (same content hash as the current harvest object)', unchanged)
+
+        # Deleted datasets are not in the source, the import stage only needs the package_id
+        for guid in delete:
+            rows.append((guid, 'delete', None, guid_to_package_id.get(guid), None))
+
+        ids = []
+        chunk_size = self._get_bulk_chunk_size()
+
+        try:
+            for start in range(0, len(rows), chunk_size):
+                objects = []
+                extras = []
+                for guid, status, dataset, package_id, content_hash in rows[start:start + chunk_size]:
+                    object_id = str(uuid.uuid4())
+                    objects.append({
+                        'id': object_id,
+                        'guid': guid,
+                        'current': False,
+                        'gathered': datetime.utcnow(),
+                        'content': json.dumps(dataset) if dataset is not None else None,
+                        'harvest_job_id': harvest_job.id,
+                        'harvest_source_id': source_id,
+                        'package_id': package_id,
+                        'state': 'WAITING',
+                    })
+                    extras.append({
+                        'id': str(uuid.uuid4()),
+                        'harvest_object_id': object_id,
+                        'key': 'status',
+                        'value': status,
+                    })
+                    if content_hash:
+                        extras.append({
+                            'id': str(uuid.uuid4()),
+                            'harvest_object_id': object_id,
+                            'key': 'content_hash',
+                            'value': content_hash,
+                        })
+                    ids.append({
+                        'id': object_id,
+                        'name': (dataset or {}).get('name'),
+                        'identifier': (dataset or {}).get('identifier', guid),
+                    })
+
+                model.Session.bulk_insert_mappings(HarvestObject, objects)
+                model.Session.bulk_insert_mappings(HarvestObjectExtra, extras)
+                model.Session.commit()
+                log.debug('Saved harvest objects chunk: %s-%s of %s', start + 1, start + len(objects), len(rows))
+
+        except Exception:
+            model.Session.rollback()
+            raise
+
+        return ids
+
+    def _set_deleted_objects_not_current(self, harvest_object):
+        """
+        Flags the harvest objects of a GUID as not current once its package has been deleted by
+        the import stage, so the GUID is gathered as new if it appears again in the source.
+
+        Args:
+            harvest_object (HarvestObject): The harvest object with the `delete` status.
+
+        Returns:
+            None
+        """
+        model.Session.query(HarvestObject) \
+            .filter(HarvestObject.harvest_source_id == harvest_object.harvest_source_id) \
+            .filter(HarvestObject.guid == harvest_object.guid) \
+            .update({'current': False}, synchronize_session=False)
+
     def _create_or_update_package(
         self, package_dict, harvest_object, package_dict_form="rest"
     ):
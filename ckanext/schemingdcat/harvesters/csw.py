@@ -1,17 +1,20 @@
 import json
 import logging
+import multiprocessing
 import traceback
 import uuid
 import dateutil
 import time
 import pprint
+from datetime import timedelta
+from concurrent.futures import BrokenExecutor, CancelledError, ProcessPoolExecutor
 
 import ckan.plugins as p
 from ckan import model
 from ckan.logic import NotFound, get_action
 from ckan import logic
 
-from ckanext.harvest.model import HarvestObject, HarvestObjectExtra
+from ckanext.harvest.model import HarvestObject
 from ckanext.spatial.harvesters.csw import CSWHarvester
 
 from ckanext.dcat.processors import RDFParserException, RDFParser
@@ -22,11 +25,15 @@ from ckanext.schemingdcat.harvesters.base import (
     ReadError,
 )
 from ckanext.schemingdcat.lib.csw.processor import SchemingDCATCatalogueServiceWeb
-from ckanext.schemingdcat.lib.csw.csw_metadata_extractor import CSWMetadataExtractor
+from ckanext.schemingdcat.lib.csw.csw_metadata_extractor import (
+    CSWMetadataExtractor,
+    init_process_extractor,
+    extract_from_csw_xml
+)
 from ckanext.schemingdcat.lib.csw.csw_harvester_utils import (
     is_valid_url,
     get_organization_slug_for_harvest_source,
-    check_existing_package_by_identifier
+    IdentifierPackageResolver
 )
 from ckanext.schemingdcat.config import (
     OGC2CKAN_HARVESTER_MD_CONFIG,
@@ -36,7 +43,11 @@ from ckanext.schemingdcat.config import (
     INSPIRE_HVD_CATEGORY,
     INSPIRE_HVD_APPLICABLE_LEGISLATION,
     PROTOCOL_MAPPING,
-    FORMAT_STANDARDIZATION
+    FORMAT_STANDARDIZATION,
+    CSW_DEFAULT_LIMIT,
+    CSW_PAGE_WORKERS,
+    CSW_EXTRACTION_WORKERS,
+    CSW_MODIFIED_PROPERTY
 )
 from ckanext.schemingdcat.lib.csw_mapper.xslt_transformer import XSLTTransformer
 from ckanext.schemingdcat.lib.field_mapping import FieldMappingValidator
@@ -66,8 +77,9 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
         
     csw = None
     existing_dataset_identifiers = []
-    _names_taken = []
+    _package_resolver = None
     _schema_required_fields = []
+    _incremental_extra_key = 'schemingdcat_csw_incremental'
 
     def validate_config(self, config):
         config_obj = self.get_harvester_basic_info(config)
@@ -136,6 +148,24 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
             log.debug('No csw_mapping_file provided. Using default: %s', DEFAULT_XSLT_FILE)
             config_obj['csw_mapping_file'] = DEFAULT_XSLT_FILE
 
+        if 'csw_page_workers' in config_obj:
+            csw_page_workers = config_obj['csw_page_workers']
+            if not isinstance(csw_page_workers, int) or isinstance(csw_page_workers, bool) or csw_page_workers < 1:
+                raise ValueError('csw_page_workers must be a positive integer')
+
+        if 'csw_incremental' in config_obj:
+            if not isinstance(config_obj['csw_incremental'], bool):
+                raise ValueError('csw_incremental must be boolean')
+
+        if 'csw_modified_property' in config_obj:
+            if not isinstance(config_obj['csw_modified_property'], str) or not config_obj['csw_modified_property'].strip():
+                raise ValueError('csw_modified_property must be a non-empty string')
+
+        if 'csw_extraction_workers' in config_obj:
+            csw_extraction_workers = config_obj['csw_extraction_workers']
+            if not isinstance(csw_extraction_workers, int) or isinstance(csw_extraction_workers, bool) or csw_extraction_workers < 0:
+                raise ValueError('csw_extraction_workers must be a non-negative integer')
+
         if 'delete_missing_datasets' in config_obj:
             if not isinstance(config_obj['delete_missing_datasets'], bool):
                 raise ValueError('delete_missing_dataset must be boolean')
@@ -390,6 +420,15 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
         """
         Performs the gather stage of the SchemingDCATCSWHarvester. This method is responsible for accesing the CSW Catalog and reading its contents. The contents are then processed, cleaned, and added to the database.
 
+        The records are processed a page at a time: each page is requested, extracted and its
+        harvest objects are saved before the page is dropped, so the memory used is bounded by
+        the page size and the harvest objects of the job grow while the job runs. The datasets
+        to delete are only saved once every page has been read.
+
+        If the `csw_incremental` option is set, only the records modified since the last
+        error-free job are requested, and the deleted records are detected with a brief listing
+        of the identifiers of the catalogue.
+
         Args:
             harvest_job (HarvestJob): The harvest job object.
 
@@ -403,6 +442,12 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
         log.debug('In SchemingDCATCSWHarvester OWSLib-gather_stage with harvest source: %s and URL: %s', harvest_source_title, csw_url)
         self._set_config(harvest_job.source.config, harvest_job.source.id)
 
+        # Incremental harvest: only the records modified since the last error-free job are requested
+        is_incremental = self.config.get('csw_incremental', False) is True
+        modified_since = self._get_modified_since(harvest_job) if is_incremental else None
+        if modified_since:
+            log.info('Incremental harvest: requesting the CSW records modified since %s', modified_since)
+
         try:
             # Get SSL verification setting from config (default to True)
             ssl_verify = self.config.get("ssl_verify", True)
@@ -411,18 +456,21 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
 
             csw_client = SchemingDCATCatalogueServiceWeb(url=csw_url, ssl_verify=ssl_verify)
             csw_extractor = CSWMetadataExtractor(debug=DEBUG_MODE)
-            gathered_identifiers = csw_client.get_csw_records(
-                cql=self.config.get('cql', None),
-                cql_query=self.config.get('cql_query', None),
-                cql_search_term=self.config.get('cql_search_term', None),
-                cql_use_like=self.config.get('cql_use_like', False)
+            query_args = {
+                'cql': self.config.get('cql', None),
+                'cql_query': self.config.get('cql_query', None),
+                'cql_search_term': self.config.get('cql_search_term', None),
+                'cql_use_like': self.config.get('cql_use_like', False),
+                'max_workers': self.config.get('csw_page_workers', CSW_PAGE_WORKERS)
+            }
+            csw_pages = csw_client.iter_csw_pages(
+                # Limit to first 25 records for testing
+                limit=25 if DEBUG_MODE else CSW_DEFAULT_LIMIT,
+                modified_since=modified_since,
+                modified_property=self.config.get('csw_modified_property', CSW_MODIFIED_PROPERTY),
+                **query_args
             )
 
-            # Limit to first 25 records for testing
-            if DEBUG_MODE:
-                gathered_identifiers = gathered_identifiers[:25]
-                log.debug('Limited to first 25 records for testing')
-
         except KeyError as e:
             # Handling the case of a missing key in self.config
             missing_key = e.args[0]
@@ -451,192 +499,317 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
         guids_in_db = set(guid_to_package_id.keys())
         guids_in_harvest = set()
 
-        log.debug('Extract CSW XML records using OWSLib')
-        
+        # Content hashes are retrieved once for all the pages
+        force_all = self.config.get('force_all', False) is True
+        current_hashes = self._get_current_content_hashes(harvest_job.source.id) if guids_in_db and not force_all else {}
+
+        source_dataset = model.Package.get(harvest_job.source.id)
+        self._init_name_allocator([])
+
+        # Request-scoped map of the identifiers to the existing packages, shared by the pages
+        self._package_resolver = IdentifierPackageResolver()
+        self.existing_dataset_identifiers = []
+
+        ids = []
+        identifier_counts = {}  # To track the frequency of identifiers
+        skipped_datasets = 0  # Counter for omitted datasets
+        records_read = 0
+
+        log.debug('Extract CSW XML records using OWSLib, a page at a time')
+
+        extraction_executor = None
+        try:
+            extraction_executor = self._get_extraction_executor()
+            for page_number, records in enumerate(csw_pages, start=1):
+                records_read += len(records)
+                parser_datasets = self._extract_csw_records(records, csw_extractor, harvest_job, extraction_executor)
+                # The MD_Metadata objects and their XML trees are not needed anymore
+                del records
+
+                datasets_to_harvest, skipped = self._prepare_csw_datasets(
+                    parser_datasets, harvest_job, csw_url, source_dataset, guids_in_harvest, identifier_counts)
+                del parser_datasets
+                skipped_datasets += skipped
+
+                new = set(datasets_to_harvest) - guids_in_db
+                change = set(datasets_to_harvest) & guids_in_db
+                guids_in_harvest.update(datasets_to_harvest)
+
+                # The existing packages that are not harvested by any source are updated instead of created
+                existing_datasets = self._get_existing_datasets(new)
+                if existing_datasets:
+                    guid_to_package_id.update(existing_datasets)
+                    new -= set(existing_datasets)
+                    change |= set(existing_datasets)
+
+                ids.extend(self._save_harvest_objects(
+                    harvest_job, new, change, set(), datasets_to_harvest, guid_to_package_id, current_hashes))
+
+                log.info('CSW gather progress: page %s, %s/%s records read, %s datasets gathered, %s harvest objects saved',
+                         page_number, records_read, csw_client.matches, len(guids_in_harvest), len(ids))
+
+        except Exception as e:
+            # The harvest objects of the pages already read are kept, but nothing is deleted
+            # as the catalogue has not been read completely
+            self._save_gather_error(
+                'Unable to get content for URL: {} after {} records: {} / {}'.format(csw_url, records_read, str(e), traceback.format_exc()),
+                harvest_job
+            )
+            return [id_dict['id'] for id_dict in ids]
+        finally:
+            csw_pages.close()
+            if extraction_executor is not None:
+                extraction_executor.shutdown(wait=True, cancel_futures=True)
+
+        # Register duplicate identifiers
+        duplicates = [id for id, count in identifier_counts.items() if count > 1]
+        if duplicates:
+            log.warning(f"The following duplicate identifiers {len(duplicates)} are found: {duplicates}")
+
+        # Get objects/datasets to delete (ie in the DB but not in the source). On incremental harvests only the
+        # modified records are read, so the deletions are reconciled with the identifiers of all the remote records
+        if modified_since:
+            try:
+                remote_ids = {self._clean_identifier(id) for id in csw_client.get_csw_identifiers(**query_args)}
+            except Exception as e:
+                self._save_gather_error(
+                    'Unable to list the record identifiers of URL: {} to detect the deleted records: {} / {}'.format(csw_url, str(e), traceback.format_exc()),
+                    harvest_job
+                )
+                return [id_dict['id'] for id_dict in ids]
+            delete = guids_in_db - remote_ids - guids_in_harvest
+            log.debug('Incremental harvest: %s modified records since %s', len(guids_in_harvest), modified_since)
+        else:
+            delete = guids_in_db - guids_in_harvest
+
+        log.debug(f"Number of skipped datasets: {skipped_datasets}")
+        log.debug(f'guids_in_harvest ({len(guids_in_harvest)})')
+        log.debug(f'guids_in_db ({len(guids_in_db)}): {guids_in_db}')
+        log.debug(f'new ({len(guids_in_harvest - guids_in_db)})')
+        log.debug(f'delete ({len(delete)})')
+        log.debug(f'change ({len(guids_in_db & guids_in_harvest)})')
+
+        if delete:
+            ids.extend(self._save_harvest_objects(harvest_job, set(), set(), delete, {}, guid_to_package_id))
+
+        # Store the config of the source, the next incremental harvest is a full harvest if it changes
+        if is_incremental:
+            self._store_incremental_config(harvest_job.source.id)
+
+        log.debug('Number of CSW records read: %s and object_ids: %s', records_read, len(ids))
+
+        return [id_dict['id'] for id_dict in ids]
+
+    def _get_modified_since(self, harvest_job):
+        """
+        Returns the date of the modified-since constraint of an incremental harvest: the start of
+        the last error-free job, minus an hour as the remote and local clocks may differ.
+
+        All the records are requested if `force_all` is set, there is no error-free job or the
+        config of the source has changed since the last incremental harvest.
+
+        Args:
+            harvest_job (HarvestJob): The harvest job object.
+
+        Returns:
+            str: The ISO 8601 date (UTC), or None to request all the records.
+        """
+        if self.config.get('force_all', False) is True:
+            return None
+
+        stored = self._get_source_state(harvest_job.source.id, self._incremental_extra_key)
+        if stored.get('config') != self._get_config_hash():
+            log.info('No previous incremental harvest with the current config, all the CSW records are requested')
+            return None
+
+        last_error_free_job = self.last_error_free_job(harvest_job)
+        log.debug('Last error-free job: %r', last_error_free_job)
+        if not last_error_free_job or not last_error_free_job.gather_started:
+            return None
+
+        return (last_error_free_job.gather_started - timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    def _store_incremental_config(self, harvest_source_id):
+        """
+        Stores the hash of the config of the source after an incremental gather stage.
+
+        Args:
+            harvest_source_id (str): The harvest source id.
+        """
+        self._set_source_state(harvest_source_id, self._incremental_extra_key, {'config': self._get_config_hash()})
+
+    def _get_extraction_executor(self):
+        """
+        Returns the process pool of the parallel extraction of the CSW records, if the
+        `csw_extraction_workers` option of the harvest source is set.
+
+        The workers are forked, so they share the CKAN config of the gather process, and are
+        started before the CSW pages are requested from other threads.
+
+        Returns:
+            ProcessPoolExecutor: The process pool, or None to extract the records in the gather process.
+        """
+        workers = self.config.get('csw_extraction_workers', CSW_EXTRACTION_WORKERS)
+        if not workers:
+            return None
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=init_process_extractor,
+            initargs=(DEBUG_MODE,)
+        )
+        # The first task starts every worker process
+        executor.submit(int).result()
+        log.debug('Extracting CSW records in %s worker processes', workers)
+        return executor
+
+    def _extract_csw_records(self, records, csw_extractor, harvest_job, extraction_executor=None):
+        """
+        Extracts the metadata of a page of CSW records and applies the `after_parsing` hooks.
+
+        With an extraction process pool, the raw XML of the records is extracted in the worker
+        processes. The results are consumed in the order of the records, so the datasets and the
+        `after_parsing` hooks, which run in the gather process, keep the same order.
+
+        Args:
+            records (OrderedDict): The MD_Metadata objects of the page, by identifier.
+            csw_extractor (CSWMetadataExtractor): The metadata extractor.
+            harvest_job (HarvestJob): The harvest job object.
+            extraction_executor (ProcessPoolExecutor, optional): The process pool of the parallel extraction.
+
+        Returns:
+            list: The dataset dicts of the page, in the order of the records.
+
+        Raises:
+            BrokenExecutor: If the extraction process pool has failed, e.g. a worker process was killed.
+        """
         parser_datasets = []
-        
-        # Extract CSW XML records using OWSLib
-        for id in gathered_identifiers:
+        futures = None
+        if extraction_executor is not None:
+            futures = {id: extraction_executor.submit(extract_from_csw_xml, csw_metadata.xml) for id, csw_metadata in records.items()}
+
+        for id, csw_metadata in records.items():
             try:
-                log.debug("Fetching CSW record for ID: %s", id)
-                csw_metadata, csw_record_xml = csw_client.get_metadata_record(id)
-                
+                log.debug("Extracting CSW record for ID: %s", id)
+
                 # Extract all metadata
-                complete_metadata = csw_extractor.extract_from_csw(csw_metadata, csw_record_xml)
-                
+                if futures is not None:
+                    complete_metadata = futures.pop(id).result()
+                else:
+                    complete_metadata = csw_extractor.extract_from_csw(csw_metadata, csw_metadata.xml)
+
                 for harvester in p.PluginImplementations(SchemingDCATHarvester):
                     complete_metadata, after_parsing_errors = harvester.after_parsing(complete_metadata, harvest_job)
 
                     for error_msg in after_parsing_errors:
                         self._save_gather_error(error_msg, harvest_job)
-                
+
+                if not complete_metadata:
+                    continue
 
                 parser_datasets.append(complete_metadata)
                 log.debug('Append record: %s', complete_metadata.get('title'))
 
-                if not complete_metadata:
-                    return None
+            except (BrokenExecutor, CancelledError):
+                # The extraction process pool has failed, so the page can not be read. The gather stage
+                # stops without deleting any dataset, as the catalogue has not been read completely
+                raise
 
             except Exception as e:
                 self._save_gather_error(f'Error processing record {id}: {str(e)}', harvest_job)
                 continue
 
-        dataset_titles = [dataset['title'] for dataset in parser_datasets]
-
-        # Log the length of datasets after parser
         if DEBUG_MODE:
-            log.debug('parser_datasets: %s', dataset_titles)
-        log.debug(f"Length of parser after_cleaning ISQLHarvester: {len(parser_datasets)}")
+            log.debug('parser_datasets: %s', [dataset.get('title') for dataset in parser_datasets])
 
-        # Add datasets to the database
-        try:
-            log.debug('Adding datasets to DB')
-            datasets_to_harvest = {}
-            source_dataset = model.Package.get(harvest_job.source.id)
-            skipped_datasets = 0  # Counter for omitted datasets
-            identifier_counts = {}  # To track the frequency of identifiers
+        return parser_datasets
 
-            for dataset in parser_datasets:
-                #log.debug('dataset: %s', dataset['title'])
+    def _prepare_csw_datasets(self, parser_datasets, harvest_job, csw_url, source_dataset, guids_in_harvest, identifier_counts):
+        """
+        Names and cleans the datasets of a page of CSW records and keys them by identifier.
 
-                # Set and update translated fields
-                dataset = self._set_translated_fields(dataset)
-                
-                try:
-                    if not dataset.get('name'):
-                        dataset['name'] = self._gen_new_name(dataset['title'])
-                    while dataset['name'] in self._names_taken:
-                        suffix = sum(name.startswith(dataset['name'] + '-') for name in self._names_taken) + 1
-                        dataset['name'] = '{}-{}'.format(dataset['name'], suffix)
-                    self._names_taken.append(dataset['name'])
-        
-                    # If the dataset has no identifier, use an UUID
-                    if not dataset.get('identifier'):
-                        dataset['identifier'] = str(uuid.uuid4())
-                        
-                    else:
-                        dataset['identifier'] = self._clean_identifier(dataset['identifier'])
-        
-                except Exception as e:
-                    skipped_datasets += 1
-                    self._save_gather_error('Error for the dataset identifier %s [%r]' % (dataset.get('identifier'), e), harvest_job)
-                    continue
-                
+        Args:
+            parser_datasets (list): The dataset dicts of the page.
+            harvest_job (HarvestJob): The harvest job object.
+            csw_url (str): The URL of the CSW server, used for the GetRecordById reference.
+            source_dataset (Package): The harvest source dataset.
+            guids_in_harvest (set): The identifiers gathered in the previous pages. Their harvest
+                objects are already saved, so repeated identifiers are skipped.
+            identifier_counts (dict): The frequency of each identifier, updated in place.
+
+        Returns:
+            tuple: The dataset dicts of the page by identifier and the number of skipped datasets.
+        """
+        datasets_to_harvest = {}
+        skipped_datasets = 0
+
+        self._seed_names_for_datasets(parser_datasets)
+        for dataset in parser_datasets:
+            # Set and update translated fields
+            dataset = self._set_translated_fields(dataset)
+
+            try:
+                dataset['name'] = self._allocate_name(dataset.get('name'), dataset.get('title'))
+
+                # If the dataset has no identifier, use an UUID
                 if not dataset.get('identifier'):
-                    skipped_datasets += 1
-                    self._save_gather_error('Missing identifier for dataset with title: %s' % dataset.get('title'), harvest_job)
-                    continue
-                
-                # If exists identifier, add Metadata URL to references
-                if dataset.get('identifier'):
-                    # Build GetRecordById URL
-                    getrecord_params = {
-                        'service': 'CSW',
-                        'version': '2.0.2',
-                        'request': 'GetRecordById',
-                        'id': dataset['identifier'],
-                        'elementSetName': 'full',
-                        'outputSchema': 'http://www.isotc211.org/2005/gmd',
-                        'OutputFormat': 'application/xml'
-                    }
-                    
-                    # Convert params to URL query string
-                    query_string = '&'.join([f"{k}={v}" for k, v in getrecord_params.items()])
-                    csw_url_reference = f"{csw_url}?{query_string}"
-                    
-                    # Append as first element
-                    dataset['reference'].insert(0, csw_url_reference)            
-                
-                # Check if a dataset with the same identifier exists can be overridden if necessary
-                #existing_dataset = self._check_existing_package_by_ids(dataset)
-                #log.debug('existing_dataset: %s', existing_dataset)
-                            
-                # Unless already set by the dateutil.parser.parser, get the owner organization (if any)
-                # from the harvest source dataset
-                if not dataset.get('owner_org') and source_dataset.owner_org:
-                    dataset['owner_org'] = source_dataset.owner_org
-        
-                if 'extras' not in dataset:
-                    dataset['extras'] = []
+                    dataset['identifier'] = str(uuid.uuid4())
 
-                # if existing_dataset:
-                #     dataset['identifier'] = existing_dataset['identifier']
+                else:
+                    dataset['identifier'] = self._clean_identifier(dataset['identifier'])
 
-                identifier = dataset['identifier']
-                # Track the frequency of each identifier
-                identifier_counts[identifier] = identifier_counts.get(identifier, 0) + 1
-                if identifier_counts[identifier] > 1:
-                    log.warning(f'Duplicate identifier detected: {identifier}. This dataset will overwrite the previous one.')
+            except Exception as e:
+                skipped_datasets += 1
+                self._save_gather_error('Error for the dataset identifier %s [%r]' % (dataset.get('identifier'), e), harvest_job)
+                continue
 
-                #     guids_in_db.add(dataset['identifier'])
+            if not dataset.get('identifier'):
+                skipped_datasets += 1
+                self._save_gather_error('Missing identifier for dataset with title: %s' % dataset.get('title'), harvest_job)
+                continue
 
-                guids_in_harvest.add(identifier)
-                datasets_to_harvest[identifier] = dataset
-        
-            # Register duplicate identifiers
-            duplicates = [id for id, count in identifier_counts.items() if count > 1]
-            if duplicates:
-                log.warning(f"The following duplicate identifiers {len(duplicates)} are found: {duplicates}")
-        
-        except Exception as e:
-            self._save_gather_error('Error when processing dataset: %r / %s' % (e, traceback.format_exc()), harvest_job)
-            return []
+            # If exists identifier, add Metadata URL to references
+            if dataset.get('identifier'):
+                # Build GetRecordById URL
+                getrecord_params = {
+                    'service': 'CSW',
+                    'version': '2.0.2',
+                    'request': 'GetRecordById',
+                    'id': dataset['identifier'],
+                    'elementSetName': 'full',
+                    'outputSchema': 'http://www.isotc211.org/2005/gmd',
+                    'OutputFormat': 'application/xml'
+                }
+
+                # Convert params to URL query string
+                query_string = '&'.join([f"{k}={v}" for k, v in getrecord_params.items()])
+                csw_url_reference = f"{csw_url}?{query_string}"
+
+                # Append as first element
+                dataset['reference'].insert(0, csw_url_reference)
+
+            # Unless already set by the dateutil.parser.parser, get the owner organization (if any)
+            # from the harvest source dataset
+            if not dataset.get('owner_org') and source_dataset.owner_org:
+                dataset['owner_org'] = source_dataset.owner_org
+
+            if 'extras' not in dataset:
+                dataset['extras'] = []
+
+            identifier = dataset['identifier']
+            # Track the frequency of each identifier
+            identifier_counts[identifier] = identifier_counts.get(identifier, 0) + 1
+            if identifier in guids_in_harvest:
+                skipped_datasets += 1
+                log.warning(f'Duplicate identifier detected: {identifier}. It was gathered in a previous page, this dataset is skipped.')
+                continue
+            if identifier_counts[identifier] > 1:
+                log.warning(f'Duplicate identifier detected: {identifier}. This dataset will overwrite the previous one.')
 
-        # Check guids to create/update/delete
-        new = guids_in_harvest - guids_in_db
-        # Get objects/datasets to delete (ie in the DB but not in the source)
-        delete = set(guids_in_db) - set(guids_in_harvest)
-        change = guids_in_db & guids_in_harvest
-        
-        log.debug(f"Number of skipped datasets: {skipped_datasets}")
-        log.debug(f'guids_in_harvest ({len(guids_in_harvest)})')
-        log.debug(f'guids_in_db ({len(guids_in_db)}): {guids_in_db}')
-        log.debug(f'new ({len(new)})')
-        log.debug(f'delete ({len(delete)})')
-        log.debug(f'change ({len(change)})')
-        
-        ids = []
-        for guid in new:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    extras=[HarvestObjectExtra(key='status', value='new')])
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        for guid in change:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    package_id=guid_to_package_id[guid],
-                                    extras=[HarvestObjectExtra(key='status', value='change')])
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        for guid in delete:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    package_id=guid_to_package_id[guid],
-                                    extras=[HarvestObjectExtra(key='status', value='delete')])
-                model.Session.query(HarvestObject).\
-                    filter_by(guid=guid).\
-                    update({'current': False}, False)
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        log.debug('Number of elements in parser_datasets: %s and object_ids: %s', len(parser_datasets), len(ids))
-        
-        # Log parser_datasets/ ids
-        #self._log_export_parser_datasets_and_ids(harvest_source_title, parser_datasets, ids)
+            datasets_to_harvest[identifier] = dataset
 
-        return [id_dict['id'] for id_dict in ids]
+        return datasets_to_harvest, skipped_datasets
 
     #TODO: Disable until https://github.com/SEMICeu/iso-19139-to-dcat-ap
     def _gather_with_xsl(self, harvest_job):
@@ -732,7 +905,6 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
             )
             return []
 
-        self._names_taken = []
         
         parser = RDFParser()
         log.debug('Load profiles TO RDFParser: %s', DEFAULT_RDF_PROFILES)
@@ -778,6 +950,7 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
             skipped_datasets = 0  # Counter for omitted datasets
             identifier_counts = {}  # To track the frequency of identifiers
 
+            self._init_name_allocator(parser_datasets)
             for dataset in parser_datasets:
                 #log.debug('dataset: %s', dataset['title'])
 
@@ -785,12 +958,7 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
                 dataset = self._set_translated_fields(dataset)
                 
                 try:
-                    if not dataset.get('name'):
-                        dataset['name'] = self._gen_new_name(dataset['title'])
-                    while dataset['name'] in self._names_taken:
-                        suffix = sum(name.startswith(dataset['name'] + '-') for name in self._names_taken) + 1
-                        dataset['name'] = '{}-{}'.format(dataset['name'], suffix)
-                    self._names_taken.append(dataset['name'])
+                    dataset['name'] = self._allocate_name(dataset.get('name'), dataset.get('title'))
         
                     # If the dataset has no identifier, use an UUID
                     if not dataset.get('identifier'):
@@ -875,41 +1043,7 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
         log.debug(f'delete ({len(delete)})')
         log.debug(f'change ({len(change)})')
         
-        ids = []
-        for guid in new:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    extras=[HarvestObjectExtra(key='status', value='new')])
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        for guid in change:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    package_id=guid_to_package_id[guid],
-                                    extras=[HarvestObjectExtra(key='status', value='change')])
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        for guid in delete:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    package_id=guid_to_package_id[guid],
-                                    extras=[HarvestObjectExtra(key='status', value='delete')])
-                model.Session.query(HarvestObject).\
-                    filter_by(guid=guid).\
-                    update({'current': False}, False)
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
+        ids = self._save_harvest_objects(harvest_job, new, change, delete, datasets_to_harvest, guid_to_package_id)
         
         log.debug('Number of elements in parser_datasets: %s and object_ids: %s', len(parser_datasets), len(ids))
         
@@ -973,6 +1107,7 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
                     'ignore_auth': True,
                 })
                 p.toolkit.get_action('package_delete')(context, {'id': harvest_object.package_id})
+                self._set_deleted_objects_not_current(harvest_object)
                 log.info('The override_local_datasets configuration is %s. Package %s deleted with GUID: %s' % (override_local_datasets, harvest_object.package_id, harvest_object.guid))
 
                 return True
@@ -1182,26 +1317,50 @@ class SchemingDCATCSWHarvester(CSWHarvester, SchemingDCATHarvester):
     # Aux methods
     def _get_existing_datasets(self, gathered_identifiers):
         """Check if datasets with the given identifiers exist and add them to existing_dataset_identifiers.
-    
+
+        Only the packages that are not harvested by any source are returned, e.g. the datasets left by
+        a harvest source removed without clearing them. Their identifiers are not current harvest
+        objects, so they are gathered as new and the import stage could not create a package with the
+        same id. The datasets of other harvest sources are not modified.
+
+        The identifiers are resolved in bulk by the resolver of the gather stage, kept in
+        `self._package_resolver`, so the later lookups of the same stage (see `find_package_for_identifier`)
+        reuse the resolved map.
+
         Args:
-            gathered_identifiers (list): List of dataset identifiers to check.
-    
+            gathered_identifiers (iterable): Dataset identifiers to check, not current in the harvest source.
+
         Returns:
-            None
-    
-        This method iterates over the gathered identifiers, checks if a dataset with the same identifier
-        exists in the CKAN instance, and if it does, adds it to the existing_dataset_identifiers list.
-    
+            dict: The package ids of the existing datasets not harvested by any source, by identifier.
+
         Example:
             self._get_existing_datasets(['dataset-identifier-1', 'dataset-identifier-2'])
-    
+
         """
-        for dataset in gathered_identifiers:
-            exists = check_existing_package_by_identifier(dataset)
-            if exists:
-                log.warning('Dataset exists: %s', dataset)
-                self.existing_dataset_identifiers.append(dataset)
-            
+        if self._package_resolver is None:
+            self._package_resolver = IdentifierPackageResolver()
+        existing = self._package_resolver.resolve(gathered_identifiers)
+        if not existing:
+            return {}
+
+        harvested_package_ids = {
+            package_id for package_id, in model.Session.query(HarvestObject.package_id)
+            .filter(HarvestObject.current == True)
+            .filter(HarvestObject.package_id.in_({info.package_id for info in existing.values()}))
+        }
+
+        existing_datasets = {}
+        for identifier, info in existing.items():
+            if info.package_id in harvested_package_ids:
+                log.warning('Dataset exists: %s, it is harvested by another source (package: %s)', identifier, info.package_id)
+                continue
+
+            log.warning('Dataset exists: %s, it is not harvested by any source and the package: %s is updated', identifier, info.package_id)
+            self.existing_dataset_identifiers.append(identifier)
+            existing_datasets[identifier] = info.package_id
+
+        return existing_datasets
+
     def _apply_default_values(self, package_dict):
         """
         Apply default values from OGC2CKAN_HARVESTER_MD_CONFIG to package_dict
@@ -15,7 +15,7 @@ from ckan.logic.schema import default_create_package_schema
 from ckan.lib.navl.validators import ignore_missing, ignore
 
 from ckanext.harvest.logic.schema import unicode_safe
-from ckanext.harvest.model import HarvestObject, HarvestObjectExtra
+from ckanext.harvest.model import HarvestObject
 
 from ckanext.schemingdcat.harvesters.base import SchemingDCATHarvester
 from ckanext.schemingdcat.interfaces import ISchemingDCATHarvester, ISQLHarvester
@@ -43,9 +43,29 @@ class DatabaseManager(ABC):
         pass
 
     @abstractmethod
-    def execute_query(self, query):
+    def execute_query(self, query, params=None):
         pass
 
+    def execute_query_stream(self, query, itersize=None, params=None):
+        """
+        Executes a query and yields its results in chunks of rows.
+
+        Database managers that support server-side cursors should override it, by default the
+        whole result set is fetched with `execute_query`.
+
+        Args:
+            query (str): The query to execute.
+            itersize (int, optional): The maximum number of rows per chunk.
+            params (dict, optional): The parameters of the query.
+
+        Yields:
+            tuple: The rows of the chunk and the column names.
+        """
+        results, column_names = self.execute_query(query, params)
+        itersize = itersize or len(results) or 1
+        for start in range(0, len(results), itersize):
+            yield results[start:start + itersize], column_names
+
 class SchemingDCATSQLHarvester(SchemingDCATHarvester):
     """
     A base harvester for harvesting metadata from SQL databases using the SchemingDCAT extension.
@@ -64,7 +84,7 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
         'sqlite': {
             'name': 'sqlite',
             'title': 'SQLite',
-            'active': False,
+            'active': True,
         }
     }
     _database_type = None
@@ -75,6 +95,10 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
     _session = None
     _auth = True
     _queries = {}
+    _itersize = 2000
+    _max_parallel_queries = 4
+    _watermark_extra_key = 'schemingdcat_sql_watermark'
+    _credentials_required = True
     data = None
     config = None
     _field_mapping_info = {
@@ -127,26 +151,32 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
             if database_type not in supported_types:
                 raise ValueError(f'database_type should be one of: {", ".join(supported_types)}')
 
+            harvester_type = getattr(self, 'harvester_type', None)
+            if harvester_type and database_type != harvester_type:
+                raise ValueError(f'database_type should be "{harvester_type}" for this harvester')
+
             config = json.dumps({**config_obj, 'database_type': database_type})
 
         else:
             raise ValueError(f'database_type should be one of: {", ".join(supported_types)}')
 
-        if 'credentials' in config:   
-            required_keys = ['user', 'password', 'host', 'port', 'db']  
-            credentials = config_obj['credentials']
+        # File databases (e.g. SQLite) do not need credentials
+        if self._credentials_required:
+            if 'credentials' in config:   
+                required_keys = ['user', 'password', 'host', 'port', 'db']  
+                credentials = config_obj['credentials']
             
-            if not isinstance(credentials, dict):
-                raise ValueError('credentials must be a dictionary')
+                if not isinstance(credentials, dict):
+                    raise ValueError('credentials must be a dictionary')
             
-            for key in required_keys:
-                if key not in credentials:
-                    raise ValueError(f'credentials needs key "{key}"')
+                for key in required_keys:
+                    if key not in credentials:
+                        raise ValueError(f'credentials needs key "{key}"')
             
-            if not isinstance(credentials['port'], int):
-                raise ValueError('"port" must be an integer')
-        else:
-            raise ValueError("credentials must exist and be a dictionary with the following structure: {'user': 'username', 'password': 'password', 'host': 'hostname', 'port': port_number, 'db': 'database'}")
+                if not isinstance(credentials['port'], int):
+                    raise ValueError('"port" must be an integer')
+            else:
+                raise ValueError("credentials must exist and be a dictionary with the following structure: {'user': 'username', 'password': 'password', 'host': 'hostname', 'port': port_number, 'db': 'database'}")
 
         # Check if 'field_mapping_schema_version' exists in the config
         field_mapping_schema_version_error_message = f'Insert the schema version: "field_mapping_schema_version: <version>", one of: {", ".join(map(str, self._field_mapping_validator_versions))} . More info: https://github.com/mjanez/ckanext-schemingdcat?tab=readme-ov-file#remote-google-sheetonedrive-excel-metadata-upload-harvester'
@@ -179,6 +209,31 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
 
                 config = json.dumps({**config_obj, mapping_name: field_mapping})
 
+        # Check the incremental harvest options: the datasets are filtered by the modified_column and
+        # the deletions are reconciled with the remote identifiers
+        for mapping_name in self._field_mapping_info:
+            modified_field = self._get_modified_field(config_obj.get(mapping_name))
+            if modified_field is None:
+                continue
+            if mapping_name != 'dataset_field_mapping':
+                raise ValueError(f'"modified_column" is only supported in "dataset_field_mapping". It is currently set in "{mapping_name}"')
+            if not (config_obj[mapping_name].get('identifier') or {}).get('field_name'):
+                raise ValueError(f'"modified_column" in field: "{modified_field}" needs the "identifier" field of "dataset_field_mapping" to be mapped with a "field_name", to reconcile the deleted datasets')
+
+        # Check the number of rows fetched per round trip from the server-side cursors
+        if 'itersize' in config_obj:
+            itersize = config_obj['itersize']
+            if not isinstance(itersize, int) or isinstance(itersize, bool) or itersize < 1:
+                raise ValueError('itersize must be a positive integer')
+
+        # Check the number of queries run at the same time
+        if 'max_parallel_queries' in config_obj:
+            max_parallel_queries = config_obj['max_parallel_queries']
+            if not isinstance(max_parallel_queries, int) or isinstance(max_parallel_queries, bool) or max_parallel_queries < 1:
+                raise ValueError('max_parallel_queries must be a positive integer')
+
+        return config
+
     def gather_stage(self, harvest_job):
         """
         This method is responsible for reading the remote SQL database. The contents are then processed, cleaned, and added to the database.
@@ -193,7 +248,6 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
         harvest_source_title = harvest_job.source.title
         source_url = harvest_job.source.url    
         content_dicts = {}
-        self._names_taken = []
         
         log.debug('In SchemingDCATSQLHarvester gather_stage with harvest source: %s and database URL: %s', harvest_source_title, source_url)
         
@@ -208,7 +262,7 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
             self._database_type = self.config.get("database_type")
             self._auth = self.config.get("auth")
             self._credentials = self.config.get("credentials")
-            credential_keys = ', '.join(self._credentials .keys())
+            credential_keys = ', '.join((self._credentials or {}).keys())
             log.debug('Loaded credentials with keys: %s', credential_keys)
             dataset_id_colname = self.config.get("dataset_id_colname", "dataset_id")
         else:
@@ -269,67 +323,99 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
                 if not field_mappings:
                     return []
 
-        # Read database
-        if self.db_manager is not None:
-            self.db_manager.check_connection(conn_url)
-            log.debug('Connection is ready.')
-            content_dicts = self._read_remote_database(field_mappings, conn_url)
-            #log.debug('content_dicts %s', content_dicts)
-                 
-        # after_sql_retrieve interface
-        for harvester in p.PluginImplementations(ISQLHarvester):
-            if hasattr(harvester, 'after_sql_retrieve'):
-                content_dicts, after_sql_retrieve_errors = harvester.after_sql_retrieve(content_dicts, harvest_job)
-                        
-                for error_msg in after_sql_retrieve_errors:
-                    self._save_gather_error(error_msg, harvest_job)
-                        
-                if not content_dicts:
-                    return []
-
         # Create default values dict from config mappings.
         try:
             self.create_default_values(field_mappings)
     
         except ReadError as e:
             self._save_gather_error('Error generating default values for dataset/distribution config field mappings: {0}'.format(e), harvest_job)
-        
-        # Check if the content_dicts colnames correspond to the local schema
-        try:
-            #log.debug('content_dicts: %s', content_dicts)
-            # Standardizes the field names
-            content_dicts['datasets'], remote_dataset_field_mapping = self._standardize_df_fields_from_field_mapping(content_dicts['datasets'], field_mappings.get('dataset_field_mapping'))
-            content_dicts['distributions'], remote_distribution_field_mapping = self._standardize_df_fields_from_field_mapping(content_dicts['distributions'], field_mappings.get('distribution_field_mapping'))
-            
-            # Validate field names
-            remote_dataset_field_names = set(content_dicts['datasets'].columns)
-            remote_resource_field_names = set(content_dicts['distributions'].columns)
 
-            self._validate_remote_schema(remote_dataset_field_names=remote_dataset_field_names, remote_ckan_base_url=None, remote_resource_field_names=remote_resource_field_names, remote_dataset_field_mapping=remote_dataset_field_mapping, remote_distribution_field_mapping=remote_distribution_field_mapping)
+        # Incremental harvest: only the datasets modified after the watermark of the previous job are read
+        incremental = None
+        if self._get_modified_field(field_mappings['dataset_field_mapping']):
+            incremental = {'watermark': self._get_stored_watermark(harvest_job)}
+            log.debug('Incremental harvest using the watermark: %s', incremental['watermark'])
 
-        except RemoteSchemaError as e:
-            self._save_gather_error('Error validating remote schema: {0}'.format(e), harvest_job)
-            return []
-        
-        # before_cleaning interface
-        for harvester in p.PluginImplementations(ISQLHarvester):
-            if hasattr(harvester, 'before_cleaning'):
-                content_dicts, before_cleaning_errors = harvester.before_cleaning(content_dicts, harvest_job, self.config)
+        # Read database, the datasets are consumed from a server-side cursor in chunks of rows
+        clean_datasets = []
+        grouped_content = {'matched_ids': {'distributions': set(), 'datadictionaries': set()}}
+        field_mapping_plans = None
+        if self.db_manager is not None:
+            self.db_manager.check_connection(conn_url)
+            log.debug('Connection is ready.')
 
-                for error_msg in before_cleaning_errors:
-                    self._save_gather_error(error_msg, harvest_job)
+            for content_dicts in self._iter_remote_database(field_mappings, conn_url, incremental):
+                #log.debug('content_dicts %s', content_dicts)
+
+                # after_sql_retrieve interface
+                for harvester in p.PluginImplementations(ISQLHarvester):
+                    if hasattr(harvester, 'after_sql_retrieve'):
+                        content_dicts, after_sql_retrieve_errors = harvester.after_sql_retrieve(content_dicts, harvest_job)
+                                
+                        for error_msg in after_sql_retrieve_errors:
+                            self._save_gather_error(error_msg, harvest_job)
+                                
+                        if not content_dicts:
+                            return []
+
+                # Check if the content_dicts colnames correspond to the local schema (only once). The
+                # standardization of the field_mappings is computed once and applied to every chunk
+                if field_mapping_plans is None:
+                    try:
+                        #log.debug('content_dicts: %s', content_dicts)
+                        field_mapping_plans = {
+                            'datasets': self._get_field_mapping_plan(field_mappings.get('dataset_field_mapping')),
+                            'distributions': self._get_field_mapping_plan(field_mappings.get('distribution_field_mapping')),
+                        }
+
+                        # Standardizes the field names
+                        content_dicts['datasets'] = self._apply_field_mapping_plan(content_dicts['datasets'], field_mapping_plans['datasets'])
+                        content_dicts['distributions'] = self._apply_field_mapping_plan(content_dicts['distributions'], field_mapping_plans['distributions'])
+                        grouped_content['standardized_distributions'] = content_dicts['distributions']
+                        
+                        # Validate field names
+                        remote_dataset_field_names = set(content_dicts['datasets'].columns)
+                        remote_resource_field_names = set(content_dicts['distributions'].columns)
 
-        # Clean tables
-        try:
-            clean_datasets = self._process_content(content_dicts, conn_url, field_mappings)
-            log.debug('"%s" remote database cleaned successfully.', self._database_types_supported[self._database_type]['title'])
-            clean_datasets = self._update_dict_lists(clean_datasets)
-            #log.debug('clean_datasets: %s', clean_datasets)
-            log.debug('Update dict string lists. Number of datasets imported: %s', len(clean_datasets))
-            
-        except Exception as e:
-            self._save_gather_error('Error cleaning the remote database: {0}'.format(e), harvest_job)
+                        self._validate_remote_schema(remote_dataset_field_names=remote_dataset_field_names, remote_ckan_base_url=None, remote_resource_field_names=remote_resource_field_names, remote_dataset_field_mapping=field_mapping_plans['datasets']['field_mapping'], remote_distribution_field_mapping=field_mapping_plans['distributions']['field_mapping'])
+
+                    except RemoteSchemaError as e:
+                        self._save_gather_error('Error validating remote schema: {0}'.format(e), harvest_job)
+                        return []
+                else:
+                    # Next chunks of the datasets, the distributions are already standardized
+                    content_dicts['datasets'] = self._apply_field_mapping_plan(content_dicts['datasets'], field_mapping_plans['datasets'])
+                    content_dicts['distributions'] = grouped_content['standardized_distributions']
+                
+                # before_cleaning interface
+                for harvester in p.PluginImplementations(ISQLHarvester):
+                    if hasattr(harvester, 'before_cleaning'):
+                        content_dicts, before_cleaning_errors = harvester.before_cleaning(content_dicts, harvest_job, self.config)
+
+                        for error_msg in before_cleaning_errors:
+                            self._save_gather_error(error_msg, harvest_job)
+
+                # Clean tables
+                try:
+                    clean_datasets.extend(self._process_content(content_dicts, conn_url, field_mappings, grouped_content))
+                    
+                except Exception as e:
+                    self._save_gather_error('Error cleaning the remote database: {0}'.format(e), harvest_job)
+                    return []
+
+        is_incremental = bool(incremental and incremental.get('watermark'))
+        if field_mapping_plans is None and not is_incremental:
+            self._save_gather_error('No datasets were read from the remote database. The harvest source: "{0}" has finished.'.format(harvest_source_title), harvest_job)
             return []
+
+        # Report the distributions and datadictionaries that do not match any dataset. Skipped on incremental
+        # harvests, as the rows of the unchanged datasets are not matched
+        if not is_incremental:
+            self._report_orphan_rows(grouped_content.get('distributions'), grouped_content.get('datadictionaries'), grouped_content['matched_ids'])
+
+        log.debug('"%s" remote database cleaned successfully.', self._database_types_supported[self._database_type]['title'])
+        #log.debug('clean_datasets: %s', clean_datasets)
+        log.debug('Number of datasets imported: %s', len(clean_datasets))
     
         # after_cleaning interface
         for harvester in p.PluginImplementations(ISQLHarvester):
@@ -350,6 +436,7 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
             skipped_datasets = 0  # Counter for omitted datasets
             identifier_counts = {}  # To track the frequency of identifiers
         
+            self._init_name_allocator(clean_datasets)
             for dataset in clean_datasets:
                 #log.debug('dataset: %s', dataset)
 
@@ -357,12 +444,7 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
                 dataset = self._set_translated_fields(dataset)
                 
                 try:
-                    if not dataset.get('name'):
-                        dataset['name'] = self._gen_new_name(dataset['title'])
-                    while dataset['name'] in self._names_taken:
-                        suffix = sum(name.startswith(dataset['name'] + '-') for name in self._names_taken) + 1
-                        dataset['name'] = '{}-{}'.format(dataset['name'], suffix)
-                    self._names_taken.append(dataset['name'])
+                    dataset['name'] = self._allocate_name(dataset.get('name'), dataset.get('title'))
         
                     # If the dataset has no identifier, use an UUID
                     if not dataset.get('identifier'):
@@ -416,7 +498,9 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
         # Check guids to create/update/delete
         new = guids_in_harvest - guids_in_db
         # Get objects/datasets to delete (ie in the DB but not in the source)
-        delete = set(guids_in_db) - set(guids_in_harvest)
+        delete = self._get_guids_to_delete(guids_in_db, guids_in_harvest, incremental)
+        if is_incremental:
+            log.debug('Incremental harvest: %s modified datasets since %s', len(guids_in_harvest), incremental['watermark'])
         change = guids_in_db & guids_in_harvest
         
         log.debug(f"Number of skipped datasets: {skipped_datasets}")
@@ -426,41 +510,11 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
         log.debug(f'delete ({len(delete)})')
         log.debug(f'change ({len(change)})')
         
-        ids = []
-        for guid in new:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    extras=[HarvestObjectExtra(key='status', value='new')])
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        for guid in change:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    package_id=guid_to_package_id[guid],
-                                    extras=[HarvestObjectExtra(key='status', value='change')])
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        for guid in delete:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    package_id=guid_to_package_id[guid],
-                                    extras=[HarvestObjectExtra(key='status', value='delete')])
-                model.Session.query(HarvestObject).\
-                    filter_by(guid=guid).\
-                    update({'current': False}, False)
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
+        ids = self._save_harvest_objects(harvest_job, new, change, delete, datasets_to_harvest, guid_to_package_id)
+
+        # Store the watermark for the next incremental harvest, it is only used if this job has no errors
+        if incremental and incremental.get('next_watermark') is not None:
+            self._store_watermark(harvest_job, incremental['next_watermark'])
         
         log.debug('Number of elements in clean_datasets: %s and object_ids: %s', len(clean_datasets), len(ids))
         
@@ -521,6 +575,7 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
                     'ignore_auth': True,
                 })
                 p.toolkit.get_action('package_delete')(context, {'id': harvest_object.package_id})
+                self._set_deleted_objects_not_current(harvest_object)
                 log.info('The override_local_datasets configuration is %s. Package %s deleted with GUID: %s' % (override_local_datasets, harvest_object.package_id, harvest_object.guid))
 
                 return True
@@ -958,6 +1013,114 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
         return None
 
     # DB methods
+    def _get_itersize(self):
+        """
+        Returns the number of rows fetched per round trip from the server-side cursors, from the
+        `itersize` config option.
+
+        Returns:
+            int: The itersize.
+        """
+        try:
+            itersize = int((self.config or {}).get('itersize', self._itersize))
+        except (TypeError, ValueError):
+            itersize = self._itersize
+        return max(itersize, 1)
+
+    def _get_max_parallel_queries(self):
+        """
+        Returns the number of queries (datasets, distributions, datadictionaries, ...) run at the same
+        time, each one on its own connection, from the `max_parallel_queries` config option.
+
+        Returns:
+            int: The maximum number of parallel queries. `1` runs them sequentially.
+        """
+        try:
+            max_parallel_queries = int((self.config or {}).get('max_parallel_queries', self._max_parallel_queries))
+        except (TypeError, ValueError):
+            max_parallel_queries = self._max_parallel_queries
+        return max(max_parallel_queries, 1)
+
+    @staticmethod
+    def _get_modified_field(field_mapping):
+        """
+        Returns the field of the field mapping used as the last modification date by the incremental harvest.
+
+        Args:
+            field_mapping (dict): The field mapping.
+
+        Returns:
+            str: The local field name with the `modified_column` property, None if there is none.
+        """
+        for local_field, field_config in (field_mapping or {}).items():
+            if isinstance(field_config, dict) and field_config.get('modified_column') is True:
+                return local_field
+        return None
+
+    @staticmethod
+    def _get_guids_to_delete(guids_in_db, guids_in_harvest, incremental=None):
+        """
+        Returns the identifiers of the datasets to delete, i.e. in the DB but not in the source.
+
+        On incremental harvests only the datasets modified after the watermark are read, so the
+        deletions are reconciled with the identifiers of all the remote datasets (`remote_ids`).
+
+        Args:
+            guids_in_db (iterable): The identifiers of the current datasets of the source.
+            guids_in_harvest (iterable): The identifiers of the datasets read by this job.
+            incremental (dict, optional): The incremental harvest state, with the `watermark` and `remote_ids`.
+
+        Returns:
+            set: The identifiers of the datasets to delete.
+        """
+        if incremental and incremental.get('watermark'):
+            return set(guids_in_db) - set(incremental['remote_ids']) - set(guids_in_harvest)
+        return set(guids_in_db) - set(guids_in_harvest)
+
+    def _get_stored_watermark(self, harvest_job):
+        """
+        Retrieves the watermark (the latest value of the `modified_column`) stored by the last
+        error-free harvest job.
+
+        The watermark is stored in the gather stage, so it is only used if the job that stored it
+        is the last error-free job of the source, i.e. its datasets were imported without errors.
+        Otherwise all the datasets are read again.
+
+        Args:
+            harvest_job (HarvestJob): The harvest job object.
+
+        Returns:
+            str: The watermark. None if there is no watermark, the config has changed, the job that
+                stored it did not finish without errors or `force_all` is set.
+        """
+        if (self.config or {}).get('force_all', False) is True:
+            return None
+
+        stored = self._get_source_state(harvest_job.source.id, self._watermark_extra_key)
+        if not stored or stored.get('config') != self._get_config_hash():
+            return None
+
+        last_error_free_job = self.last_error_free_job(harvest_job)
+        log.debug('Last error-free job: %r', last_error_free_job)
+        if not last_error_free_job or stored.get('job') != last_error_free_job.id:
+            log.info('The watermark was not stored by the last error-free job, all the datasets are read')
+            return None
+
+        return stored.get('watermark')
+
+    def _store_watermark(self, harvest_job, watermark):
+        """
+        Stores the watermark in the harvest source, to filter the datasets of the next gather stage
+        if this job finishes without errors.
+
+        Args:
+            harvest_job (HarvestJob): The harvest job object.
+            watermark (str): The latest value of the `modified_column`.
+        """
+        self._set_source_state(
+            harvest_job.source.id, self._watermark_extra_key,
+            {'watermark': str(watermark), 'config': self._get_config_hash(), 'job': harvest_job.id})
+
     def _save_queries(self):
         raise NotImplementedError("The _save_queries method must be defined in the subclass for the specific database type: {}".format(self._database_type))
 
@@ -1033,6 +1196,9 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
         data = data.apply(lambda x: x.str.strip() if x.dtype == 'object' else x)
         data = data.fillna(value='')
 
+        # Convert the comma-separated values of the list fields into lists
+        data = self._split_list_columns(data)
+
         # Convert table to list of dicts
         return data.to_dict('records')
 
@@ -1068,90 +1234,6 @@ class SchemingDCATSQLHarvester(SchemingDCATHarvester):
             log.debug('No distributions loaded. Check "distribution.%s" fields', dataset_id_colname)
             return None
 
-    def _add_distributions_and_datadictionaries_to_datasets(self, table_datasets, table_distributions_grouped, table_datadictionaries_grouped, identifier_field='identifier', alternate_identifier_field='alternate_identifier', inspire_id_field='inspire_id', datadictionary_id_field="id"):
-        """
-        Add distributions (CKAN resources) and datadictionaries to each dataset object.
-
-        Args:
-            table_datasets (list): List of dataset objects.
-            table_distributions_grouped (dict): Dictionary of distributions grouped by dataset identifier.
-            table_datadictionaries_grouped (dict): Dictionary of datadictionaries grouped by dataset identifier.
-            identifier_field (str, optional): Field name for the identifier. Defaults to 'identifier'.
-            alternate_identifier_field (str, optional): Field name for the alternate identifier. Defaults to 'alternate_identifier'.
-            inspire_id_field (str, optional): Field name for the inspire id. Defaults to 'inspire_id'.
-            datadictionary_id_field (str, optional): Field name for the datadictionary id. Defaults to 'id'.
-
-        Returns:
-            list: List of dataset objects with distributions (CKAN resources) and datadictionaries added.
-        """
-        try:
-            return [
-                {
-                    **d,
-                    'resources': [
-                        {**dr, 'datadictionaries': table_datadictionaries_grouped.get(dr[datadictionary_id_field], []) if table_datadictionaries_grouped else []}
-                        for dr in table_distributions_grouped.get(
-                            d.get(identifier_field) or d.get(alternate_identifier_field) or d.get(inspire_id_field), []
-                        )
-                    ]
-                }
-                for d in table_datasets
-            ]
-        except Exception as e:
-            log.error("Error while adding distributions and datadictionaries to datasets: %s", str(e))
-            raise
-
-    def _update_dict_lists(self, data):
-        """
-        Update the dictionary lists in the given data.
-
-        Args:
-            data (list): The data to be updated.
-
-        Returns:
-            list: The updated data.
-        """
-        if self._local_schema is None:
-            self._local_schema = self._get_local_schema()
-
-        # Get the list of fields that should be converted to lists
-        list_fields = ['groups'] + [
-            field['field_name']
-            for field in self._local_schema['dataset_fields']
-            if any(keyword in field.get(field_type, '').lower() for keyword in ['list', 'multiple', 'tag_string', 'tag', 'group'] for field_type in ['validators', 'output_validators', 'preset']) or 'groups' in field['field_name'].lower()
-        ]
-
-        for element in data:
-            for key, value in element.items():
-                if key in list_fields and isinstance(value, str):
-                    element[key] = self._set_string_to_list(value)
-                elif key == 'distributions':
-                    for distribution in value:
-                        for key_dist, value_dist in distribution.items():
-                            if key_dist in list_fields and isinstance(value_dist, str):
-                                distribution[key_dist] = self._set_string_to_list(value_dist)
-
-        # Return the updated data
-        return data
-
-    @staticmethod
-    def _set_string_to_list(value):
-        """
-        Converts a comma-separated string into a list of items.
-
-        Args:
-            value (str): The comma-separated string to convert.
-
-        Returns:
-            list: A list of items, with leading and trailing whitespace removed from each item,
-                  and leading dashes from each item.
-
-        Example:
-            >>> _set_string_to_list('apple, banana, -orange')
-            ['apple', 'banana', 'orange']
-        """
-        return [x.strip(" -") for x in value.split(',') if x.strip()]
-
     @staticmethod
     def obfuscate_credentials_in_url(conn_url):
         """
@@ -0,0 +1,276 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import defaultdict, deque, namedtuple
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import ckan.plugins as p
+
+log = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAX_SIZE = 5
+DEFAULT_POOL_IDLE_TIMEOUT = 300
+DEFAULT_POOL_HEALTH_CHECK_INTERVAL = 30
+DEFAULT_POOL_TIMEOUT = 30
+
+
+class PoolTimeoutError(ValueError):
+    pass
+
+
+class PoolKey(namedtuple('PoolKey', ['scheme', 'host', 'port', 'database', 'username', 'password_digest'])):
+    """
+    Key of the connections of a database and user. The password is kept as a digest, and the key is
+    shown without credentials in the logs and errors.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        port = f':{self.port}' if self.port else ''
+        return f'{self.scheme}://****:****@{self.host}{port}/{self.database}'
+
+
+class ConnectionPool(object):
+    """
+    Process-wide pool of database connections shared by the SQL harvest sources.
+
+    Connections are kept per database and credentials, so harvest sources pointing at the same
+    database with the same user reuse them across concurrent and back-to-back gather stages. Idle connections are
+    checked before being reused and closed after the idle timeout.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, idle_timeout: Optional[int] = None,
+                 health_check_interval: Optional[int] = None, timeout: Optional[int] = None):
+        """
+        Args:
+            max_size (int, optional): Maximum number of connections per connection URL. Defaults to the
+                `ckanext.schemingdcat.sql.pool_max_size` config option.
+            idle_timeout (int, optional): Seconds an idle connection is kept open. Defaults to the
+                `ckanext.schemingdcat.sql.pool_idle_timeout` config option.
+            health_check_interval (int, optional): Seconds after which an idle connection is checked
+                before being reused. Defaults to the `ckanext.schemingdcat.sql.pool_health_check_interval`
+                config option.
+            timeout (int, optional): Seconds to wait for a free connection when the pool is full. Defaults
+                to the `ckanext.schemingdcat.sql.pool_timeout` config option.
+        """
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._health_check_interval = health_check_interval
+        self._timeout = timeout
+        self._lock = threading.Condition()
+        self._idle = defaultdict(deque)
+        self._in_use = defaultdict(int)
+        self._metrics = defaultdict(lambda: {'created': 0, 'reused': 0, 'closed': 0, 'failed_checks': 0, 'waits': 0})
+
+    @staticmethod
+    def _get_config_int(key: str, default: int) -> int:
+        try:
+            return int(p.toolkit.config.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return max(self._get_config_int('ckanext.schemingdcat.sql.pool_max_size', DEFAULT_POOL_MAX_SIZE), 1)
+
+    @property
+    def idle_timeout(self) -> int:
+        if self._idle_timeout is not None:
+            return self._idle_timeout
+        return self._get_config_int('ckanext.schemingdcat.sql.pool_idle_timeout', DEFAULT_POOL_IDLE_TIMEOUT)
+
+    @property
+    def health_check_interval(self) -> int:
+        if self._health_check_interval is not None:
+            return self._health_check_interval
+        return self._get_config_int('ckanext.schemingdcat.sql.pool_health_check_interval', DEFAULT_POOL_HEALTH_CHECK_INTERVAL)
+
+    @property
+    def timeout(self) -> int:
+        if self._timeout is not None:
+            return self._timeout
+        return self._get_config_int('ckanext.schemingdcat.sql.pool_timeout', DEFAULT_POOL_TIMEOUT)
+
+    @staticmethod
+    def get_key(conn_url: str) -> PoolKey:
+        """
+        Returns the pool key of a connection URL: its scheme, host, port, database, username and a
+        digest of its password, so sources with different credentials never share connections.
+        """
+        parts = urlparse(conn_url)
+        password_digest = hashlib.sha256(parts.password.encode('utf-8')).hexdigest() if parts.password else None
+        return PoolKey(parts.scheme, parts.hostname, parts.port, parts.path.lstrip('/'), parts.username, password_digest)
+
+    def acquire(self, conn_url: str, connect: Callable[[str], Any],
+                check: Optional[Callable[[Any], None]] = None) -> Any:
+        """
+        Returns a connection to the database, reusing an idle one if possible.
+
+        Args:
+            conn_url (str): The connection URL.
+            connect (callable): Opens a new connection from the connection URL.
+            check (callable, optional): Raises an exception if a connection is not usable (e.g.
+                runs `SELECT 1`). Used on connections idle for longer than the health check interval.
+
+        Returns:
+            The connection. It must be given back with `release`.
+
+        Raises:
+            PoolTimeoutError: If the pool is full and no connection is released in time.
+        """
+        key = self.get_key(conn_url)
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            connection, released_at = None, None
+            create, timed_out = False, False
+            with self._lock:
+                expired = self._pop_expired()
+                if self._idle[key]:
+                    # Most recently used first, so the rest can expire
+                    connection, released_at = self._idle[key].pop()
+                    self._in_use[key] += 1
+                elif self._in_use[key] < self.max_size:
+                    self._in_use[key] += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        timed_out = True
+                    else:
+                        self._metrics[key]['waits'] += 1
+                        self._lock.wait(remaining)
+            self._close_connections(expired)
+
+            if timed_out:
+                raise PoolTimeoutError(f'No database connection available for {key} after {self.timeout}s (max_size: {self.max_size})')
+            if create:
+                return self._connect(key, conn_url, connect)
+            if connection is None:
+                continue
+
+            if self._is_healthy(connection, released_at, check):
+                with self._lock:
+                    self._metrics[key]['reused'] += 1
+                return connection
+
+            with self._lock:
+                self._in_use[key] -= 1
+                self._metrics[key]['failed_checks'] += 1
+                self._lock.notify()
+            self._close_connections([(key, connection)])
+
+    def release(self, conn_url: str, connection: Any, reset: Optional[Callable[[Any], None]] = None) -> None:
+        """
+        Gives back a connection to the pool.
+
+        Args:
+            conn_url (str): The connection URL used to acquire the connection.
+            connection: The connection.
+            reset (callable, optional): Leaves the connection ready to be reused (e.g. rolls back the
+                open transaction). If it fails, the connection is closed.
+        """
+        key = self.get_key(conn_url)
+        healthy = not getattr(connection, 'closed', False)
+        if healthy and reset is not None:
+            try:
+                reset(connection)
+            except Exception as e:
+                log.debug('Closing pooled connection to %s, it could not be reset: %s', key, e)
+                healthy = False
+
+        with self._lock:
+            self._in_use[key] = max(self._in_use[key] - 1, 0)
+            if healthy:
+                self._idle[key].append((connection, time.monotonic()))
+            self._lock.notify()
+
+        if not healthy:
+            self._close_connections([(key, connection)])
+
+    def discard(self, conn_url: str, connection: Any) -> None:
+        """
+        Closes a connection acquired from the pool that must not be reused.
+        """
+        key = self.get_key(conn_url)
+        with self._lock:
+            self._in_use[key] = max(self._in_use[key] - 1, 0)
+            self._lock.notify()
+        self._close_connections([(key, connection)])
+
+    def close_all(self) -> None:
+        """
+        Closes all the idle connections.
+        """
+        with self._lock:
+            connections = [(key, connection) for key, idle in self._idle.items() for connection, _ in idle]
+            self._idle.clear()
+        self._close_connections(connections)
+
+    def metrics(self) -> Dict[PoolKey, Dict[str, int]]:
+        """
+        Returns the metrics of the pool for each connection URL.
+
+        Returns:
+            dict: `created`, `reused`, `closed`, `failed_checks` (idle connections discarded by the
+                health check), `waits` (acquisitions that waited for a free connection), `in_use`
+                and `idle`, by pool key (see `get_key`).
+        """
+        with self._lock:
+            return {
+                key: dict(metrics, in_use=self._in_use[key], idle=len(self._idle[key]))
+                for key, metrics in self._metrics.items()
+            }
+
+    def _connect(self, key: PoolKey, conn_url: str, connect: Callable[[str], Any]) -> Any:
+        try:
+            connection = connect(conn_url)
+        except Exception:
+            with self._lock:
+                self._in_use[key] -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._metrics[key]['created'] += 1
+        log.debug('Opened a new pooled connection to %s', key)
+        return connection
+
+    def _is_healthy(self, connection: Any, released_at: float, check: Optional[Callable[[Any], None]]) -> bool:
+        if getattr(connection, 'closed', False):
+            return False
+        if check is None or time.monotonic() - released_at < self.health_check_interval:
+            return True
+        try:
+            check(connection)
+        except Exception as e:
+            log.debug('Pooled connection failed the health check: %s', e)
+            return False
+        return True
+
+    def _pop_expired(self):
+        """
+        Removes the connections idle for longer than the idle timeout. Must be called with the lock held.
+        """
+        expired = []
+        limit = time.monotonic() - self.idle_timeout
+        for key, idle in self._idle.items():
+            while idle and idle[0][1] < limit:
+                expired.append((key, idle.popleft()[0]))
+        return expired
+
+    def _close_connections(self, connections) -> None:
+        for key, connection in connections:
+            try:
+                connection.close()
+            except Exception as e:
+                log.debug('Error closing pooled connection to %s: %s', key, e)
+            with self._lock:
+                self._metrics[key]['closed'] += 1
+
+
+connection_pool = ConnectionPool()
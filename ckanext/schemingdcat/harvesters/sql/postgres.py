@@ -1,6 +1,8 @@
 import logging
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import psycopg2
@@ -12,16 +14,45 @@ from ckanext.schemingdcat.utils import (
     sql_clauses
 )
 from ckanext.schemingdcat.harvesters.sql.base import SchemingDCATSQLHarvester, DatabaseManager
+from ckanext.schemingdcat.harvesters.sql.pool import connection_pool
 
 log = logging.getLogger(__name__)
 
 
 class PostgresDatabaseManager(DatabaseManager):
-    connection = None
+    """
+    PostgreSQL database manager. Connections are taken from the process-wide connection pool, and
+    kept per thread, so concurrent gather stages sharing the manager do not share connections.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        return getattr(self._local, 'connection', None)
+
+    @staticmethod
+    def _connect(conn_url):
+        return psycopg2.connect(conn_url)
+
+    @staticmethod
+    def _ping(connection):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        connection.rollback()
+
+    @staticmethod
+    def _reset(connection):
+        # Ends the open transaction (and closes its server-side cursors) before reusing the connection
+        connection.rollback()
 
     def connect(self, conn_url):
+        if self.connection:
+            return
         try:
-            self.connection = psycopg2.connect(conn_url)
+            self._local.connection = connection_pool.acquire(conn_url, self._connect, self._ping)
+            self._local.conn_url = conn_url
         except psycopg2.Error as e:
             raise ValueError('Error connecting to the database: %s', e)
 
@@ -33,29 +64,28 @@ class PostgresDatabaseManager(DatabaseManager):
             raise ValueError('Unable to connect to the database after %s retries.', retry)
 
         try:
-            connection = psycopg2.connect(conn_url)
+            # The checked connection goes back to the pool, to be reused by the gather stage
+            connection = connection_pool.acquire(conn_url, self._connect, self._ping)
         except psycopg2.Error as e:
             log.debug(str(e))
             log.info('Unable to connect to the database, waiting...')
             time.sleep(10)
             self.check_connection(conn_url, retry=retry - 1)
         else:
-            connection.close()
+            connection_pool.release(conn_url, connection, self._reset)
     
     def disconnect(self):
         if self.connection:
-            self.connection.close()
-            self.connection = None
+            connection_pool.release(self._local.conn_url, self.connection, self._reset)
+            log.debug('Database connection pool: %s', connection_pool.metrics().get(connection_pool.get_key(self._local.conn_url)))
+            self._local.connection = None
 
-    def execute_query(self, query):
+    def execute_query(self, query, params=None):
         if not self.connection:
-            try:
-                self.connect()
-            except psycopg2.Error as e: 
-                raise ValueError('Database connection is not established: %s' % e)
+            raise ValueError('Database connection is not established.')
         try:
             cursor = self.connection.cursor()
-            cursor.execute(query)
+            cursor.execute(query, params)
             
             # Always select queries, only fetchall is required.
             results = cursor.fetchall()
@@ -70,6 +100,46 @@ class PostgresDatabaseManager(DatabaseManager):
         except psycopg2.Error as e:
             raise ValueError('Error executing query: %s' % e)
 
+    def execute_query_stream(self, query, itersize=None, params=None):
+        """
+        Executes a query with a named (server-side) cursor and yields its results in chunks of rows,
+        so the whole result set is never held in memory.
+
+        The statements before the last one (e.g. `SET search_path`) are executed with a regular
+        cursor, as a named cursor only accepts a single SELECT.
+
+        Args:
+            query (str): The query to execute.
+            itersize (int, optional): The number of rows fetched per round trip. Defaults to 2000.
+            params (dict, optional): The parameters of the last statement.
+
+        Yields:
+            tuple: The rows of the chunk and the column names.
+        """
+        if not self.connection:
+            raise ValueError('Database connection is not established.')
+
+        itersize = itersize or 2000
+        *statements, select_query = [statement.strip() for statement in query.split(';') if statement.strip()]
+        try:
+            with self.connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+            cursor = self.connection.cursor(name=f'schemingdcat_{uuid.uuid4().hex}')
+            cursor.itersize = itersize
+            try:
+                cursor.execute(select_query, params)
+                while True:
+                    results = cursor.fetchmany(itersize)
+                    if not results:
+                        break
+                    yield results, [desc[0] for desc in cursor.description]
+            finally:
+                cursor.close()
+        except psycopg2.Error as e:
+            raise ValueError('Error executing query: %s' % e)
+
 # TODO: PostgreSQL Harvester
 class SchemingDCATPostgresHarvester(SchemingDCATSQLHarvester):
     '''
@@ -109,23 +179,31 @@ class SchemingDCATPostgresHarvester(SchemingDCATSQLHarvester):
         else:
             raise ValueError('Database type not supported.')
                          
-    def _read_remote_database(self, field_mappings, conn_url):
+    def _iter_remote_database(self, field_mappings, conn_url, incremental=None):
         """
-        Reads data from a remote database and maps it according to the provided field mappings.
+        Reads data from a remote database and yields it mapped according to the provided field mappings.
 
-        Establishes a connection to a remote database using conn_url. Generates and executes queries based on field_mappings to fetch data. Organizes fetched data into a dictionary categorized by mapping keys.
+        Establishes a connection to a remote database using conn_url and generates the queries based on field_mappings.
+        The datasets query is consumed from a server-side cursor, yielding a dict per chunk of `itersize` rows,
+        each one with the whole distributions and datadictionaries. The distributions, datadictionaries and
+        remote identifiers queries are independent, so they run concurrently with the datasets query, each one
+        on its own pooled connection, up to `max_parallel_queries` queries at the same time.
+
+        On incremental harvests, `incremental` is updated with the `next_watermark` (the latest value of the
+        `modified_column`) and the `remote_ids` (the identifiers of all the remote datasets, read with an id-only
+        query) before the datasets are read. If it has a `watermark`, only the datasets modified after it are read.
 
         Args:
             field_mappings (dict): Dictionary defining database fields mapping to desired structure.
             conn_url (str): Connection URL for the remote database.
+            incremental (dict, optional): The incremental harvest state, with the `watermark` of the previous job.
 
-        Returns:
-            dict: Dictionary containing lists of data categorized by keys in field_mappings, with data as pd.DataFrames or None.
+        Yields:
+            dict: Dictionary with the datasets chunk, distributions and datadictionaries, as pd.DataFrames or None.
 
         Raises:
             ValueError: If database connection cannot be established.
         """
-                
         if not self.db_manager.connection:
             try:
                 self.db_manager.connect(conn_url)
@@ -133,70 +211,163 @@ class SchemingDCATPostgresHarvester(SchemingDCATSQLHarvester):
                 raise ValueError(f"Database connection is not established: {e}") from e
         
         # Create queries
-        self._save_queries(field_mappings)
+        self._save_queries(field_mappings, incremental)
         log.debug('Field mappings queries: %s', self._queries)
-        
-        # Mapping for content categories
-        content_category_mapping = {
-            "dataset_field_mapping": "datasets",
-            "distribution_field_mapping": "distributions",
-            "datadictionary_field_mapping": "datadictionaries"
+
+        itersize = self._get_itersize()
+        dataset_params = None
+        executor = None
+        futures = {}
+        try:
+            if incremental is not None:
+                # Read the watermark before the datasets, so the rows modified meanwhile are read again by the next job
+                results, _ = self.db_manager.execute_query(self._queries['dataset_watermark'])
+                incremental['next_watermark'] = results[0][0] if results else None
+                if incremental.get('watermark'):
+                    dataset_params = {'watermark': incremental['watermark']}
+
+            tasks = {}
+            if incremental is not None:
+                tasks['remote_ids'] = (self._read_query_ids, self._queries['dataset_ids'], itersize)
+            for mapping, category in (("distribution_field_mapping", "distributions"), ("datadictionary_field_mapping", "datadictionaries")):
+                query = self._queries.get(mapping)
+                tasks[category] = (self._read_query_dataframe, query, itersize) if query else None
+
+            # The datasets query keeps a connection, the rest of the queries share the other ones
+            max_workers = min(self._get_max_parallel_queries(), connection_pool.max_size) - 1
+            if max_workers > 0:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='schemingdcat_sql')
+                futures = {
+                    category: executor.submit(self._read_query_in_thread, conn_url, *task)
+                    for category, task in tasks.items() if task is not None
+                }
+                log.debug('Running %s queries in parallel with the datasets query (max_workers: %s)', len(futures), max_workers)
+
+            def join_results():
+                # Waits for the parallel queries, or runs them on this connection if there are no workers
+                results = {}
+                for category, task in tasks.items():
+                    if category in futures:
+                        results[category] = futures[category].result()
+                    else:
+                        results[category] = task[0](*task[1:]) if task is not None else None
+                if incremental is not None:
+                    incremental['remote_ids'] = results.pop('remote_ids')
+                return results
+
+            # Without workers, the related content is read before the datasets
+            related_content = join_results() if executor is None else None
+
+            for datasets in self._iter_query_dataframes(self._queries["dataset_field_mapping"], itersize, dataset_params):
+                log.debug('Read a chunk of %s datasets from the remote database', len(datasets))
+                if related_content is None:
+                    related_content = join_results()
+                yield {"datasets": datasets, **related_content}
+
+            if related_content is None:
+                join_results()
+
+        finally:
+            if executor is not None:
+                for future in futures.values():
+                    future.cancel()
+                executor.shutdown(wait=True)
+            self.db_manager.disconnect()
+
+    def _read_query_in_thread(self, conn_url, read, *args):
+        """
+        Runs a read of the remote database on a pooled connection of the current (worker) thread.
+
+        Args:
+            conn_url (str): Connection URL for the remote database.
+            read (callable): The read, e.g. `_read_query_dataframe`.
+            *args: The arguments of the read.
+
+        Returns:
+            The result of the read.
+        """
+        self.db_manager.connect(conn_url)
+        try:
+            return read(*args)
+        finally:
+            self.db_manager.disconnect()
+
+    def _read_query_dataframe(self, query, itersize):
+        """
+        Reads the whole results of a query as a DataFrame.
+
+        Returns:
+            pd.DataFrame: The results, with string values. None if there are no rows.
+        """
+        chunks = list(self._iter_query_dataframes(query, itersize))
+        return pd.concat(chunks, ignore_index=True) if chunks else None
+
+    def _read_query_ids(self, query, itersize):
+        """
+        Reads the identifiers returned by an id-only query.
+
+        Returns:
+            set: The identifiers, as stripped strings.
+        """
+        return {
+            str(row[0]).strip()
+            for rows, _ in self.db_manager.execute_query_stream(query, itersize)
+            for row in rows if row[0] is not None
         }
-        
-        content_dicts = {value: [] for value in content_category_mapping.values()}
-        for mapping, query in self._queries.items():
-            results, column_names = self.db_manager.execute_query(query)
-            results_df = pd.DataFrame(results, columns=column_names, dtype=str).fillna('')
-
-            # # Exporting the DataFrame to a CSV file
-            # log.debug('export to output.csv')
-            # filename = f'output_{mapping}.csv'
-            # results_df.to_csv(filename, index=False)
-            
-            # Map the result to the correct category in the results dictionary
-            # Only add results_df if it is not empty
-            if mapping in content_category_mapping and not results_df.empty:
-                content_dicts[content_category_mapping[mapping]].append(results_df)
-                            
-        self.db_manager.disconnect()
-        
-        # Convert lists of DataFrames to single DataFrames for each category
-        for key in content_dicts:
-            if content_dicts[key]:
-                concatenated_df = pd.concat(content_dicts[key], ignore_index=True)
-                # Assign None if the concatenated DataFrame is empty
-                content_dicts[key] = concatenated_df if not concatenated_df.empty else None
-            else:
-                content_dicts[key] = None
-        
-        return content_dicts
 
-    def _process_content(self, content_dicts, conn_url, field_mapping):
+    def _iter_query_dataframes(self, query, itersize, params=None):
+        """
+        Executes a query with a server-side cursor and yields its results as DataFrames.
+
+        Args:
+            query (str): The query to execute.
+            itersize (int): The maximum number of rows per DataFrame.
+            params (dict, optional): The parameters of the query.
+
+        Yields:
+            pd.DataFrame: A chunk of the results, with string values.
+        """
+        for results, column_names in self.db_manager.execute_query_stream(query, itersize, params):
+            yield pd.DataFrame(results, columns=column_names, dtype=str).fillna('')
+
+    def _process_content(self, content_dicts, conn_url, field_mapping, grouped_content=None):
         """
         Processes the SQL query content_dicts based on the field_mapping, handling multilingual fields by appending -lang to the original field name for each available language.
+
+        The cleaned distributions and datadictionaries are cached in `grouped_content`, so they are only
+        cleaned and grouped once when the datasets are processed in chunks. If it has `matched_ids`, the
+        orphan rows are left to be reported by the caller.
         """
         
         log.debug('In SchemingDCATPostgresHarvester process_content: %s', self.obfuscate_credentials_in_url(conn_url))
+        if grouped_content is None:
+            grouped_content = {}
         
         # Clean datasets
         table_datasets = self._clean_table_datasets(content_dicts['datasets'])
         
         # Clean distributions
         dataset_id_colname = self._field_mapping_info['distribution_field_mapping'].get('parent_resource_id')
-        if content_dicts.get('distributions') is not None and not content_dicts['distributions'].empty:
+        if 'distributions' in grouped_content:
+            table_distributions_grouped = grouped_content['distributions']
+        elif content_dicts.get('distributions') is not None and not content_dicts['distributions'].empty:
             table_distributions_grouped = self._clean_table_distributions(content_dicts['distributions'], dataset_id_colname)
         else:
             log.debug('No distributions loaded. Check "distribution.%s" fields', dataset_id_colname)
             table_distributions_grouped = None
+        grouped_content['distributions'] = table_distributions_grouped
         
         # Clean datadictionaries
         distribution_id_colname = self._field_mapping_info['datadictionary_field_mapping'].get('parent_resource_id')
-        if content_dicts.get('datadictionaries') is not None and not content_dicts['datadictionaries'].empty:
+        if 'datadictionaries' in grouped_content:
+            table_datadictionaries_grouped = grouped_content['datadictionaries']
+        elif content_dicts.get('datadictionaries') is not None and not content_dicts['datadictionaries'].empty:
             table_datadictionaries_grouped = self._clean_table_datadictionaries(content_dicts['datadictionaries'], distribution_id_colname)
         else:
             table_datadictionaries_grouped = None
+        grouped_content['datadictionaries'] = table_datadictionaries_grouped
 
-        return self._add_distributions_and_datadictionaries_to_datasets(table_datasets, table_distributions_grouped, table_datadictionaries_grouped)
+        return self._add_distributions_and_datadictionaries_to_datasets(table_datasets, table_distributions_grouped, table_datadictionaries_grouped, matched_ids=grouped_content.get('matched_ids'))
 
     def modify_package_dict(self, package_dict, harvest_object):
       '''
@@ -243,19 +414,25 @@ class SchemingDCATPostgresHarvester(SchemingDCATSQLHarvester):
         return package_dict
     
     # PostgreSQL-Postgis DB
-    def _save_queries(self, field_mappings):
+    def _save_queries(self, field_mappings, incremental=None):
         """
         Saves queries from field mappings into a dictionary.
 
         Iterates over field_mappings, checking if each is required or can be skipped if None. Constructs SQL queries for non-None mappings and stores them in self._queries. Raises ValueError for required but None mappings, and RuntimeError for errors during query construction.
 
+        On incremental harvests, the datasets query is filtered by the `modified_column` when there is a
+        `watermark`, and the `dataset_watermark` and `dataset_ids` queries are added.
+
         Args:
             field_mappings (dict): Dictionary with query types as keys and field mappings as values.
+            incremental (dict, optional): The incremental harvest state, with the `watermark` of the previous job.
 
         Raises:
             ValueError: For required but None field mappings.
             RuntimeError: For errors in query construction.
         """
+        # Queries of this harvest source only, not shared with the rest of instances
+        self._queries = {}
         try:
             for query_type, field_mapping in field_mappings.items():
                 # Retrieve the mapping info for the current query type
@@ -270,7 +447,15 @@ class SchemingDCATPostgresHarvester(SchemingDCATSQLHarvester):
                 elif not mapping_info["required"] and field_mapping is None:
                     continue
 
-                query = self._build_query(field_mapping)
+                where = None
+                if query_type == 'dataset_field_mapping' and incremental is not None:
+                    modified_column = field_mapping[self._get_modified_field(field_mapping)]['field_name']
+                    self._queries['dataset_watermark'] = self._build_watermark_query(modified_column)
+                    self._queries['dataset_ids'] = self._build_query({'identifier': field_mapping['identifier']})
+                    if incremental.get('watermark'):
+                        where = f"{modified_column} > {self._build_query_param('watermark')}"
+
+                query = self._build_query(field_mapping, where)
                 # Ensure that self._queries[query_type] is a dictionary
                 if query_type not in self._queries:
                     self._queries[query_type] = {}
@@ -279,7 +464,7 @@ class SchemingDCATPostgresHarvester(SchemingDCATSQLHarvester):
         except Exception as e:
             raise RuntimeError("Error generating queries") from e
 
-    def _build_query(self, field_mapping):
+    def _build_query(self, field_mapping, where=None):
       """
       Constructs a SQL query based on the provided field mapping, considering both direct field names
       and nested field names within language-specific dictionaries.
@@ -289,6 +474,7 @@ class SchemingDCATPostgresHarvester(SchemingDCATSQLHarvester):
           the database schema, table, and column names, as well as foreign key references
           and whether the field is a primary key. Field names can be direct strings or nested
           within language-specific dictionaries under a 'languages' key.
+        where (str, optional): A condition to filter the rows, e.g. the incremental harvest predicate.
 
       Returns:
         str: A SQL query string constructed based on the field mapping.
@@ -323,7 +509,7 @@ class SchemingDCATPostgresHarvester(SchemingDCATSQLHarvester):
         search_path = self._set_search_path(query_components['schemas'])
         # Assuming schema and table are defined; this might need adjustment based on actual use case
         base_query = f"SELECT {', '.join(query_components['selects'])} FROM {schema}.{table}"
-        full_query = ' '.join([search_path, base_query] + query_components['joins'])
+        full_query = ' '.join([search_path, base_query] + query_components['joins'] + ([f"WHERE {where}"] if where else []))
 
         log.debug('full_query:%s', full_query)
 
@@ -332,6 +518,32 @@ class SchemingDCATPostgresHarvester(SchemingDCATSQLHarvester):
       except Exception as e:
         raise RuntimeError("Error generating SQL query") from e
     
+    def _build_query_param(self, name):
+        """
+        Returns the placeholder of a named query parameter.
+
+        Args:
+            name (str): The parameter name.
+
+        Returns:
+            str: The placeholder, in the psycopg2 `pyformat` style.
+        """
+        return f"%({name})s"
+
+    def _build_watermark_query(self, modified_column):
+        """
+        Builds the query of the latest value of the `modified_column`, used as the watermark of the next
+        incremental harvest.
+
+        Args:
+            modified_column (str): The modified column, in the format `{schema}.{table}.{field}`.
+
+        Returns:
+            str: The SQL query.
+        """
+        schema, table, _ = modified_column.split('.')
+        return f"SELECT MAX({modified_column}) FROM {schema}.{table}"
+
     def _build_select_clause(self, schema, table, column, alias):
         """
         Builds a SELECT clause for a SQL query.
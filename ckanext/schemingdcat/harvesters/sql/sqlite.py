@@ -1,28 +1,122 @@
+import json
 import logging
+import os
 import sqlite3
+import threading
+from urllib.parse import quote, unquote, urlparse
 
-from ckanext.schemingdcat.harvesters.sql.base import SchemingDCATSQLHarvester, DatabaseManager
+import ckan.plugins as p
+
+from ckanext.schemingdcat.harvesters.sql.base import DatabaseManager
+from ckanext.schemingdcat.harvesters.sql.postgres import SchemingDCATPostgresHarvester
 
 log = logging.getLogger(__name__)
 
 
 class SqliteDatabaseManager(DatabaseManager):
-    def connect(self):
-        self._connection = sqlite3.connect(self.db_path)
+    """
+    SQLite database manager. The databases are opened read-only (`mode=ro` URI), with a
+    connection per thread, so the parallel queries of the gather stage do not share connections.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        return getattr(self._local, 'connection', None)
+
+    @staticmethod
+    def _connect(conn_url):
+        return sqlite3.connect(conn_url, uri=True)
+
+    def connect(self, conn_url):
+        if self.connection:
+            return
+        try:
+            self._local.connection = self._connect(conn_url)
+        except sqlite3.Error as e:
+            raise ValueError('Error connecting to the database: %s' % e)
+
+    def check_connection(self, conn_url, retry=None):
+        # Local files are not retried, the database is either readable or not
+        try:
+            connection = self._connect(conn_url)
+            try:
+                connection.execute('SELECT 1 FROM sqlite_master LIMIT 1')
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            raise ValueError('Unable to open the database: %s' % e)
 
     def disconnect(self):
-        if self._connection:
-            self._connection.close()
+        if self.connection:
+            self.connection.close()
+            self._local.connection = None
+
+    def _split_statements(self, query):
+        return [statement.strip() for statement in query.split(';') if statement.strip()]
+
+    def execute_query(self, query, params=None):
+        if not self.connection:
+            raise ValueError('Database connection is not established.')
+        *statements, select_query = self._split_statements(query)
+        try:
+            for statement in statements:
+                self.connection.execute(statement)
+            cursor = self.connection.execute(select_query, params or {})
+            try:
+                results = cursor.fetchall()
+                column_names = [desc[0] for desc in cursor.description]
+            finally:
+                cursor.close()
+            return results, column_names
+        except sqlite3.Error as e:
+            raise ValueError('Error executing query: %s' % e)
 
-    def execute_query(self, query):
-        pass
+    def execute_query_stream(self, query, itersize=None, params=None):
+        """
+        Executes a query and yields its results in chunks of rows with `fetchmany`, so the whole
+        result set is never held in memory.
 
-# TODO: SQLite Harvester using interfaces
-class SchemingDCATSQLiteHarvester(SchemingDCATSQLHarvester):
+        Args:
+            query (str): The query to execute.
+            itersize (int, optional): The number of rows per chunk. Defaults to 2000.
+            params (dict, optional): The parameters of the last statement.
+
+        Yields:
+            tuple: The rows of the chunk and the column names.
+        """
+        if not self.connection:
+            raise ValueError('Database connection is not established.')
+
+        itersize = itersize or 2000
+        *statements, select_query = self._split_statements(query)
+        try:
+            for statement in statements:
+                self.connection.execute(statement)
+            cursor = self.connection.execute(select_query, params or {})
+            try:
+                column_names = [desc[0] for desc in cursor.description]
+                while True:
+                    results = cursor.fetchmany(itersize)
+                    if not results:
+                        break
+                    yield results, column_names
+            finally:
+                cursor.close()
+        except sqlite3.Error as e:
+            raise ValueError('Error executing query: %s' % e)
+
+
+class SchemingDCATSQLiteHarvester(SchemingDCATPostgresHarvester):
     """
     A custom harvester for harvesting SQLite databases using the schemingdcat extension.
 
-    It extends the base `SchemingDCATSQLHarvester` class.
+    It reuses the queries of the `SchemingDCATPostgresHarvester`: the field names are
+    `{schema}.{table}.{field}`, where the schema is `main` (or the name of an attached database).
+    The database file is the `database_path` config option or the path of a `file://` source URL,
+    and it must be inside the `ckanext.schemingdcat.sqlite.base_dir` directory.
     """
 
     def info(self):
@@ -31,7 +125,123 @@ class SchemingDCATSQLiteHarvester(SchemingDCATSQLHarvester):
             'title': 'SQLite Database Harvester',
             'description': 'An SQLite database harvester for CKAN'
         }
-    
+
     db_manager = SqliteDatabaseManager()
+    harvester_type = 'sqlite'
+    _credentials_required = False
     _db_path = None
-    _connection = None
\ No newline at end of file
+
+    def validate_config(self, config):
+        config = super().validate_config(config)
+
+        database_path = json.loads(config).get('database_path')
+        if database_path is not None and (not isinstance(database_path, str) or not database_path.strip()):
+            raise ValueError('database_path must be a non-empty string')
+        if database_path is not None:
+            self.get_allowed_database_path(database_path)
+
+        return config
+
+    @staticmethod
+    def get_allowed_database_path(db_path):
+        """
+        Returns the real path of an SQLite database file, checking that it is inside the directory
+        set in the `ckanext.schemingdcat.sqlite.base_dir` config option. Relative paths are relative
+        to that directory.
+
+        Args:
+            db_path (str): The path of the database file.
+
+        Returns:
+            str: The real path of the database file, with the symbolic links resolved.
+
+        Raises:
+            ValueError: If the base directory is not set or the file is outside it.
+        """
+        base_dir = p.toolkit.config.get('ckanext.schemingdcat.sqlite.base_dir')
+        if not base_dir:
+            raise ValueError('The SQLite harvester requires the ckanext.schemingdcat.sqlite.base_dir config option, the directory of the database files.')
+
+        base_dir = os.path.realpath(base_dir)
+        real_path = os.path.realpath(os.path.join(base_dir, db_path))
+        if os.path.commonpath([base_dir, real_path]) != base_dir:
+            raise ValueError(f'The SQLite database: "{db_path}" is not inside the directory: "{base_dir}" (ckanext.schemingdcat.sqlite.base_dir).')
+        return real_path
+
+    @staticmethod
+    def get_sqlite_uri(db_path):
+        """
+        Returns the read-only URI of an SQLite database file.
+
+        Args:
+            db_path (str): The path of the database file.
+
+        Returns:
+            str: The URI, e.g. `file:/data/catalog.sqlite?mode=ro`.
+        """
+        return f"file:{quote(os.path.abspath(db_path))}?mode=ro"
+
+    def _get_database_path(self, source_url):
+        """
+        Returns the path of the database file, from the `database_path` config option or the source URL.
+        """
+        database_path = (self.config or {}).get('database_path')
+        if database_path:
+            return database_path
+
+        parsed_url = urlparse(source_url)
+        if parsed_url.scheme in ('', 'file'):
+            return unquote(parsed_url.path)
+        return None
+
+    def _validate_source_url(self, harvest_job, source_url):
+        """
+        Checks that the database file exists inside the allowed directory and sets its path.
+
+        Args:
+            harvest_job (HarvestJob): The harvest job object.
+            source_url (str): The source URL, a `file://` URL if there is no `database_path` config option.
+
+        Returns:
+            bool: True if the database file exists in the allowed directory, False otherwise.
+        """
+        db_path = self._get_database_path(source_url)
+        if db_path:
+            try:
+                db_path = self.get_allowed_database_path(db_path)
+            except ValueError as e:
+                self._save_gather_error(str(e), harvest_job)
+                return False
+
+        if not db_path or not os.path.isfile(db_path):
+            self._save_gather_error(f'The SQLite database: "{db_path or source_url}" does not exist. Set a "file://" source URL or the "database_path" config option.', harvest_job)
+            return False
+
+        self._db_path = db_path
+        return True
+
+    def _generate_conn_url(self):
+        '''
+        Generates the read-only URI of the database file.
+
+        Returns:
+            str: The database URI.
+
+        Raises:
+            ValueError: If the database type is not supported.
+        '''
+        if self._database_type == self.harvester_type:
+            return self.get_sqlite_uri(self._db_path)
+        else:
+            raise ValueError('Database type not supported.')
+
+    def _build_query_param(self, name):
+        return f":{name}"
+
+    def _build_select_clause(self, schema, table, column, alias):
+        # The PostGIS expressions of the spatial fields are not available, the values are read as they are stored
+        return f"{schema}.{table}.{column} AS {alias}"
+
+    def _set_search_path(self, schemas):
+        # SQLite has no search path, the schema is "main" or the name of an attached database
+        return ''
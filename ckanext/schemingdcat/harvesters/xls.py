@@ -4,11 +4,17 @@ import logging
 import re
 import uuid
 import base64
+import hashlib
+import importlib.util
 import traceback
+import os
+import tempfile
 import six
 import dateutil
+import requests
 
 import gspread
+import openpyxl
 import pandas as pd
 
 from ckan.logic import NotFound, get_action
@@ -16,8 +22,8 @@ from ckan import logic
 import ckan.plugins as p
 import ckan.model as model
 
-from ckanext.harvest.model import HarvestObject, HarvestObjectExtra
-from ckanext.schemingdcat.harvesters.base import SchemingDCATHarvester, RemoteResourceError, ReadError, RemoteSchemaError
+from ckanext.harvest.model import HarvestObject
+from ckanext.schemingdcat.harvesters.base import SchemingDCATHarvester, ReadError, RemoteSchemaError
 from ckanext.schemingdcat.interfaces import ISchemingDCATHarvester
 from ckanext.schemingdcat.lib.field_mapping import FieldMappingValidator
 
@@ -63,7 +69,12 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
     _storage_type = None
     _auth = False
     _credentials = None
-    _names_taken = []
+    _workbook_spool_max_size = 32 * 1024 * 1024
+    _workbook_download_timeout = 60
+    _validators_extra_key = 'schemingdcat_remote_validators'
+    _read_engines = ('openpyxl', 'calamine', 'streaming')
+    _read_chunk_size = 5000
+    _list_fields_excluded = tuple(XLS_HARVESTER_FIELDS_NOT_LIST)
 
     def _set_config_credentials(self, storage_type, config_obj):
         """
@@ -199,45 +210,212 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
         df.columns = col_names
         return df
    
-    def _read_remote_sheet(self, url, sheet_name, storage_type, engine='openpyxl', harvest_job=None):
+    def _get_stored_validators(self, harvest_job):
         """
-        Reads an Excel sheet from a given URL and returns the data as a pandas DataFrame.
+        Retrieves the validators of the remote file stored by the last error-free harvest job.
+
+        The validators are stored in the gather stage, so they are only trusted if the job that
+        stored them is the last error-free job of the source, i.e. its datasets were imported
+        without errors. Otherwise the remote file is read again.
 
         Args:
-            url (str): The URL of the Excel file.
-            sheet_name (str): The name of the sheet to read.
+            harvest_job (HarvestJob): The harvest job object.
+
+        Returns:
+            dict: The stored validators (`etag`, `last_modified`, `content_length`, `sha256`). None if
+                there are no validators, the config has changed, the job that stored them did not
+                finish without errors or `force_all` is set.
+        """
+        if (self.config or {}).get('force_all', False) is True:
+            return None
+
+        validators = self._get_source_state(harvest_job.source.id, self._validators_extra_key)
+        if not validators or validators.get('config') != self._get_config_hash():
+            return None
+
+        last_error_free_job = self.last_error_free_job(harvest_job)
+        log.debug('Last error-free job: %r', last_error_free_job)
+        if not last_error_free_job or validators.get('job') != last_error_free_job.id:
+            return None
+
+        return validators
+
+    def _store_validators(self, harvest_job, validators):
+        """
+        Stores the validators of the remote file in the harvest source, to be used by the
+        conditional request of the next gather stage if this job finishes without errors.
+
+        Args:
+            harvest_job (HarvestJob): The harvest job object.
+            validators (dict): The validators of the remote file.
+        """
+        self._set_source_state(
+            harvest_job.source.id, self._validators_extra_key,
+            dict(validators, config=self._get_config_hash(), job=harvest_job.id))
+
+    @staticmethod
+    def _validators_match(stored, current):
+        """
+        Checks whether the validators of the remote file match the stored ones.
+
+        The strongest validator available in both dicts is used: `etag`, then `sha256`,
+        then `last_modified` together with `content_length`.
+
+        Args:
+            stored (dict): The validators stored after the last successful gather stage.
+            current (dict): The validators of the remote file.
+
+        Returns:
+            bool: True if the remote file has not changed.
+        """
+        if not stored or not current:
+            return False
+        for key in ('etag', 'sha256'):
+            if stored.get(key) and current.get(key):
+                return stored[key] == current[key]
+        if stored.get('last_modified') and current.get('last_modified'):
+            return (stored['last_modified'] == current['last_modified']
+                    and stored.get('content_length') == current.get('content_length'))
+        return False
+
+    def _download_workbook(self, url, harvest_job, auth=False, validators=None):
+        """
+        Downloads the remote workbook once into a local spooled buffer.
+
+        This also checks that the URL is valid and accessible, so the workbook is not
+        requested twice. Local files are opened directly.
+
+        If the validators of the last successful fetch are provided, the request is
+        conditional (`If-None-Match`/`If-Modified-Since`) and the body is not read when
+        the server answers 304 or the response headers match the stored validators.
+
+        Args:
+            url (str): The URL (or local path) of the Excel file.
+            harvest_job (HarvestJob): The harvest job object.
+            auth (bool): Whether authentication is expected.
+            validators (dict, optional): The validators stored by the last error-free harvest job.
+
+        Returns:
+            tuple: The workbook content, positioned at the start, and the validators of the
+                remote file (`etag`, `last_modified`, `content_length`, `sha256`). The workbook
+                is None if the remote file has not changed, and both are None if the workbook
+                could not be downloaded (a gather error is saved).
+        """
+        if not url.lower().startswith('http'):
+            # Check local file
+            if not os.path.exists(url):
+                self._save_gather_error('Could not get content for this url', harvest_job)
+                return None, None
+
+            sha256 = hashlib.sha256()
+            with open(url, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha256.update(chunk)
+            current = {'content_length': str(os.path.getsize(url)), 'sha256': sha256.hexdigest()}
+            if self._validators_match(validators, current):
+                return None, current
+            return open(url, 'rb'), current
+
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        buffer = tempfile.SpooledTemporaryFile(max_size=self._workbook_spool_max_size)
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=self._workbook_download_timeout) as response:
+                if response.status_code == 304:
+                    buffer.close()
+                    return None, validators
+
+                response.raise_for_status()
+                current = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'content_length': response.headers.get('Content-Length'),
+                }
+                if self._validators_match(validators, current):
+                    buffer.close()
+                    return None, dict(validators, **{k: v for k, v in current.items() if v})
+
+                sha256 = hashlib.sha256()
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    sha256.update(chunk)
+                    buffer.write(chunk)
+
+        except requests.exceptions.HTTPError as e:
+            buffer.close()
+            if auth and e.response is not None and e.response.status_code == 401:
+                msg = f"Authorisation required, remember 'config.credentials' needed for: {url}"
+            else:
+                msg = f'Could not get content from {url}. {e}'
+            self._save_gather_error(msg, harvest_job)
+            return None, None
+
+        except requests.exceptions.RequestException as e:
+            buffer.close()
+            msg = f'Could not get content from {url} because a connection error occurred. {e}'
+            self._save_gather_error(msg, harvest_job)
+            return None, None
+
+        current['sha256'] = sha256.hexdigest()
+        if not current['content_length']:
+            current['content_length'] = str(buffer.tell())
+        # Servers without validators: the content did not change since the last fetch
+        if self._validators_match(validators, current):
+            buffer.close()
+            return None, current
+
+        log.debug('Workbook downloaded from %s (%s bytes)', url, buffer.tell())
+        buffer.seek(0)
+        return buffer, current
+
+    def _read_remote_sheets(self, source, sheet_names, storage_type, engine='openpyxl', harvest_job=None):
+        """
+        Reads several sheets of an Excel workbook in a single pass and returns them as pandas DataFrames.
+
+        Args:
+            source (str or file-like object): The workbook already downloaded (see `_download_workbook`), or its URL.
+            sheet_names (list): The names of the sheets to read.
             storage_type (str): The type of storage where the Excel file is located. Supported types are 'onedrive', 'gspread', and 'gdrive'.
             engine (str, optional): The engine to use for reading the Excel file. Defaults to 'openpyxl'.
+            harvest_job (HarvestJob, optional): The harvest job object.
 
         Returns:
-            pandas.DataFrame: The data from the specified sheet as a DataFrame.
+            dict: The data of each sheet as a DataFrame, by sheet name.
 
         Raises:
-            ReadError: If there is an error reading the sheet.
+            ReadError: If there is an error reading the sheets.
 
         """
+        sheet_names = [sheet_name for sheet_name in sheet_names if sheet_name]
         try:
             if storage_type == 'onedrive':
-                if self.auth and self._credentials:
+                if self._auth and self._credentials:
                     # TODO: Implement the read_excel_sheet method for Onedrive Auth
-                    pass
-                else:
-                    try:
-                        data = pd.read_excel(url, sheet_name=sheet_name, dtype=str, engine=engine)
-                    except pd.errors.ParserError as e:
-                        error_msg = f'Error reading sheet {sheet_name} using URL {url}. Error: {str(e)}'
-                        self._save_gather_error(error_msg, harvest_job)
-                        raise ReadError(error_msg)
+                    error_msg = 'Onedrive authentication is not supported yet, remove the credentials of the harvest source.'
+                    self._save_gather_error(error_msg, harvest_job)
+                    raise ReadError(error_msg)
+                try:
+                    data = pd.read_excel(source, sheet_name=sheet_names, dtype=str, engine=engine)
+                except pd.errors.ParserError as e:
+                    error_msg = f'Error reading sheets {sheet_names}. Error: {str(e)}'
+                    self._save_gather_error(error_msg, harvest_job)
+                    raise ReadError(error_msg)
 
             elif storage_type in ['gspread', 'gdrive']:
                 if self._auth and self._credentials:
                     try:
                         gc = gspread.service_account_from_dict(self._credentials)
-                        sh = gc.open_by_url(url)
-                        worksheet = sh.worksheet(sheet_name)
-                        data = pd.DataFrame(worksheet.get_all_records(), dtype=str)
+                        sh = gc.open_by_url(source)
+                        data = {
+                            sheet_name: pd.DataFrame(sh.worksheet(sheet_name).get_all_records(), dtype=str)
+                            for sheet_name in sheet_names
+                        }
                     except gspread.exceptions.APIError as e:
-                        msg_error = f'Error reading sheet {sheet_name} using URL {url}. Error: {str(e)}. If the file is an XLS file, it needs to be converted to a Google Sheet.'
+                        msg_error = f'Error reading sheets {sheet_names} using URL {source}. Error: {str(e)}. If the file is an XLS file, it needs to be converted to a Google Sheet.'
                         self._save_gather_error(msg_error, harvest_job)
                         raise ReadError(msg_error)
                 else:
@@ -250,10 +428,167 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
                 self._save_gather_error(msg_error, harvest_job)
                 raise ValueError(msg_error)
 
-            return data.fillna('')
+            return {sheet_name: df.fillna('') for sheet_name, df in data.items()}
 
         except Exception as e:
-            raise ReadError(f'Error reading sheet {sheet_name} using URL {url}. Error: {str(e)}')
+            raise ReadError(f'Error reading sheets {sheet_names}. Error: {str(e)}')
+
+    def _read_remote_sheet(self, url, sheet_name, storage_type, engine='openpyxl', harvest_job=None):
+        """
+        Reads an Excel sheet from a given URL and returns the data as a pandas DataFrame.
+
+        Args:
+            url (str or file-like object): The URL of the Excel file, or the downloaded workbook.
+            sheet_name (str): The name of the sheet to read.
+            storage_type (str): The type of storage where the Excel file is located. Supported types are 'onedrive', 'gspread', and 'gdrive'.
+            engine (str, optional): The engine to use for reading the Excel file. Defaults to 'openpyxl'.
+
+        Returns:
+            pandas.DataFrame: The data from the specified sheet as a DataFrame.
+
+        Raises:
+            ReadError: If there is an error reading the sheet.
+
+        """
+        return self._read_remote_sheets(url, [sheet_name], storage_type, engine, harvest_job)[sheet_name]
+
+    def _get_read_engine(self):
+        """
+        Returns the engine used to read the Excel workbook, from the `read_engine` config option.
+
+        Supported engines are `openpyxl` (default), `calamine` (native reader, needs the
+        `python-calamine` package) and `streaming` (openpyxl read-only mode, reads the datasets
+        sheet in chunks of `read_chunk_size` rows). Engines that cannot be used fall back to `openpyxl`.
+
+        Returns:
+            str: The read engine.
+        """
+        engine = (self.config or {}).get('read_engine', 'openpyxl')
+        if engine == 'calamine' and importlib.util.find_spec('python_calamine') is None:
+            log.warning('The "calamine" read engine needs the python-calamine package. Using "openpyxl".')
+            return 'openpyxl'
+        if engine == 'streaming' and self._storage_type != 'onedrive':
+            log.warning('The "streaming" read engine is only available for Excel files. Using "openpyxl".')
+            return 'openpyxl'
+        return engine
+
+    def _get_read_chunk_size(self):
+        """
+        Returns the number of rows per chunk read by the `streaming` engine.
+
+        Returns:
+            int: The chunk size.
+        """
+        try:
+            chunk_size = int((self.config or {}).get('read_chunk_size', self._read_chunk_size))
+        except (TypeError, ValueError):
+            chunk_size = self._read_chunk_size
+        return max(chunk_size, 1)
+
+    @staticmethod
+    def _cell_to_str(value):
+        """
+        Converts an Excel cell value to a string, like `pd.read_excel(dtype=str)` does.
+
+        Args:
+            value: The cell value.
+
+        Returns:
+            str: The cell value as a string, an empty string for empty cells.
+        """
+        if value is None:
+            return ''
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return str(value)
+
+    def _iter_sheet_chunks(self, workbook, sheet_name, chunk_size):
+        """
+        Reads the rows of a sheet in openpyxl read-only mode and yields them as DataFrames.
+
+        Args:
+            workbook (openpyxl.Workbook): The workbook opened in read-only mode.
+            sheet_name (str): The name of the sheet to read.
+            chunk_size (int): The maximum number of rows per DataFrame.
+
+        Yields:
+            pandas.DataFrame: A chunk of the sheet rows, with string values. An empty DataFrame
+                with the sheet columns is yielded if the sheet has no rows.
+        """
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        positions = [i for i, value in enumerate(header) if value is not None]
+        columns = [self._cell_to_str(header[i]) for i in positions]
+
+        chunk = []
+        yielded = False
+        for row in rows:
+            values = [self._cell_to_str(row[i]) if i < len(row) else '' for i in positions]
+            # Skip empty rows, as read_excel does
+            if not any(values):
+                continue
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=columns, dtype=str)
+                yielded = True
+                chunk = []
+
+        if chunk or not yielded:
+            yield pd.DataFrame(chunk, columns=columns, dtype=str)
+
+    def _iter_content_dicts(self, workbook, dataset_sheetname, distribution_sheetname, datadictionary_sheetname, harvest_job):
+        """
+        Reads the sheets of the remote file and yields its content as dicts of DataFrames
+        (datasets, distributions and datadictionaries).
+
+        With the `streaming` read engine the datasets sheet is yielded in chunks of rows, each
+        one with the whole distributions and datadictionaries sheets. Otherwise all the sheets
+        are read in a single pass and only one dict is yielded.
+
+        Args:
+            workbook (str or file-like object): The downloaded workbook, or its URL.
+            dataset_sheetname (str): The name of the datasets sheet.
+            distribution_sheetname (str): The name of the distributions sheet.
+            datadictionary_sheetname (str): The name of the datadictionaries sheet.
+            harvest_job (HarvestJob): The harvest job object.
+
+        Yields:
+            dict: The content of the remote file.
+        """
+        engine = self._get_read_engine()
+        try:
+            if engine != 'streaming':
+                sheets = self._read_remote_sheets(workbook, [dataset_sheetname, distribution_sheetname, datadictionary_sheetname], self._storage_type, engine=engine, harvest_job=harvest_job)
+                content_dicts = {'datasets': sheets[dataset_sheetname]}
+                if distribution_sheetname:
+                    content_dicts['distributions'] = sheets[distribution_sheetname]
+                #TODO: Implement self._load_datadictionaries() method.
+                if datadictionary_sheetname:
+                    content_dicts['datadictionaries'] = sheets[datadictionary_sheetname]
+                yield content_dicts
+                return
+
+            chunk_size = self._get_read_chunk_size()
+            try:
+                read_only_workbook = openpyxl.load_workbook(workbook, read_only=True, data_only=True)
+            except Exception as e:
+                raise ReadError(f'Error reading the workbook. Error: {str(e)}')
+
+            try:
+                related_content = {}
+                for key, sheet_name in (('distributions', distribution_sheetname), ('datadictionaries', datadictionary_sheetname)):
+                    if sheet_name:
+                        related_content[key] = pd.concat(self._iter_sheet_chunks(read_only_workbook, sheet_name, chunk_size), ignore_index=True)
+
+                for chunk in self._iter_sheet_chunks(read_only_workbook, dataset_sheetname, chunk_size):
+                    log.debug('Read a chunk of %s rows from the "%s" sheet', len(chunk), dataset_sheetname)
+                    yield {'datasets': chunk, **related_content}
+            finally:
+                read_only_workbook.close()
+
+        finally:
+            if hasattr(workbook, 'close'):
+                workbook.close()
 
     def _clean_table_datasets(self, data):
         """
@@ -272,6 +607,9 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
         data = data.apply(lambda x: x.str.strip() if x.dtype == 'object' else x)
         data = data.fillna(value='')
 
+        # Convert the comma-separated values of the list fields into lists
+        data = self._split_list_columns(data)
+
         # Convert table to list of dicts
         return data.to_dict('records')
 
@@ -346,45 +684,7 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
             log.debug('No datadictionaries loaded. Check "datadictionary.%s" fields', distribution_id_colname)
             return None
 
-    def _add_distributions_and_datadictionaries_to_datasets(self, table_datasets, table_distributions_grouped, table_datadictionaries_grouped, identifier_field='identifier', alternate_identifier_field='alternate_identifier', inspire_id_field='inspire_id', datadictionary_id_field="id"):
-        """
-        Add distributions (CKAN resources) and datadictionaries to each dataset object.
-    
-        Args:
-            table_datasets (list): List of dataset objects.
-            table_distributions_grouped (dict): Dictionary of distributions grouped by dataset identifier.
-            table_datadictionaries_grouped (dict): Dictionary of datadictionaries grouped by dataset identifier.
-            identifier_field (str, optional): Field name for the identifier. Defaults to 'identifier'.
-            alternate_identifier_field (str, optional): Field name for the alternate identifier. Defaults to 'alternate_identifier'.
-            inspire_id_field (str, optional): Field name for the inspire id. Defaults to 'inspire_id'.
-            datadictionary_id_field (str, optional): Field name for the datadictionary id. Defaults to 'id'.
-    
-        Returns:
-            list: List of dataset objects with distributions (CKAN resources) and datadictionaries added.
-    
-        Notes:
-            If 'dataset_id_field' is specified in the Harvester configuration, it will be used as the primary identifier field.
-            Otherwise, the function will fall back to using 'identifier_field', 'alternate_identifier_field', and 'inspire_id_field' in that order.
-        """
-        try:
-            dataset_id_field = self.config.get('dataset_id_field', None)
-            return [
-                {
-                    **d,
-                    'resources': [
-                        {**dr, 'datadictionaries': table_datadictionaries_grouped.get(dr[datadictionary_id_field], []) if table_datadictionaries_grouped else []}
-                        for dr in table_distributions_grouped.get(
-                            d.get(dataset_id_field) if dataset_id_field else d.get(identifier_field) or d.get(alternate_identifier_field) or d.get(inspire_id_field), []
-                        )
-                    ]
-                }
-                for d in table_datasets
-            ]
-        except Exception as e:
-            log.error("Error while adding distributions and datadictionaries to datasets: %s", str(e))
-            raise
-
-    def _process_content(self, content_dicts, source_url, distribution_prefix_colnames, dataset_id_colname, datadictionary_prefix_colnames, distribution_id_colname):
+    def _process_content(self, content_dicts, source_url, distribution_prefix_colnames, dataset_id_colname, datadictionary_prefix_colnames, distribution_id_colname, grouped_content=None):
         """
         Process the content of the harvested dataset.
 
@@ -395,26 +695,37 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
             dataset_id_colname (str): The column name representing the dataset ID.
             datadictionary_prefix_colnames (str): The prefix used in column names that need to be removed in the datadictionaries dataframe.
             distribution_id_colname (str): The column name representing the resource ID.
+            grouped_content (dict, optional): A cache of the cleaned distributions and datadictionaries, used when
+                the datasets are processed in chunks, so they are only cleaned and grouped once. If it has
+                `matched_ids`, the orphan rows are left to be reported by the caller.
 
         Returns:
             dict: A dictionary containing the processed content of the harvested dataset.
         """
         log.debug('In SchemingDCATXLSHarvester process_content: %s', source_url)
+        if grouped_content is None:
+            grouped_content = {}
 
         table_datasets = self._clean_table_datasets(content_dicts['datasets'])
 
-        if content_dicts.get('distributions') is not None and not content_dicts['distributions'].empty:
+        if 'distributions' in grouped_content:
+            table_distributions_grouped = grouped_content['distributions']
+        elif content_dicts.get('distributions') is not None and not content_dicts['distributions'].empty:
             table_distributions_grouped = self._clean_table_distributions(content_dicts['distributions'], distribution_prefix_colnames, dataset_id_colname)
         else:
             log.debug('No distributions loaded. Check "distribution.%s" fields', dataset_id_colname)
             table_distributions_grouped = None
+        grouped_content['distributions'] = table_distributions_grouped
 
-        if content_dicts.get('datadictionaries') is not None and not content_dicts['datadictionaries'].empty:
+        if 'datadictionaries' in grouped_content:
+            table_datadictionaries_grouped = grouped_content['datadictionaries']
+        elif content_dicts.get('datadictionaries') is not None and not content_dicts['datadictionaries'].empty:
             table_datadictionaries_grouped = self._clean_table_datadictionaries(content_dicts['datadictionaries'], datadictionary_prefix_colnames, distribution_id_colname)
         else:
             table_datadictionaries_grouped = None
+        grouped_content['datadictionaries'] = table_datadictionaries_grouped
 
-        return self._add_distributions_and_datadictionaries_to_datasets(table_datasets, table_distributions_grouped, table_datadictionaries_grouped)
+        return self._add_distributions_and_datadictionaries_to_datasets(table_datasets, table_distributions_grouped, table_datadictionaries_grouped, matched_ids=grouped_content.get('matched_ids'))
 
     def get_package_dict(self, harvest_object, context, package_dict=None):
         """
@@ -454,57 +765,6 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
         # Check if the value is a string containing commas but not common sentence punctuation
         return isinstance(value, str) and ',' in value and not any(char in value for char in '.!?')
 
-    @staticmethod
-    def _set_string_to_list(value):
-        """
-        Converts a comma-separated string into a list of items.
-
-        Args:
-            value (str): The comma-separated string to convert.
-
-        Returns:
-            list: A list of items, with leading and trailing whitespace removed from each item,
-                  and leading dashes from each item.
-
-        Example:
-            >>> _set_string_to_list('apple, banana, -orange')
-            ['apple', 'banana', 'orange']
-        """
-        return [x.strip(" -") for x in value.split(',') if x.strip()]
-
-    def _update_dict_lists(self, data):
-        """
-        Update the dictionary lists in the given data.
-
-        Args:
-            data (list): The data to be updated.
-
-        Returns:
-            list: The updated data.
-        """
-        if self._local_schema is None:
-            self._local_schema = self._get_local_schema()
-        
-        # Get the list of fields that should be converted to lists
-        list_fields = ['groups'] + [
-            field['field_name']
-            for field in self._local_schema['dataset_fields']
-            if any(keyword in field.get(field_type, '').lower() for keyword in ['list', 'multiple', 'tag_string', 'tag', 'group'] for field_type in ['validators', 'output_validators', 'preset']) or 'groups' in field['field_name'].lower()
-        ]
-    
-        for element in data:
-            for key, value in element.items():
-                if key in list_fields and key not in XLS_HARVESTER_FIELDS_NOT_LIST and isinstance(value, str):
-                    element[key] = self._set_string_to_list(value)
-                elif key == 'distributions':
-                    for distribution in value:
-                        for key_dist, value_dist in distribution.items():
-                            if key_dist in list_fields and key_dist not in XLS_HARVESTER_FIELDS_NOT_LIST and isinstance(value_dist, str):
-                                distribution[key_dist] = self._set_string_to_list(value_dist)
-    
-        # Return the updated data
-        return data
-
     def validate_config(self, config):
         """
         Validates the configuration for the harvester.
@@ -587,7 +847,13 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
             config = json.dumps({**config_obj, 'datadictionary_sheet': datadictionary_sheet.strip()})
 
         # Check and retrieve credentials for the storage type
-        if 'credentials' not in config:
+        if storage_type == 'onedrive':
+            # Onedrive workbooks are downloaded from their public share links
+            if 'credentials' in config_obj:
+                raise ValueError('Onedrive authentication is not supported yet, remove the credentials and use a public share link of the workbook.')
+            config_obj['auth'] = False
+            config = json.dumps(config_obj)
+        elif 'credentials' not in config:
             raise ValueError(f'Credentials must exist to access spreadsheets via: {config_obj["storage_type"]}.')
         else:
             credentials = self._set_config_credentials(storage_type, config_obj)
@@ -695,6 +961,15 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
             if not isinstance(dataset_id_field, str):
                 raise ValueError('dataset_id_field must be a string')
 
+        # Check the engine used to read the remote file
+        if 'read_engine' in config_obj and config_obj['read_engine'] not in self._read_engines:
+            raise ValueError(f'read_engine should be one of: {", ".join(self._read_engines)}')
+
+        if 'read_chunk_size' in config_obj:
+            read_chunk_size = config_obj['read_chunk_size']
+            if not isinstance(read_chunk_size, int) or isinstance(read_chunk_size, bool) or read_chunk_size < 1:
+                raise ValueError('read_chunk_size must be a positive integer')
+
         return config
 
     def modify_package_dict(self, package_dict, harvest_object):
@@ -721,7 +996,6 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
         log.debug('In SchemingDCATXLSHarvester gather_stage with harvest source: %s and remote sheet: %s', harvest_source_title, source_url)
         
         content_dicts = {}
-        self._names_taken = []
         
         # Get config options
         if harvest_job.source.config:
@@ -743,10 +1017,31 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
             remote_xls_base_url = self._get_storage_base_url(source_url, self._storage_type)
             remote_sheet_download_url = self._get_storage_url(source_url, self._storage_type)
         
-        # Check if the remote file is valid
-        is_valid = self._check_accesible_url(remote_sheet_download_url, harvest_job, self._auth)
+        # before_download interface
+        for harvester in p.PluginImplementations(ISchemingDCATHarvester):
+            if hasattr(harvester, 'before_download'):
+                remote_sheet_download_url, before_download_errors = harvester.before_download(remote_sheet_download_url, harvest_job)
+                
+                for error_msg in before_download_errors:
+                    self._save_gather_error(error_msg, harvest_job)
+                
+                if not remote_sheet_download_url:
+                    return []
+
+        # Download the remote workbook once, this also checks that the remote file is accessible
+        validators = None
+        if self._storage_type == 'onedrive':
+            stored_validators = self._get_stored_validators(harvest_job)
+            workbook, validators = self._download_workbook(remote_sheet_download_url, harvest_job, self._auth, stored_validators)
+            if workbook is None and validators is not None:
+                log.info('The remote file of the harvest source: "%s" has not changed since the last harvest. Nothing to do.', harvest_source_title)
+                # This job has nothing to import, so it becomes the last error-free job of the source
+                self._store_validators(harvest_job, validators)
+                return []
+        else:
+            workbook = remote_sheet_download_url if self._check_accesible_url(remote_sheet_download_url, harvest_job, self._auth) else None
         
-        if not is_valid:
+        if workbook is None:
             log.error(f'The URL is not accessible. The harvest source: "{harvest_source_title}" has finished.')
             return []
         
@@ -766,33 +1061,25 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
         guids_in_db = set(guid_to_package_id.keys())
         guids_in_harvest = set()
 
-        # before_download interface
-        for harvester in p.PluginImplementations(ISchemingDCATHarvester):
-            if hasattr(harvester, 'before_download'):
-                remote_sheet_download_url, before_download_errors = harvester.before_download(remote_sheet_download_url, harvest_job)
-                
-                for error_msg in before_download_errors:
-                    self._save_gather_error(error_msg, harvest_job)
-                
-                if not remote_sheet_download_url:
-                    return []
-        
-        # Read sheets
-        if is_valid:
-            try:
-                try:
-                    content_dicts['datasets'] = self._read_remote_sheet(remote_sheet_download_url, dataset_sheetname, self._storage_type )
-                except RemoteResourceError as e:
-                    self._save_gather_error('Error reading the remote Excel datasets sheet: {0}'.format(e), harvest_job)
-                    return False
-                
-                if distribution_sheetname:
-                    content_dicts['distributions'] = self._read_remote_sheet(remote_sheet_download_url, distribution_sheetname, self._storage_type, harvest_job)
-                    
-                #TODO: Implement self._load_datadictionaries() method.
-                if datadictionary_sheetname:
-                    content_dicts['datadictionaries'] = self._read_remote_sheet(remote_sheet_download_url, datadictionary_sheetname, self._storage_type, harvest_job)
+        # Content hashes are retrieved once for all the chunks
+        force_all = self.config.get('force_all', False) is True
+        current_hashes = self._get_current_content_hashes(harvest_job.source.id) if guids_in_db and not force_all else {}
 
+        source_dataset = model.Package.get(harvest_job.source.id)
+        self._init_name_allocator([])
+
+        ids = []
+        identifier_counts = {}  # To track the frequency of identifiers
+        skipped_datasets = 0  # Counter for omitted datasets
+        datasets_read = 0
+
+        # Read the sheets and clean their content. With the streaming engine the datasets sheet is
+        # processed in chunks of rows and the harvest objects of each chunk are saved before reading
+        # the next one, so memory is bounded by the chunk size (plus the distributions sheets)
+        grouped_content = {'matched_ids': {'distributions': set(), 'datadictionaries': set()}}
+        field_mapping_plans = None
+        try:
+            for chunk_number, content_dicts in enumerate(self._iter_content_dicts(workbook, dataset_sheetname, distribution_sheetname, datadictionary_sheetname, harvest_job), start=1):
                 # after_download interface
                 for harvester in p.PluginImplementations(ISchemingDCATHarvester):
                     if hasattr(harvester, 'after_download'):
@@ -802,192 +1089,181 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
                             self._save_gather_error(error_msg, harvest_job)
 
                 if not content_dicts:
-                    return []
-
-            except Exception as e:
-                self._save_gather_error('Could not read remote sheet file: %s' % str(e), harvest_job)
-                return False
-        
-        # Check if the content_dicts colnames correspond to the local schema
-        try:
-            # Standardizes the field_mapping           
-            field_mappings = {
-              'dataset_field_mapping': self._standardize_field_mapping(self.config.get("dataset_field_mapping")),
-              'distribution_field_mapping': self._standardize_field_mapping(self.config.get("distribution_field_mapping")),
-              'datadictionary_field_mapping': None
-            }
-
-            # Standardizes the field names
-            content_dicts['datasets'], field_mappings['dataset_field_mapping'] = self._standardize_df_fields_from_field_mapping(content_dicts['datasets'], field_mappings['dataset_field_mapping'])
-            content_dicts['distributions'], field_mappings['distribution_field_mapping'] = self._standardize_df_fields_from_field_mapping(content_dicts['distributions'], field_mappings['distribution_field_mapping'])
-            
-            # Validate field names
-            remote_dataset_field_names = set(content_dicts['datasets'].columns)
-            remote_resource_field_names = set(content_dicts['distributions'].columns)
-
-            self._validate_remote_schema(remote_dataset_field_names=remote_dataset_field_names, remote_ckan_base_url=None, remote_resource_field_names=remote_resource_field_names, remote_dataset_field_mapping=field_mappings['dataset_field_mapping'], remote_distribution_field_mapping=field_mappings['distribution_field_mapping'])
+                    return [id_dict['id'] for id_dict in ids]
 
-        except RemoteSchemaError as e:
-            self._save_gather_error('Error validating remote schema: {0}'.format(e), harvest_job)
-            return []
+                datasets_read += len(content_dicts['datasets'])
 
-        # before_cleaning interface
-        for harvester in p.PluginImplementations(ISchemingDCATHarvester):
-            if hasattr(harvester, 'before_cleaning'):
-                content_dicts, before_cleaning_errors = harvester.before_cleaning(content_dicts, harvest_job, self.config)
+                # Check if the content_dicts colnames correspond to the local schema (only once). The
+                # standardization of the field_mapping is computed once and applied to every chunk
+                if field_mapping_plans is None:
+                    try:
+                        # Standardizes the field_mapping
+                        field_mapping_plans = {
+                          'datasets': self._get_field_mapping_plan(self._standardize_field_mapping(self.config.get("dataset_field_mapping"))),
+                          'distributions': self._get_field_mapping_plan(self._standardize_field_mapping(self.config.get("distribution_field_mapping"))),
+                        }
+
+                        # Standardizes the field names
+                        content_dicts['datasets'] = self._apply_field_mapping_plan(content_dicts['datasets'], field_mapping_plans['datasets'])
+                        content_dicts['distributions'] = self._apply_field_mapping_plan(content_dicts['distributions'], field_mapping_plans['distributions'])
+                        grouped_content['standardized_distributions'] = content_dicts['distributions']
+
+                        # Validate field names
+                        remote_dataset_field_names = set(content_dicts['datasets'].columns)
+                        remote_resource_field_names = set(content_dicts['distributions'].columns)
+
+                        self._validate_remote_schema(remote_dataset_field_names=remote_dataset_field_names, remote_ckan_base_url=None, remote_resource_field_names=remote_resource_field_names, remote_dataset_field_mapping=field_mapping_plans['datasets']['field_mapping'], remote_distribution_field_mapping=field_mapping_plans['distributions']['field_mapping'])
+
+                    except RemoteSchemaError as e:
+                        self._save_gather_error('Error validating remote schema: {0}'.format(e), harvest_job)
+                        return []
+                else:
+                    # Next chunks of the datasets sheet, the distributions are already standardized
+                    content_dicts['datasets'] = self._apply_field_mapping_plan(content_dicts['datasets'], field_mapping_plans['datasets'])
+                    content_dicts['distributions'] = grouped_content['standardized_distributions']
 
-                for error_msg in before_cleaning_errors:
-                    self._save_gather_error(error_msg, harvest_job)
+                # before_cleaning interface
+                for harvester in p.PluginImplementations(ISchemingDCATHarvester):
+                    if hasattr(harvester, 'before_cleaning'):
+                        content_dicts, before_cleaning_errors = harvester.before_cleaning(content_dicts, harvest_job, self.config)
 
-        # Clean tables
-        try:
-            clean_datasets = self._process_content(content_dicts, remote_xls_base_url, self.config.get("distribution_prefix_colnames"), self.config.get("dataset_id_colname"), self.config.get("datadictionary_prefix_colnames"), self.config.get("distribution_id_colname"))
-            log.debug('"%s" remote file cleaned successfully.', self._storage_types_supported[self._storage_type]['title'])
-            clean_datasets = self._update_dict_lists(clean_datasets)
-            #log.debug('clean_datasets: %s', clean_datasets)
-            log.debug('Update dict string lists. Number of datasets imported: %s', len(clean_datasets))
-            
-        except Exception as e:
-            self._save_gather_error('Error cleaning the remote table: {0}'.format(e), harvest_job)
-            return []
-    
-        # after_cleaning interface
-        for harvester in p.PluginImplementations(ISchemingDCATHarvester):
-            if hasattr(harvester, 'after_cleaning'):
-                clean_datasets, after_cleaning_errors = harvester.after_cleaning(clean_datasets)
+                        for error_msg in before_cleaning_errors:
+                            self._save_gather_error(error_msg, harvest_job)
 
-                for error_msg in after_cleaning_errors:
-                    self._save_gather_error(error_msg, harvest_job)
+                # Clean tables
+                try:
+                    clean_datasets = self._process_content(content_dicts, remote_xls_base_url, self.config.get("distribution_prefix_colnames"), self.config.get("dataset_id_colname"), self.config.get("datadictionary_prefix_colnames"), self.config.get("distribution_id_colname"), grouped_content)
+                    del content_dicts
 
-        # Log the length of clean_datasets after after_cleaning
-        log.debug(f"Length of clean_datasets after_cleaning ISQLHarvester: {len(clean_datasets)}")
+                except Exception as e:
+                    self._save_gather_error('Error cleaning the remote table: {0}'.format(e), harvest_job)
+                    return [id_dict['id'] for id_dict in ids]
 
-        # Add datasets to the database
-        try:
-            log.debug('Adding datasets to DB')
-            datasets_to_harvest = {}
-            source_dataset = model.Package.get(harvest_job.source.id)
-            skipped_datasets = 0  # Counter for omitted datasets
-            identifier_counts = {}  # To track the frequency of identifiers
+                # after_cleaning interface
+                for harvester in p.PluginImplementations(ISchemingDCATHarvester):
+                    if hasattr(harvester, 'after_cleaning'):
+                        clean_datasets, after_cleaning_errors = harvester.after_cleaning(clean_datasets)
 
-            for dataset in clean_datasets:
-                #log.debug('dataset: %s', dataset)
+                        for error_msg in after_cleaning_errors:
+                            self._save_gather_error(error_msg, harvest_job)
 
-                # Set and update translated fields
-                dataset = self._set_translated_fields(dataset)
-                
+                # Add datasets to the database
                 try:
-                    if not dataset.get('name'):
-                        dataset['name'] = self._gen_new_name(dataset['title'])
-                    while dataset['name'] in self._names_taken:
-                        suffix = sum(name.startswith(dataset['name'] + '-') for name in self._names_taken) + 1
-                        dataset['name'] = '{}-{}'.format(dataset['name'], suffix)
-                    self._names_taken.append(dataset['name'])
-        
-                    # If the dataset has no identifier, use an UUID
-                    if not dataset.get('identifier'):
-                        dataset['identifier'] = str(uuid.uuid4())
-        
+                    datasets_to_harvest, skipped = self._prepare_xls_datasets(clean_datasets, harvest_job, source_dataset, guids_in_harvest, identifier_counts)
                 except Exception as e:
-                    skipped_datasets += 1
-                    self._save_gather_error('Error for the dataset identifier %s [%r]' % (dataset.get('identifier'), e), harvest_job)
-                    continue
-                
-                if not dataset.get('identifier'):
-                    skipped_datasets += 1
-                    self._save_gather_error('Missing identifier for dataset with title: %s' % dataset.get('title'), harvest_job)
-                    continue
-                
-                # Check if a dataset with the same identifier exists can be overridden if necessary
-                #existing_dataset = self._check_existing_package_by_ids(dataset)
-                #log.debug('existing_dataset: %s', existing_dataset)
-                            
-                # Unless already set by the dateutil.parser.parser, get the owner organization (if any)
-                # from the harvest source dataset
-                if not dataset.get('owner_org') and source_dataset.owner_org:
-                    dataset['owner_org'] = source_dataset.owner_org
-        
-                if 'extras' not in dataset:
-                    dataset['extras'] = []
+                    self._save_gather_error('Error when processing dataset: %r / %s' % (e, traceback.format_exc()), harvest_job)
+                    return [id_dict['id'] for id_dict in ids]
+                del clean_datasets
+                skipped_datasets += skipped
 
-                # if existing_dataset:
-                #     dataset['identifier'] = existing_dataset['identifier']
+                new = set(datasets_to_harvest) - guids_in_db
+                change = set(datasets_to_harvest) & guids_in_db
+                guids_in_harvest.update(datasets_to_harvest)
 
-                identifier = dataset['identifier']
-                # Track the frequency of each identifier
-                identifier_counts[identifier] = identifier_counts.get(identifier, 0) + 1
-                if identifier_counts[identifier] > 1:
-                    log.warning(f'Duplicate identifier detected: {identifier}. This dataset will overwrite the previous one.')
+                ids.extend(self._save_harvest_objects(
+                    harvest_job, new, change, set(), datasets_to_harvest, guid_to_package_id, current_hashes))
 
-                #     guids_in_db.add(dataset['identifier'])
+                log.info('XLS gather progress: chunk %s, %s rows read, %s datasets gathered, %s harvest objects saved',
+                         chunk_number, datasets_read, len(guids_in_harvest), len(ids))
 
-                guids_in_harvest.add(identifier)
-                datasets_to_harvest[identifier] = dataset
-        
-            # Register duplicate identifiers
-            duplicates = [id for id, count in identifier_counts.items() if count > 1]
-            if duplicates:
-                log.warning(f"The following duplicate identifiers {len(duplicates)} are found: {duplicates}")
-        
         except Exception as e:
-            self._save_gather_error('Error when processing dataset: %r / %s' % (e, traceback.format_exc()), harvest_job)
-            return []
+            # The harvest objects of the chunks already read are kept, but nothing is deleted
+            # as the remote file has not been read completely
+            self._save_gather_error('Could not read remote sheet file: %s' % str(e), harvest_job)
+            return [id_dict['id'] for id_dict in ids]
+
+        # Report the distributions and datadictionaries that do not match any dataset of the chunks
+        self._report_orphan_rows(grouped_content.get('distributions'), grouped_content.get('datadictionaries'), grouped_content['matched_ids'])
+
+        log.debug('"%s" remote file cleaned successfully.', self._storage_types_supported[self._storage_type]['title'])
+
+        # Register duplicate identifiers
+        duplicates = [id for id, count in identifier_counts.items() if count > 1]
+        if duplicates:
+            log.warning(f"The following duplicate identifiers {len(duplicates)} are found: {duplicates}")
 
-        # Check guids to create/update/delete
-        new = guids_in_harvest - guids_in_db
         # Get objects/datasets to delete (ie in the DB but not in the source)
-        delete = set(guids_in_db) - set(guids_in_harvest)
-        change = guids_in_db & guids_in_harvest
-        
+        delete = guids_in_db - guids_in_harvest
+
         log.debug(f"Number of skipped datasets: {skipped_datasets}")
         log.debug(f'guids_in_harvest ({len(guids_in_harvest)})')
         log.debug(f'guids_in_db ({len(guids_in_db)}): {guids_in_db}')
-        log.debug(f'new ({len(new)})')
+        log.debug(f'new ({len(guids_in_harvest - guids_in_db)})')
         log.debug(f'delete ({len(delete)})')
-        log.debug(f'change ({len(change)})')
-        
-        ids = []
-        for guid in new:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    extras=[HarvestObjectExtra(key='status', value='new')])
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        for guid in change:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    package_id=guid_to_package_id[guid],
-                                    extras=[HarvestObjectExtra(key='status', value='change')])
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        for guid in delete:
-            dataset = datasets_to_harvest.get(guid)
-            if dataset:
-                obj = HarvestObject(guid=guid, job=harvest_job, content=json.dumps(dataset),
-                                    package_id=guid_to_package_id[guid],
-                                    extras=[HarvestObjectExtra(key='status', value='delete')])
-                model.Session.query(HarvestObject).\
-                    filter_by(guid=guid).\
-                    update({'current': False}, False)
-                obj.save()
-                ids.append({'id': obj.id, 'name': dataset['name'], 'identifier': dataset['identifier']})
-            else:
-                log.warning(f'Dataset for GUID {guid} not found in datasets_to_harvest')
-        
-        log.debug('Number of elements in clean_datasets: %s and object_ids: %s', len(clean_datasets), len(ids))
+        log.debug(f'change ({len(guids_in_db & guids_in_harvest)})')
+
+        if delete:
+            ids.extend(self._save_harvest_objects(harvest_job, set(), set(), delete, {}, guid_to_package_id))
+
+        # Remember the remote file validators, so an unchanged file is skipped next time if this job has no errors
+        if validators:
+            self._store_validators(harvest_job, validators)
         
-        # Log clean_datasets/ ids
-        #self._log_export_clean_datasets_and_ids(harvest_source_title, clean_datasets, ids)
+        log.debug('Number of rows read: %s and object_ids: %s', datasets_read, len(ids))
 
         return [id_dict['id'] for id_dict in ids]
+
+    def _prepare_xls_datasets(self, clean_datasets, harvest_job, source_dataset, guids_in_harvest, identifier_counts):
+        """
+        Names the cleaned datasets of a chunk of rows and keys them by identifier.
+
+        Args:
+            clean_datasets (list): The cleaned dataset dicts of the chunk.
+            harvest_job (HarvestJob): The harvest job object.
+            source_dataset (Package): The harvest source dataset.
+            guids_in_harvest (set): The identifiers gathered in the previous chunks. Their harvest
+                objects are already saved, so repeated identifiers are skipped.
+            identifier_counts (dict): The frequency of each identifier, updated in place.
+
+        Returns:
+            tuple: The dataset dicts of the chunk by identifier and the number of skipped datasets.
+        """
+        datasets_to_harvest = {}
+        skipped_datasets = 0
+
+        self._seed_names_for_datasets(clean_datasets)
+        for dataset in clean_datasets:
+            # Set and update translated fields
+            dataset = self._set_translated_fields(dataset)
+
+            try:
+                dataset['name'] = self._allocate_name(dataset.get('name'), dataset.get('title'))
+
+                # If the dataset has no identifier, use an UUID
+                if not dataset.get('identifier'):
+                    dataset['identifier'] = str(uuid.uuid4())
+
+            except Exception as e:
+                skipped_datasets += 1
+                self._save_gather_error('Error for the dataset identifier %s [%r]' % (dataset.get('identifier'), e), harvest_job)
+                continue
+
+            if not dataset.get('identifier'):
+                skipped_datasets += 1
+                self._save_gather_error('Missing identifier for dataset with title: %s' % dataset.get('title'), harvest_job)
+                continue
+
+            # Unless already set by the dateutil.parser.parser, get the owner organization (if any)
+            # from the harvest source dataset
+            if not dataset.get('owner_org') and source_dataset.owner_org:
+                dataset['owner_org'] = source_dataset.owner_org
+
+            if 'extras' not in dataset:
+                dataset['extras'] = []
+
+            identifier = dataset['identifier']
+            # Track the frequency of each identifier
+            identifier_counts[identifier] = identifier_counts.get(identifier, 0) + 1
+            if identifier in guids_in_harvest:
+                skipped_datasets += 1
+                log.warning(f'Duplicate identifier detected: {identifier}. It was gathered in a previous chunk, this dataset is skipped.')
+                continue
+            if identifier_counts[identifier] > 1:
+                log.warning(f'Duplicate identifier detected: {identifier}. This dataset will overwrite the previous one.')
+
+            datasets_to_harvest[identifier] = dataset
+
+        return datasets_to_harvest, skipped_datasets
     
     def fetch_stage(self, harvest_object):
         # Nothing to do here - we got the package dict in the search in the gather stage
@@ -1044,6 +1320,7 @@ class SchemingDCATXLSHarvester(SchemingDCATHarvester):
                     'ignore_auth': True,
                 })
                 p.toolkit.get_action('package_delete')(context, {'id': harvest_object.package_id})
+                self._set_deleted_objects_not_current(harvest_object)
                 log.info('The override_local_datasets configuration is %s. Package %s deleted with GUID: %s' % (override_local_datasets, harvest_object.package_id, harvest_object.guid))
 
                 return True
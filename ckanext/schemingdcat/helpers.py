@@ -8,6 +8,8 @@ from yaml.loader import SafeLoader
 from pathlib import Path
 from functools import lru_cache
 import datetime
+import time
+from threading import Lock
 from urllib.parse import urlparse, unquote, urljoin, urlunparse
 from urllib.error import URLError
 from six.moves.urllib.parse import urlencode
@@ -52,7 +54,9 @@ log = logging.getLogger(__name__)
 all_helpers = {}
 prettify_cache = {}
 DEFAULT_LANG = None
-_open_data_statistics = {}
+_open_data_statistics = None
+_open_data_statistics_expires = 0
+_open_data_statistics_lock = Lock()
 trans = authz.roles_trans()
 
 def translated_capacity(capacity: str) -> str:
@@ -407,39 +411,71 @@ def schemingdcat_get_open_data_statistics(stat_type=None):
     """
     Retrieves Open Data portal statistics including counts of datasets, distributions, groups, organizations, tags, spatial datasets, and endpoints.
 
+    The statistics are cached per process for `ckanext.schemingdcat.open_data_statistics.cache_ttl` seconds,
+    and the cache is invalidated when the statistics table is updated.
+
     Args:
         stat_type (str, optional): The type of statistics to filter by. If None, all statistics are returned.
 
     Returns:
         dict: A dictionary containing the counts of various site elements, with keys as the 'id' and values as dictionaries containing 'value', 'label', 'icon', 'stat_count', and 'stat_type'.
     """
-    global _open_data_statistics
+    statistics = _get_cached_open_data_statistics()
 
-    # Retrieve the statistics list from the action
-    stats_list = logic.get_action("schemingdcat_statistics_list")({}, {})
-    
-    # Convert the list of dictionaries to a summarized dictionary
-    for stat in stats_list:
-        stat_id = stat['id']
-        if stat_id in _open_data_statistics:
-            # Update only the stat_count if the entry already exists in the cache
-            _open_data_statistics[stat_id]['stat_count'] = stat['stat_count']
-        else:
-            # Add new entry to the cache
-            _open_data_statistics[stat_id] = {
+    # Filter the statistics by stat_type if provided
+    if stat_type is not None:
+        filtered_statistics = {k: v for k, v in statistics.items() if v['stat_type'] == stat_type}
+        return filtered_statistics
+
+    return statistics
+
+def _get_cached_open_data_statistics():
+    """
+    Returns the cached Open Data portal statistics, loading them from the statistics table if the cache expired.
+
+    The cached dictionary is never modified once published, a reload replaces it.
+
+    Returns:
+        dict: The statistics by 'id'.
+    """
+    global _open_data_statistics, _open_data_statistics_expires
+
+    with _open_data_statistics_lock:
+        if _open_data_statistics is not None and time.monotonic() < _open_data_statistics_expires:
+            return _open_data_statistics
+
+        # Retrieve the statistics list from the action
+        stats_list = logic.get_action("schemingdcat_statistics_list")({}, {}) or []
+
+        # Convert the list of dictionaries to a summarized dictionary
+        _open_data_statistics = {
+            stat['id']: {
                 'value': stat['value'],
                 'label': stat['label'],
                 'icon': stat['icon'],
                 'stat_count': stat['stat_count'],
                 'stat_type': stat['stat_type']
             }
-    
-    # Filter the statistics by stat_type if provided
-    if stat_type is not None:
-        filtered_statistics = {k: v for k, v in _open_data_statistics.items() if v['stat_type'] == stat_type}
-        return filtered_statistics
+            for stat in stats_list
+        }
+
+        try:
+            ttl = int(p.toolkit.config.get('ckanext.schemingdcat.open_data_statistics.cache_ttl', 300))
+        except (TypeError, ValueError):
+            ttl = 300
+        _open_data_statistics_expires = time.monotonic() + ttl
 
-    return _open_data_statistics
+        return _open_data_statistics
+
+def invalidate_open_data_statistics_cache():
+    """
+    Invalidates the cached Open Data portal statistics of this process, so the next call to
+    `schemingdcat_get_open_data_statistics` reloads them from the statistics table.
+    """
+    global _open_data_statistics_expires
+
+    with _open_data_statistics_lock:
+        _open_data_statistics_expires = 0
 
 @helper
 def schemingdcat_get_social_links(platform=None):
@@ -1664,30 +1700,87 @@ def get_theme_datasets(field='theme'):
 
     return results
 
+def _get_theme_counts_from_extras(field='theme'):
+    """
+    Counts the values of a theme field by paging through the `extras_<field>` of all datasets.
+
+    Fallback of `get_theme_counts` for fields that are not indexed as a facetable field.
+
+    Parameters:
+    field (str): The field to count the values of. Default is 'theme'.
+
+    Returns:
+    dict: The number of datasets by theme value.
+    """
+    theme_counts = defaultdict(int)
+    for dataset in get_theme_datasets(field):
+        theme_value = dataset.get('extras_' + field) or dataset.get(field)
+        if not theme_value:
+            continue
+        try:
+            parsed_values = json.loads(theme_value) if isinstance(theme_value, str) else theme_value
+        except json.JSONDecodeError:
+            continue  # Skip if theme_value is not valid JSON
+        if isinstance(parsed_values, str):
+            parsed_values = [parsed_values]
+        for val in parsed_values:
+            theme_counts[val] += 1
+
+    return dict(theme_counts)
+
+@helper
+def get_theme_counts(field='theme'):
+    """
+    Counts the datasets of each value of a theme field with a single faceted search.
+
+    If the facet returns no values but there are datasets with the field in their extras
+    (i.e. the field is not indexed as a facetable field), falls back to paging through
+    the datasets extras.
+
+    Parameters:
+    field (str): The field to count the values of. Default is 'theme'.
+
+    Returns:
+    dict: The number of datasets by theme value.
+    """
+    context = {'model': model, 'session': model.Session}
+    search_dict = {
+        'q': '*:*',
+        'rows': 0,
+        'facet.field': json.dumps([field]),
+        'facet.limit': -1,
+        'facet.mincount': 1,
+    }
+    result = logic.get_action('package_search')(context, search_dict)
+    theme_counts = result.get('facets', {}).get(field, {})
+
+    if theme_counts:
+        return dict(theme_counts)
+
+    # Check if the field is only stored in the extras before paging through the catalogue
+    search_dict = {
+        'fq': 'extras_{0}:[* TO *]'.format(field),
+        'rows': 0,
+    }
+    if logic.get_action('package_search')(context, search_dict)['count'] == 0:
+        return {}
+
+    log.debug("Field '%s' is not faceted, counting themes from dataset extras", field)
+    return _get_theme_counts_from_extras(field)
+
 @helper
 def get_unique_themes():
     """
-    Retrieves unique themes from the dataset extras field specified by the default package item icon.
+    Retrieves unique themes from the dataset field specified by the default package item icon.
 
-    This helper function uses the `get_theme_datasets` function to fetch datasets and then extracts
-    unique values from the specified field. The results are cached to improve performance.
+    This helper function uses the `get_theme_counts` function to retrieve the theme values
+    with a single faceted search.
 
     Returns:
-        list: A list of unique themes extracted from the specified field in the dataset extras.
+        list: A list of unique themes of the specified field.
     """
     field_name = schemingdcat_get_default_package_item_icon()
-    themes = get_theme_datasets(field_name)
-    
-    # Use a set to store unique values
-    unique_values = set()
-    for dataset in themes:
-        value = dataset.get(field_name)
-        if value:
-            # Parse the JSON string and add each value to the set
-            unique_values.update(json.loads(value))
-    
-    # Return the unique values as a list
-    return list(unique_values)
+    return list(get_theme_counts(field_name).keys())
 
 @lru_cache(maxsize=16)
 @helper
@@ -1873,27 +1966,13 @@ def schemingdcat_get_theme_statistics(theme_field=None, icons_dir=None) -> List[
     if theme_field is None:
         theme_field = schemingdcat_get_default_package_item_icon()
     try:
-        themes = get_theme_datasets(theme_field)
+        theme_counts = get_theme_counts(theme_field)
     except Exception as e:
         log.error("Error aggregating theme statistics: %s", e)
         raise
 
     if icons_dir is None:
         icons_dir = schemingdcat_get_icons_dir(field_name=theme_field)
-    
-    # Use a defaultdict to store unique themes and their counts
-    theme_counts = defaultdict(int)
-
-    # Iterate over the themes and count occurrences
-    for theme_dict in themes:
-        theme_value = theme_dict.get(theme_field)  # Access 'theme' using the provided field name
-        if theme_value:
-            try:
-                parsed_values = json.loads(theme_value)  # Parse the JSON only once per theme
-            except json.JSONDecodeError:
-                continue  # Skip if theme_value is not valid JSON
-            for val in parsed_values:
-                theme_counts[val] += 1
 
     # Generate the final list of dictionaries
     stats = [
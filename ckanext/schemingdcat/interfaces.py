@@ -51,6 +51,9 @@ class ISchemingDCATHarvester(Interface):
         """
         Called just after the remote file has been downloaded
 
+        With the `streaming` read engine of the XLS harvester it is called once per chunk of rows of
+        the datasets sheet, each one with the whole distributions and datadictionaries sheets.
+
         Args:
             content_dicts (dict): A dict of dataframes containing the content of the harvested dataset (datasets, distributions and datadictionaries).
             harvest_job (object): A ``HarvestJob`` domain object which contains a
@@ -69,6 +72,9 @@ class ISchemingDCATHarvester(Interface):
         """
         This method is called before the cleaning process starts.
 
+        With the `streaming` read engine of the XLS harvester it is called once per chunk of rows of
+        the datasets sheet.
+
         Args:
             content_dicts (dict): A dict of dataframes containing the content of the harvested dataset (datasets, distributions and datadictionaries).
 
@@ -83,6 +89,9 @@ class ISchemingDCATHarvester(Interface):
         """
         This method is called after the cleaning process ends.
 
+        With the `streaming` read engine of the XLS harvester it is called once per chunk of rows of
+        the datasets sheet, with the cleaned datasets of the chunk.
+
         Args:
             clean_datasets (list): The cleaned datasets.
 
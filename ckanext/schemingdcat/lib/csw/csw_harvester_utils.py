@@ -21,6 +21,76 @@ DEFAULT_TIMEZONE = tz.gettz(p.toolkit.config.get('ckan.display_timezone', 'UTC')
 CSWDatasetInfo = namedtuple('CSWDatasetInfo',
                               ['name', 'belongs_to_harvester', 'package_id'])
 
+# Identifiers resolved per query by the IdentifierPackageResolver
+IDENTIFIER_LOOKUP_CHUNK_SIZE = 1000
+
+
+class IdentifierPackageResolver(object):
+    """
+    Request-scoped map of dataset identifiers to the packages that have them.
+
+    The identifiers are resolved in bulk, joining the packages with their `identifier` extra in
+    chunked queries, instead of one `package_search` per identifier. Resolved identifiers,
+    including the ones without package, are cached for the lifetime of the resolver, so it
+    must be created per gather or import stage.
+    """
+
+    def __init__(self, chunk_size=IDENTIFIER_LOOKUP_CHUNK_SIZE):
+        """
+        Args:
+            chunk_size (int, optional): The number of identifiers resolved per query. Defaults to 1000.
+        """
+        self.chunk_size = max(int(chunk_size), 1)
+        self._packages = {}
+
+    def resolve(self, identifiers):
+        """
+        Resolves the packages of the identifiers that are not resolved yet.
+
+        Args:
+            identifiers (iterable): The dataset identifiers.
+
+        Returns:
+            dict: The packages (CSWDatasetInfo) of the given identifiers that exist, by identifier.
+        """
+        identifiers = {identifier for identifier in identifiers if identifier}
+        pending = sorted(identifiers - set(self._packages))
+
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start:start + self.chunk_size]
+            self._packages.update(dict.fromkeys(chunk))
+            query = Session.query(model.PackageExtra.value, model.Package.id, model.Package.name) \
+                .join(model.Package, model.Package.id == model.PackageExtra.package_id) \
+                .filter(model.PackageExtra.key == 'identifier') \
+                .filter(model.PackageExtra.value.in_(chunk)) \
+                .filter(model.Package.state != 'deleted') \
+                .order_by(model.Package.metadata_created)
+            for identifier, package_id, name in query:
+                # The oldest package is kept if several have the same identifier
+                if self._packages.get(identifier) is None:
+                    self._packages[identifier] = CSWDatasetInfo(name=name, package_id=package_id, belongs_to_harvester=True)
+
+        if pending:
+            log.debug('Resolved %s of %s dataset identifiers', sum(self._packages[i] is not None for i in pending), len(pending))
+
+        return {identifier: self._packages[identifier] for identifier in identifiers if self._packages[identifier] is not None}
+
+    def get(self, identifier):
+        """
+        Returns the package of an identifier, resolving it if it is not resolved yet.
+
+        Args:
+            identifier (str): The dataset identifier.
+
+        Returns:
+            CSWDatasetInfo: The package information, or None if there is no package with the identifier.
+        """
+        if not identifier:
+            return None
+        if identifier not in self._packages:
+            self.resolve([identifier])
+        return self._packages[identifier]
+
 def get_organization_slug_for_harvest_source(harvest_source_id):
     """Retrieve the organization slug for a given harvest source.
 
@@ -149,35 +219,26 @@ def get_value_from_object_extra(harvest_object_extras, key):
             return extra.value
     return None
 
-def find_package_for_identifier(identifier):
+def find_package_for_identifier(identifier, resolver=None):
     """
     Find a package in CKAN for a given identifier.
 
     Args:
         identifier (str): The identifier to search for.
+        resolver (IdentifierPackageResolver, optional): The request-scoped resolver, shared by the
+            lookups of a harvest stage so the identifiers resolved in bulk are not queried again.
+            A single lookup is done if not provided.
 
     Returns:
         CSWDatasetInfo: A named tuple containing the dataset information if found, or None if not found.
-
-    Raises:
-        Exception: If an error occurs while searching for the package.
     """
-    context = get_default_context()
-    fq = "identifier:({})".format(identifier)
+    if resolver is None:
+        resolver = IdentifierPackageResolver()
     try:
-        result = p.toolkit.get_action('package_search')(context,
-                                                        {'fq': fq,
-                                                         'include_private': True})
-        if result.get('count') > 0:
-            pkg = result['results'][0]
-            return CSWDatasetInfo(name=pkg['name'],
-                                  package_id=pkg['id'],
-                                  belongs_to_harvester=True)
-        else:
-            return None
+        return resolver.get(identifier)
     except Exception as e:
-        print("Error occurred while searching for packages with fq: {}, error: {}"
-              .format(fq, e))
+        log.error("Error occurred while searching for the package with identifier: {}, error: {}"
+                  .format(identifier, e))
         return None
     
 def map_resources_to_ids(pkg_dict, package_id):
@@ -5,6 +5,8 @@ from datetime import datetime
 from owslib.iso import MD_Metadata
 from lxml import etree
 
+from ckanext.schemingdcat.lib.csw.xpath_registry import get_namespaces, xpath
+
 log = logging.getLogger(__name__)
 
 #TODO: Not sure if this is the best way to do this
@@ -16,11 +18,11 @@ class InspireMetadataExtractor:
     metadata: MD_Metadata
 
     @staticmethod
-    def extract_text(element: Optional[etree.Element], xpath: str, namespaces: Dict[str, str]) -> Optional[str]:
-        """Safely extracts text from XML element"""
+    def extract_text(element: Optional[etree.Element], expression: str, namespaces: Dict[str, str]) -> Optional[str]:
+        """Safely extracts text from XML element, with the compiled expressions of the XPath registry"""
         if element is None:
             return None
-        result = element.xpath(xpath, namespaces=namespaces)
+        result = xpath(element, expression, namespaces)
         return result[0] if result else None
 
 class IdentificationExtractor(InspireMetadataExtractor):
@@ -36,11 +38,19 @@ class IdentificationExtractor(InspireMetadataExtractor):
             "keywords": self._extract_keywords()
         }
 
+    @property
+    def _identification(self):
+        # OWSLib >= 0.29 returns a list of identification objects
+        identification = self.metadata.identification
+        if isinstance(identification, list):
+            return identification[0] if identification else None
+        return identification
+
     def _extract_title(self) -> Optional[str]:
-        return self.metadata.identification.title if self.metadata.identification else None
+        return self._identification.title if self._identification else None
 
     def _extract_abstract(self) -> Optional[str]:
-        return self.metadata.identification.abstract if self.metadata.identification else None
+        return self._identification.abstract if self._identification else None
 
     def _extract_alternative_title(self) -> Optional[str]:
         return self.extract_text(self.root, ".//gmd:alternateTitle/gco:CharacterString/text()", self.namespaces)
@@ -49,14 +59,15 @@ class IdentificationExtractor(InspireMetadataExtractor):
         return self.extract_text(self.root, ".//gmd:language/gco:CharacterString/text()", self.namespaces)
     
     def _extract_topic_category(self) -> List[str]:
-        topics = self.root.xpath(".//gmd:topicCategory/gmd:MD_TopicCategoryCode/text()", namespaces=self.namespaces)
+        topics = xpath(self.root, ".//gmd:topicCategory/gmd:MD_TopicCategoryCode/text()", self.namespaces)
         return topics if topics else []
     
     def _extract_keywords(self) -> List[Dict[str, str]]:
         keywords = []
-        if self.metadata.identification and self.metadata.identification.keywords:
-            for kw_group in self.metadata.identification.keywords:
-                keywords.extend([{"name": kw} for kw in kw_group.keywords])
+        if self._identification and self._identification.keywords:
+            for kw_group in self._identification.keywords:
+                # OWSLib >= 0.29 returns Keyword objects
+                keywords.extend([{"name": getattr(kw, "name", kw)} for kw in kw_group.keywords])
         return keywords
 
 class ExtentExtractor(InspireMetadataExtractor):
@@ -71,7 +82,7 @@ class ExtentExtractor(InspireMetadataExtractor):
         }
 
     def _extract_bounding_box(self) -> Optional[Dict[str, float]]:
-        bbox = self.root.xpath(".//gmd:EX_GeographicBoundingBox", namespaces=self.namespaces)
+        bbox = xpath(self.root, ".//gmd:EX_GeographicBoundingBox", self.namespaces)
         if not bbox:
             return None
         
@@ -90,7 +101,7 @@ class ExtentExtractor(InspireMetadataExtractor):
         )
 
     def _extract_temporal_extent(self) -> Optional[Dict[str, str]]:
-        extent = self.root.xpath(".//gmd:EX_TemporalExtent//gml:TimePeriod", namespaces=self.namespaces)
+        extent = xpath(self.root, ".//gmd:EX_TemporalExtent//gml:TimePeriod", self.namespaces)
         if not extent:
             return None
             
@@ -100,7 +111,7 @@ class ExtentExtractor(InspireMetadataExtractor):
         }
     
     def _extract_vertical_extent(self) -> Optional[Dict[str, Any]]:
-        extent = self.root.xpath(".//gmd:EX_VerticalExtent", namespaces=self.namespaces)
+        extent = xpath(self.root, ".//gmd:EX_VerticalExtent", self.namespaces)
         if not extent:
             return None
             
@@ -135,7 +146,7 @@ class QualityExtractor(InspireMetadataExtractor):
         )
     
     def _extract_quality_conformity(self) -> List[Dict[str, Any]]:
-        conformity_elements = self.root.xpath(".//gmd:report//gmd:DQ_ConformanceResult", namespaces=self.namespaces)
+        conformity_elements = xpath(self.root, ".//gmd:report//gmd:DQ_ConformanceResult", self.namespaces)
         results = []
         
         for element in conformity_elements:
@@ -157,16 +168,18 @@ class ConstraintsExtractor(InspireMetadataExtractor):
         }
 
     def _extract_access_limitations(self) -> List[Dict[str, str]]:
-        limitations = self.root.xpath(
+        limitations = xpath(
+            self.root,
             ".//gmd:resourceConstraints//gmd:accessConstraints/gmd:MD_RestrictionCode/@codeListValue",
-            namespaces=self.namespaces
+            self.namespaces
         )
         return [{"type": limitation} for limitation in limitations]
     
     def _extract_use_constraints(self) -> List[Dict[str, str]]:
-        constraints = self.root.xpath(
+        constraints = xpath(
+            self.root,
             ".//gmd:resourceConstraints//gmd:useConstraints//gco:CharacterString/text()",
-            namespaces=self.namespaces
+            self.namespaces
         )
         return [{"description": constraint} for constraint in constraints]
     
@@ -190,7 +203,7 @@ class ResponsiblePartyExtractor(InspireMetadataExtractor):
         }
     
     def _extract_responsible_org(self) -> List[Dict[str, str]]:
-        parties = self.root.xpath(".//gmd:identificationInfo//gmd:pointOfContact//gmd:CI_ResponsibleParty", namespaces=self.namespaces)
+        parties = xpath(self.root, ".//gmd:identificationInfo//gmd:pointOfContact//gmd:CI_ResponsibleParty", self.namespaces)
         results = []
         
         for party in parties:
@@ -207,7 +220,8 @@ def _generate_metadata_inspire(xml_content: str) -> Dict[str, Any]:
     try:
         root = etree.fromstring(xml_content)
         metadata = MD_Metadata(root)
-        namespaces = root.nsmap
+        # Interned namespace map, shared by the records with the same namespaces
+        namespaces = get_namespaces(root.nsmap)
         
         extractors = [
             IdentificationExtractor(namespaces, root, metadata),
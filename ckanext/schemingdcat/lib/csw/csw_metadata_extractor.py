@@ -5,6 +5,7 @@ from dateutil.parser import parse
 from owslib.iso import MD_Metadata
 from lxml import etree
 from .csw_inspire import _generate_metadata_inspire
+from .xpath_registry import get_namespaces, xpath
 from shapely.geometry import Polygon
 from shapely.geometry import mapping
 import json
@@ -221,7 +222,7 @@ class CSWMetadataExtractor:
     #TODO: Implement
     def _generate_metadata_using_xml(self, root):
         """Extract additional metadata directly from XML"""
-        namespaces = root.nsmap
+        namespaces = get_namespaces(root.nsmap)
         try:
             return {
                 "language": self._get_xml_value(root, ".//gmd:language/gco:CharacterString/text()", namespaces),
@@ -1321,14 +1322,14 @@ class CSWMetadataExtractor:
             return None
         
     # XML: Metadata direct extraction using etree
-    def _get_xml_value(self, root, xpath, namespaces):
-        """Safe XML value extraction"""
-        elements = root.xpath(xpath, namespaces=namespaces)
+    def _get_xml_value(self, root, expression, namespaces):
+        """Safe XML value extraction, with the compiled expressions of the XPath registry"""
+        elements = xpath(root, expression, namespaces)
         return elements[0] if elements else None
 
     def _extract_spatial(self, root, namespaces):
         """Extract spatial extent"""
-        bbox = root.xpath(".//gmd:EX_GeographicBoundingBox", namespaces=namespaces)
+        bbox = xpath(root, ".//gmd:EX_GeographicBoundingBox", namespaces)
         if not bbox:
             return None
             
@@ -1341,7 +1342,7 @@ class CSWMetadataExtractor:
 
     def _extract_temporal_extent(self, root, namespaces):
         """Extract temporal coverage"""
-        extent = root.xpath(".//gmd:EX_TemporalExtent//gml:TimePeriod", namespaces=namespaces)
+        extent = xpath(root, ".//gmd:EX_TemporalExtent//gml:TimePeriod", namespaces)
         if not extent:
             return None
             
@@ -1353,9 +1354,10 @@ class CSWMetadataExtractor:
     def _get_character_encoding(self, root: etree.Element) -> str:
         """Extract character encoding if not UTF-8"""
         try:
-            encoding = root.xpath(
+            encoding = xpath(
+                root,
                 ".//gmd:characterSet/gmd:MD_CharacterSetCode/@codeListValue",
-                namespaces=root.nsmap
+                root.nsmap
             )
             return encoding[0] if encoding else "utf8"
         except Exception:
@@ -1364,13 +1366,16 @@ class CSWMetadataExtractor:
     def _get_maintenance_info(self, root: etree.Element) -> dict:
         """Extract maintenance information"""
         try:
-            frequency = root.xpath(
+            namespaces = get_namespaces(root.nsmap)
+            frequency = xpath(
+                root,
                 ".//gmd:maintenanceAndUpdateFrequency/gmd:MD_MaintenanceFrequencyCode/@codeListValue",
-                namespaces=root.nsmap
+                namespaces
             )
-            note = root.xpath(
+            note = xpath(
+                root,
                 ".//gmd:maintenanceNote/gco:CharacterString/text()",
-                namespaces=root.nsmap
+                namespaces
             )
             return {
                 "frequency": frequency[0] if frequency else None,
@@ -1378,3 +1383,36 @@ class CSWMetadataExtractor:
             }
         except Exception:
             return {}
+
+
+# Extractor of the worker processes used by the parallel extraction of the CSW harvester
+_process_extractor = None
+
+
+def init_process_extractor(debug=False):
+    """
+    Initializes the extractor of a worker process of the parallel CSW extraction.
+
+    Args:
+        debug (bool): Enable debug mode if True, disabled by default
+    """
+    global _process_extractor
+    _process_extractor = CSWMetadataExtractor(debug=debug)
+
+
+def extract_from_csw_xml(xml_content):
+    """
+    Extracts the metadata of a raw ISO 19139 record in a worker process.
+
+    The record is shipped as XML, as the MD_Metadata objects and lxml trees can not be
+    pickled, and parsed again in the worker.
+
+    Args:
+        xml_content (bytes): The XML of the MD_Metadata record.
+
+    Returns:
+        dict: The extracted metadata, an empty dict if the extraction fails.
+    """
+    if _process_extractor is None:
+        init_process_extractor()
+    return _process_extractor.extract_from_csw(MD_Metadata(etree.fromstring(xml_content)), xml_content)
@@ -1,18 +1,29 @@
+import copy
 import logging
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 import urllib3
 from lxml import etree
 
 from owslib.iso import MD_Metadata
 from owslib.csw import CatalogueServiceWeb as OwsCatalogueServiceWeb
 from owslib.util import Authentication
-from owslib.fes import PropertyIsLike, PropertyIsEqualTo, SortBy, SortProperty
+from owslib.fes import PropertyIsLike, PropertyIsEqualTo, PropertyIsGreaterThanOrEqualTo, SortBy, SortProperty
 from urllib.parse import urlparse, urlunparse, urlencode, parse_qsl
 
 from ckanext.schemingdcat.config import (
     CSW_DEFAULT_LIMIT,
     CQL_QUERY_DEFAULT,
     CQL_SEARCH_TERM_DEFAULT,
-    OUTPUT_SCHEMA
+    OUTPUT_SCHEMA,
+    CSW_PAGE_SIZE,
+    CSW_PAGE_WORKERS,
+    CSW_PAGE_RETRIES,
+    CSW_PAGE_RETRY_DELAY,
+    CSW_MODIFIED_PROPERTY
 )
 
 log = logging.getLogger(__name__)
@@ -45,6 +56,8 @@ class SchemingDCATCatalogueServiceWeb(object):
         ssl_verify (bool): Whether to verify the SSL certificate. Default is True.
     """
 
+    _page_retry_delay = CSW_PAGE_RETRY_DELAY
+
     def __init__(self, url, ssl_verify=True):
         """
         Initializes the SchemingDCATCatalogueServiceWeb with the given URL and SSL verification setting.
@@ -59,6 +72,8 @@ class SchemingDCATCatalogueServiceWeb(object):
         # Pass 'auth' when initializing CatalogueServiceWeb
         self.csw = OwsCatalogueServiceWeb(self.csw_url, auth=auth)
         self.schema = OUTPUT_SCHEMA
+        # Number of records matched by the last query, set by iter_csw_pages
+        self.matches = None
 
     def get_csw_url(self, url, version="2"):
         """
@@ -98,30 +113,198 @@ class SchemingDCATCatalogueServiceWeb(object):
         log.debug(f"Constructed CSW URL: {csw_url}")
         return csw_url
 
+    def _get_query_args(self, cql=None, cql_query=None, cql_search_term=None, cql_use_like=False,
+                        typenames="csw:Record", esn="full", outputschema=OUTPUT_SCHEMA, sortproperty='dc:identifier',
+                        modified_since=None, modified_property=CSW_MODIFIED_PROPERTY):
+        """
+        Builds the getrecords2 arguments shared by the hits request and the pages of a query.
+
+        Returns:
+            dict: The getrecords2 arguments, with the search constraints or the raw CQL if any.
+        """
+        csw_args = {
+            "typenames": typenames,
+            "esn": esn,
+            "outputschema": outputschema,
+            "sortby": SortBy([SortProperty(sortproperty)]),
+        }
+        constraints = []
+
+        if cql_query and cql_search_term:
+            # Normalize query property name
+            query_property = cql_query
+            if not ':' in query_property:
+                query_property = 'csw:' + query_property.capitalize()
+
+            if cql_use_like:
+                constraint = PropertyIsLike(query_property, f"%{cql_search_term}%")
+            else:
+                constraint = PropertyIsEqualTo(query_property, cql_search_term)
+
+            log.debug('Using search constraints - Query: %s, Term: %s', query_property, cql_search_term)
+            constraints.append(constraint)
+
+        elif cql:
+            log.debug('Using raw CQL: %s', cql)
+            csw_args["cql"] = cql
+
+        if modified_since:
+            log.debug('Using modified since constraint: %s >= %s', modified_property, modified_since)
+            if "cql" in csw_args:
+                csw_args["cql"] = f"({cql}) AND {modified_property} >= '{modified_since}'"
+            else:
+                constraints.append(PropertyIsGreaterThanOrEqualTo(modified_property, modified_since))
+
+        if constraints:
+            # A nested list combines the constraints with AND
+            csw_args["constraints"] = [constraints] if len(constraints) > 1 else constraints
+
+        return csw_args
+
+    def get_matches(self, csw_args):
+        """
+        Returns the number of records matched by a query, with a single hits-only GetRecords request.
+
+        Args:
+            csw_args (dict): The getrecords2 arguments of the query.
+
+        Returns:
+            int: The number of matched records.
+        """
+        self.csw.getrecords2(**dict(csw_args, resulttype="hits", maxrecords=0))
+        if self.csw.response is None:
+            log.error("No response from CSW server")
+            return 0
+        return self.csw.results.get('matches', 0)
+
+    def _get_page(self, csw_args, startposition, maxrecords, retries):
+        """
+        Requests a page of records, retrying it if the request fails.
+
+        Each page uses a shallow copy of the OWSLib client, as it keeps the request and the
+        response of the last call, so pages can be requested from several threads.
+
+        Returns:
+            OrderedDict: The records of the page, by identifier.
+
+        Raises:
+            Exception: The error of the last attempt, if every attempt fails.
+        """
+        client = copy.copy(self.csw)
+        for attempt in range(retries + 1):
+            try:
+                client.getrecords2(**dict(csw_args, startposition=startposition, maxrecords=maxrecords, resulttype="results"))
+                return client.records
+            except Exception as e:
+                if attempt >= retries:
+                    log.error("Error requesting the CSW records page at position %s: %s", startposition, e)
+                    raise
+                log.warning("Error requesting the CSW records page at position %s (attempt %s/%s): %s", startposition, attempt + 1, retries + 1, e)
+                time.sleep(self._page_retry_delay * (attempt + 1))
+
+    def iter_csw_pages(self, cql=None, cql_query=None,
+                       cql_search_term=None, cql_use_like=False,
+                       typenames="csw:Record",
+                       limit=CSW_DEFAULT_LIMIT,
+                       esn="full",
+                       outputschema=OUTPUT_SCHEMA,
+                       maxrecords=CSW_PAGE_SIZE,
+                       startposition=0,
+                       sortproperty='dc:identifier',
+                       max_workers=CSW_PAGE_WORKERS,
+                       retries=CSW_PAGE_RETRIES,
+                       modified_since=None,
+                       modified_property=CSW_MODIFIED_PROPERTY):
+        """
+        Yields the records of a query page by page, in the order of the result set.
+
+        The number of matched records is learnt from one hits-only request, then the pages are
+        requested concurrently by up to `max_workers` threads. At most `max_workers` pages are
+        requested ahead of the page being consumed, so memory is bounded by the page size.
+
+        Args:
+            See `get_csw_records`.
+            max_workers (int, optional): The number of pages requested at the same time. Defaults to 4.
+            retries (int, optional): The number of retries of a failed page. Defaults to 2.
+
+        Yields:
+            OrderedDict: The records of each page, by identifier.
+        """
+        csw_args = self._get_query_args(cql, cql_query, cql_search_term, cql_use_like, typenames, esn, outputschema, sortproperty,
+                                        modified_since, modified_property)
+        log.info("Making CSW request: 'getrecords2()': %s", csw_args)
+
+        matches = self.matches = self.get_matches(csw_args)
+        log.debug("Matches found: %d", matches)
+        if matches == 0:
+            log.warning("No matches found with current query")
+            return
+
+        # CSW positions start at 1
+        first = max(startposition, 1)
+        total = matches - (first - 1)
+        if limit:
+            total = min(total, limit)
+        positions = iter(range(first, first + max(total, 0), maxrecords))
+
+        max_workers = max(int(max_workers or 1), 1)
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='schemingdcat_csw')
+        pending = deque()
+        try:
+            for position in islice(positions, max_workers):
+                pending.append(executor.submit(self._get_page, csw_args, position, maxrecords, retries))
+
+            while pending:
+                records = pending.popleft().result()
+                position = next(positions, None)
+                if position is not None:
+                    pending.append(executor.submit(self._get_page, csw_args, position, maxrecords, retries))
+                yield records
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
     def get_csw_records(self, cql=None, cql_query=None,
                         cql_search_term=None, cql_use_like=False,
                         typenames="csw:Record",  # Cambiado a csw:Record
                         limit=CSW_DEFAULT_LIMIT, 
                         esn="full", 
                         outputschema=OUTPUT_SCHEMA,
-                        maxrecords=75, 
+                        maxrecords=CSW_PAGE_SIZE, 
                         startposition=0, 
-                        sortproperty='dc:identifier'):
+                        sortproperty='dc:identifier',
+                        max_workers=CSW_PAGE_WORKERS,
+                        retries=CSW_PAGE_RETRIES,
+                        modified_since=None,
+                        modified_property=CSW_MODIFIED_PROPERTY):
         """
         Retrieve records from a CSW server.
 
+        The number of matched records is learnt from one hits-only request and the pages are then
+        requested concurrently (see `iter_csw_pages`). The records are available in `self.csw.records`.
+
         Args:
             typenames (str, optional): The typeNames to query against. Defaults to "csw:Record".
             limit (int, optional): The maximum number of records to return. No records are returned if 0. Defaults to None.
             esn (str, optional): The ElementSetName 'full', 'brief' or 'summary'. Defaults to 'summary'.
             outputschema (str, optional): The outputSchema. Defaults to 'http://www.opengis.net/cat/csw/2.0.2'.
-            page (int, optional): The number of records to return per page. Defaults to 30.
+            maxrecords (int, optional): The number of records to return per page. Defaults to 75.
             startposition (int, optional): Requests a slice of the result set, starting at this position. Defaults to 0.
             sortproperty (str, optional): The sortProperty. Defaults to 'dc:identifier'.
+            max_workers (int, optional): The number of pages requested at the same time. Defaults to 4.
+            retries (int, optional): The number of retries of a failed page. Defaults to 2.
+            modified_since (str, optional): Only requests the records modified at or after this ISO 8601
+                date, for incremental harvests. Defaults to None.
+            modified_property (str, optional): The queryable of the modified date. Defaults to 'apiso:Modified'.
 
         Returns:
             record_ids (list): A list of record identifiers from the CSW server.
 
+        Raises:
+            Exception: If a page can not be retrieved after its retries, so an incomplete result set
+                is not mistaken for the whole catalogue.
+
         Additional Information:
             getrecords2 (OWSLib): Construct and process a GetRecords request in order to retrieve metadata records from a CSW.
             Parameters
@@ -141,82 +324,14 @@ class SchemingDCATCatalogueServiceWeb(object):
             - hopcount: number of message hops before search is terminated (default is 1)
         """
         try:
-            self.csw.sortby = SortBy([SortProperty(sortproperty)])
             record_ids = []
-            all_records = {}
-
-            # Base query parameters
-            csw_args = {
-                "typenames": typenames,
-                "esn": esn,
-                "maxrecords": maxrecords,
-                "outputschema": outputschema,
-                "sortby": self.csw.sortby,
-                "startposition": startposition,
-                "resulttype": "results"
-            }
-
-            log.info("Making CSW request: 'getrecords2()': %s", csw_args)
-
-            # Try first without constraints
-            self.csw.getrecords2(**csw_args)
-            
-            if self.csw.response is None:
-                log.error("No response from CSW server")
-                return []
-
-            # If we have search parameters, try with them
-            if cql_query and cql_search_term:                
-                # Normalize query property name
-                query_property = cql_query
-                if not ':' in query_property:
-                    query_property = 'csw:' + query_property.capitalize()
-                
-                if cql_use_like:
-                    search_term = f"%{cql_search_term}%"
-                    constraint = PropertyIsLike(query_property, search_term)
-                else:
-                    constraint = PropertyIsEqualTo(query_property, cql_search_term)
-                
-                log.debug('Using search constraints - Query: %s, Term: %s', query_property, cql_search_term)
-                csw_args["constraints"] = [constraint]
-                
-                # Try with constraints
-                self.csw.getrecords2(**csw_args)
-                
-                # Log request/response for debugging
-                log.debug("Matches found: %d", self.csw.results.get('matches', 0))
-
-            elif cql:
-                log.debug('Using raw CQL: %s', cql)
-                csw_args["cql"] = cql
-                self.csw.getrecords2(**csw_args)
-
-            # Process results
-            if self.csw.results['matches'] == 0:
-                log.warning("No matches found with current query")
-                # Try without constraints as fallback
-                csw_args.pop("constraints", None)
-                self.csw.getrecords2(**csw_args)
-                if self.csw.results['matches'] == 0:
-                    return []
-
-            # Process pagination and collect records
-            nextrecord = startposition
-            while nextrecord is not None:
-                all_records.update(self.csw.records)
-                record_ids.extend(self.csw.records.keys())
-
-                if limit and len(record_ids) >= limit:
-                    break
-
-                if (self.csw.results['returned'] > 0 and 
-                    0 < self.csw.results['nextrecord'] <= self.csw.results['matches']):
-                    nextrecord = self.csw.results['nextrecord']
-                    csw_args["startposition"] = nextrecord
-                    self.csw.getrecords2(**csw_args)
-                else:
-                    nextrecord = None
+            all_records = OrderedDict()
+
+            for records in self.iter_csw_pages(cql, cql_query, cql_search_term, cql_use_like, typenames, limit, esn,
+                                               outputschema, maxrecords, startposition, sortproperty, max_workers, retries,
+                                               modified_since, modified_property):
+                all_records.update(records)
+                record_ids.extend(records.keys())
 
             # Apply limit if specified
             if limit:
@@ -234,8 +349,37 @@ class SchemingDCATCatalogueServiceWeb(object):
                 log.debug("CSW Response: %s", self.csw.response)
             if hasattr(self.csw, 'request'):
                 log.debug("CSW Request: %s", self.csw.request)
-            return []
+            raise
         
+    def get_csw_identifiers(self, cql=None, cql_query=None,
+                            cql_search_term=None, cql_use_like=False,
+                            typenames="csw:Record",
+                            maxrecords=CSW_PAGE_SIZE,
+                            max_workers=CSW_PAGE_WORKERS,
+                            retries=CSW_PAGE_RETRIES):
+        """
+        Returns the identifiers of every record matched by a query, from a 'brief' listing.
+
+        Incremental harvests only request the full records modified since the last harvest, the
+        identifiers of the whole result set are used to detect the deleted records.
+
+        Args:
+            See `get_csw_records`.
+
+        Returns:
+            set: The identifiers of the matched records.
+
+        Raises:
+            Exception: If a page can not be retrieved after its retries.
+        """
+        record_ids = set()
+        for records in self.iter_csw_pages(cql, cql_query, cql_search_term, cql_use_like, typenames, esn="brief",
+                                           maxrecords=maxrecords, max_workers=max_workers, retries=retries):
+            record_ids.update(records.keys())
+
+        log.info('Total CSW record identifiers found: %d', len(record_ids))
+        return record_ids
+
     def get_metadata_record(self, record_id):
         """
         Gets both the parsed metadata object and raw XML for a given record ID.
@@ -0,0 +1,96 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+log = logging.getLogger(__name__)
+
+# Compiled expressions kept in the registry. Records with unusual namespace maps beyond this
+# limit are evaluated with expressions compiled on the fly
+MAX_CACHED_XPATHS = 4096
+
+_namespace_maps = {}
+# Keys of the interned namespace maps by id, they are kept alive by _namespace_maps
+_interned_keys = {}
+_xpaths = {}
+_lock = threading.Lock()
+
+
+def _get_namespaces_key(namespaces: Optional[Dict]) -> frozenset:
+    key = _interned_keys.get(id(namespaces))
+    if key is None:
+        # The default namespace (None prefix) can not be used in XPath expressions
+        key = frozenset((prefix, uri) for prefix, uri in (namespaces or {}).items() if prefix)
+    return key
+
+
+def get_namespaces(namespaces: Optional[Dict]) -> Dict[str, str]:
+    """
+    Returns the interned copy of a namespace map, e.g. the `nsmap` of a record.
+
+    Records of the same catalogue usually declare the same namespaces, so they share a single
+    namespace map and the expressions compiled for it. Passing the interned map to `get_xpath`
+    also avoids building its key again on every evaluation.
+
+    Args:
+        namespaces (dict): The namespace map, by prefix.
+
+    Returns:
+        dict: The interned namespace map, without the default namespace. It must not be modified.
+    """
+    key = _get_namespaces_key(namespaces)
+    interned = _namespace_maps.get(key)
+    if interned is None:
+        with _lock:
+            interned = _namespace_maps.setdefault(key, dict(key))
+            _interned_keys[id(interned)] = key
+    return interned
+
+
+def get_xpath(expression: str, namespaces: Optional[Dict]) -> etree.XPath:
+    """
+    Returns the compiled XPath evaluator of an expression and a namespace map.
+
+    Args:
+        expression (str): The XPath expression.
+        namespaces (dict): The namespace map, by prefix.
+
+    Returns:
+        etree.XPath: The compiled expression, shared by every extractor.
+    """
+    key = (expression, _get_namespaces_key(namespaces))
+    compiled = _xpaths.get(key)
+    if compiled is None:
+        compiled = etree.XPath(expression, namespaces=get_namespaces(namespaces))
+        with _lock:
+            if len(_xpaths) < MAX_CACHED_XPATHS:
+                compiled = _xpaths.setdefault(key, compiled)
+            else:
+                log.debug('XPath registry is full, the expression is not cached: %s', expression)
+    return compiled
+
+
+def xpath(element: etree._Element, expression: str, namespaces: Optional[Dict]) -> List:
+    """
+    Evaluates an XPath expression on an element with the compiled evaluator of the registry.
+
+    Args:
+        element (etree._Element): The element.
+        expression (str): The XPath expression.
+        namespaces (dict): The namespace map, by prefix.
+
+    Returns:
+        list: The result of the expression.
+    """
+    return get_xpath(expression, namespaces)(element)
+
+
+def clear() -> None:
+    """
+    Empties the registry.
+    """
+    with _lock:
+        _xpaths.clear()
+        _interned_keys.clear()
+        _namespace_maps.clear()
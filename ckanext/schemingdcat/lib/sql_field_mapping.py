@@ -21,6 +21,7 @@ class SqlFieldMappingValidator(FieldMappingValidator):
         - is_key_type: If the field is a key field.
         - f_key_references: The reference to the table.
         - index: The index of the field.
+        - modified_column: If the field is the last modification date used by the incremental harvest.
 
         Validators:
         - 1: validate_v1
@@ -35,6 +36,7 @@ class SqlFieldMappingValidator(FieldMappingValidator):
             'is_p_key', 
             'f_key_references',
             'index',
+            'modified_column',
             self.language_field
         }
         
@@ -132,6 +134,7 @@ class SqlFieldMappingValidator(FieldMappingValidator):
             ValueError: If the field mapping is not valid.
         """
         self._check_non_translated_fields(field_mapping)
+        modified_fields = []
 
         for local_field, field_config in field_mapping.items():
             # Initialize the flags for each local_field
@@ -158,6 +161,12 @@ class SqlFieldMappingValidator(FieldMappingValidator):
                     self._check_value(local_field, prop, value)
                 if prop in ['index', 'is_p_key']:
                     self._is_not_boolean(local_field, prop, value)
+                if prop == 'modified_column':
+                    self._is_not_boolean(local_field, prop, value)
+                    if value:
+                        if not field_config.get('field_name'):
+                            raise ValueError(f'The property "{prop}" in field: "{local_field}" needs a "field_name" in the format: {{schema}}.{{table}}.{{field}}')
+                        modified_fields.append(local_field)
                 if prop == self.language_field:
                     if not isinstance(value, dict):
                         raise ValueError('%s must be a dictionary', self.language_field)
@@ -181,6 +190,8 @@ class SqlFieldMappingValidator(FieldMappingValidator):
                                 self._check_value(local_field, lang_prop, lang_value)
                             if lang_prop in ['index', 'is_p_key']:
                                 self._is_not_boolean(local_field, lang_prop, lang_value)
+                            if lang_prop == 'modified_column':
+                                raise ValueError(f'The property "{lang_prop}" in field: "{local_field}" can not be used in multilingual fields')
 
             # Check the flags after processing each local_field
             if field_name_defined and field_value_defined:
@@ -188,4 +199,7 @@ class SqlFieldMappingValidator(FieldMappingValidator):
                     if not isinstance(field_config.get('field_value'), list):
                         raise ValueError(f'"field_value" for "{local_field}" can only be used if it is a list. First, check that the local_field_name accepts lists, otherwise the harvester validator may have problems.')
 
+        if len(modified_fields) > 1:
+            raise ValueError(f'Only one field can be the "modified_column". It currently is: {", ".join(modified_fields)}')
+
         return field_mapping
\ No newline at end of file
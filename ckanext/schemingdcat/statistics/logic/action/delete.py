@@ -40,4 +40,17 @@ def schemingdcat_statistics_delete(self, context: Dict[str, Any], data_dict: Dic
     except Exception as e:
         raise p.toolkit.ValidationError(f'An error occurred while resetting statistics: {str(e)}')
 
-    return {'success': True, 'msg': 'Statistics have been reset successfully.'}
\ No newline at end of file
+    return {'success': True, 'msg': 'Statistics have been reset successfully.'}
+
+@p.toolkit.chained_action
+def package_delete(original_action, context, data_dict):
+    """
+    Stores the statistics snapshot of the dataset before it is deleted.
+
+    Used by the incremental Open Data statistics to decrement the counters of the deleted dataset
+    when the delete signal is received. See `ckanext.schemingdcat.open_data_statistics.incremental`.
+    """
+    package_id = data_dict.get('id') or data_dict.get('name')
+    if package_id and stats_model.incremental_enabled():
+        stats_model.remember_dataset_snapshot(package_id)
+    return original_action(context, data_dict)
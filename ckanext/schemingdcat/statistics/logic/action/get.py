@@ -1,6 +1,7 @@
 from ckan.logic import side_effect_free
 
 from ckanext.schemingdcat.statistics import model as stats_model
+from ckanext.schemingdcat.statistics.scheduler import refresh_scheduler
 
 @side_effect_free
 def schemingdcat_statistics_show(context, data_dict):
@@ -64,3 +65,25 @@ def schemingdcat_statistics_list(context, data_dict):
     if out:
         out = stats_model.table_dictize(out, context)
     return out
+
+@side_effect_free
+def schemingdcat_statistics_refresh_status(context, data_dict):
+    """
+    Retrieves the state of the Open Data site statistics refresh scheduler of the current process.
+
+    Args:
+        context (dict): The context of the API call.
+        data_dict (dict): A dictionary containing the parameters for the API call. No parameters are used.
+
+    Returns:
+        dict: A dictionary with the `last_run` time (ISO 8601), the `last_duration` in seconds, the number
+            of events coalesced in the last refresh (`last_events`), the `last_error` if any, and whether
+            a refresh is pending (`dirty`) or `running`.
+
+    Example:
+        To use this API, you can make a GET request to the following URL:
+        ```
+        http://<your-ckan-instance>/api/3/action/schemingdcat_statistics_refresh_status
+        ```
+    """
+    return refresh_scheduler.status()
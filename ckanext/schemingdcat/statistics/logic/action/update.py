@@ -10,4 +10,17 @@ from ckanext.schemingdcat.statistics.schema import schemingdcat_update_statistic
 
 #TODO: Implement the update action
 def schemingdcat_statistics_update(context, data_dict):
-    pass
\ No newline at end of file
+    pass
+
+@p.toolkit.chained_action
+def package_update(original_action, context, data_dict):
+    """
+    Stores the statistics snapshot of the dataset before it is updated.
+
+    Used by the incremental Open Data statistics to apply the difference between the old and new
+    dataset when the update signal is received. See `ckanext.schemingdcat.open_data_statistics.incremental`.
+    """
+    package_id = data_dict.get('id') or data_dict.get('name')
+    if package_id and stats_model.incremental_enabled():
+        stats_model.remember_dataset_snapshot(package_id)
+    return original_action(context, data_dict)
@@ -1,5 +1,6 @@
 import uuid
 import json
+from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 from collections import defaultdict
 import logging
@@ -20,15 +21,26 @@ from ckan import model
 import ckan.logic as logic
 from ckan.model.domain_object import DomainObject
 
+import ckan.plugins as p
+
 from ckanext.schemingdcat.helpers import (
     get_schemingdcat_get_catalog_endpoints,
-    schemingdcat_get_theme_statistics
+    schemingdcat_get_theme_statistics,
+    schemingdcat_get_default_package_item_icon,
+    schemingdcat_get_icons_dir,
+    schemingdcat_get_icon,
+    invalidate_open_data_statistics_cache
 )
 
 log = logging.getLogger(__name__)
 
 statistics_table = None
 
+_SNAPSHOTS_ATTR = 'schemingdcat_stats_snapshots'
+
+# Key of the system_info row flagging a pending full refresh, shared by every CKAN process
+REFRESH_PENDING_KEY = 'ckanext.schemingdcat.open_data_statistics.refresh_pending'
+
 def make_uuid():
     return text_type(uuid.uuid4())
 
@@ -83,8 +95,49 @@ def update_table():
     """
     update_portal_stats()
     update_theme_stats()
+    invalidate_open_data_statistics_cache()
     log.debug('Updated Open Data site statistics')
 
+def set_refresh_pending(pending: bool) -> None:
+    """
+    Flags or clears a pending full update of the statistics in the CKAN `system_info` table.
+
+    The flag is shared by every CKAN process, so the changes made by one process (e.g. the
+    harvester fetch consumer) are refreshed by another one (e.g. the process running the
+    harvest jobs), even if the first one exits before its refresh timer runs.
+
+    It is written in its own transaction, not in `model.Session`, as it is set from the signal
+    receivers of the actions and must not commit the pending changes of the caller.
+
+    Args:
+        pending (bool): Whether a full update is pending.
+
+    Returns:
+        None
+    """
+    table = model.system_info_table
+    with model.meta.engine.begin() as connection:
+        if not pending:
+            connection.execute(table.delete().where(table.c.key == REFRESH_PENDING_KEY))
+            return
+
+        value = datetime.now(timezone.utc).isoformat()
+        updated = connection.execute(table.update().where(table.c.key == REFRESH_PENDING_KEY).values(value=value))
+        if not updated.rowcount:
+            connection.execute(table.insert().values(key=REFRESH_PENDING_KEY, value=value))
+
+def is_refresh_pending() -> bool:
+    """
+    Checks whether a full update of the statistics is pending, in any CKAN process.
+
+    Returns:
+        bool: True if a full update is pending.
+    """
+    table = model.system_info_table
+    with model.meta.engine.connect() as connection:
+        value = connection.execute(sa.select(table.c.value).where(table.c.key == REFRESH_PENDING_KEY)).scalar()
+    return bool(value)
+
 class PortalStatistics(DomainObject):
     """
     Represents portal statistics within the database.
@@ -145,6 +198,7 @@ class PortalStatistics(DomainObject):
 
         # Commit the changes to the database
         model.Session.commit()
+        invalidate_open_data_statistics_cache()
 
 def define_tables():
     """
@@ -249,36 +303,24 @@ def update_portal_stats():
         log.error("Error aggregating portal statistics: %s", e)
         raise
 
-    # Iterate over each statistic and update or create the corresponding entry
-    for stat_name, stat_count in stats.items():
-        try:
-            stat_id = f"{stat_name}s"
-            stat = PortalStatistics.get(id=stat_id, stat_type=stat_type)
-            icon = stat_info.get(stat_name, {}).get('icon', None)
-            if stat:
-                stat.stat_count = stat_count
-                stat.icon = icon
-                stat.value = stat_name
-            else:
-                new_stat = PortalStatistics(
-                    id=stat_id,
-                    stat_count=stat_count,
-                    stat_type=stat_type,
-                    value=stat_name,
-                    icon=icon,
-                    label=stat_name
-                )
-                model.Session.add(new_stat)
-        except Exception as e:
-            log.error("Error updating portal statistic '%s': %s", stat_name, e)
+    rows = [
+        {
+            'id': f"{stat_name}s",
+            'stat_count': stat_count,
+            'stat_type': stat_type,
+            'value': stat_name,
+            'icon': stat_info.get(stat_name, {}).get('icon', None),
+            'label': stat_name,
+        }
+        for stat_name, stat_count in stats.items()
+    ]
 
-    # Commit all changes at once
+    # Write all the statistics in one statement
     try:
-        model.Session.commit()
+        bulk_upsert_statistics(rows, update_fields=('stat_count', 'icon', 'value'))
         log.debug("All portal statistics have been updated.")
     except Exception as e:
         log.error("Error committing portal statistics to the database: %s", e)
-        model.Session.rollback()
 
 def update_theme_stats():
     """
@@ -290,42 +332,117 @@ def update_theme_stats():
         log.error("Error aggregating theme statistics: %s", e)
         raise
 
-    for stat in themes_stats:
-        try:
-            count = stat['count']
-            icon = stat['icon']
-            label = stat['label']
-            stat_type = stat['field_name']
-            theme_name = f"{stat_type}_{stat['label']}"
-            value = stat['value']
-
-            existing_stat = PortalStatistics.get(id=theme_name, stat_type=stat_type)
-            if existing_stat:
-                existing_stat.stat_count = count
-                if not existing_stat.icon:
-                    existing_stat.icon = icon
-                if not existing_stat.label:
-                    existing_stat.label = label
-            else:
-                new_stat = PortalStatistics(
-                    id=theme_name,
-                    stat_count=count,
-                    stat_type=stat_type,
-                    value=value,
-                    icon=icon,
-                    label=label
-                )
-                model.Session.add(new_stat)
-        except Exception as e:
-            log.error("Error updating theme statistic '%s': %s", theme_name, e)
+    rows = [
+        {
+            'id': f"{stat['field_name']}_{stat['label']}",
+            'stat_count': stat['count'],
+            'stat_type': stat['field_name'],
+            'value': stat['value'],
+            'icon': stat['icon'],
+            'label': stat['label'],
+        }
+        for stat in themes_stats
+    ]
 
+    # Write all the statistics in one statement, keeping the icon and label already set
     try:
-        model.Session.commit()
+        bulk_upsert_statistics(rows, update_fields=('stat_count',), fill_fields=('icon', 'label'))
         log.debug("All theme statistics have been updated.")
     except Exception as e:
         log.error("Error committing theme statistics to the database: %s", e)
+
+def bulk_upsert_statistics(rows: List[Dict[str, Any]], update_fields=('stat_count',), fill_fields=(), commit: bool = True) -> None:
+    """
+    Inserts or updates multiple statistics in a single statement.
+
+    Uses `INSERT ... ON CONFLICT (id) DO UPDATE` on PostgreSQL and SQLite. On other databases,
+    or SQLAlchemy versions without `on_conflict_do_update`, it falls back to one SELECT of the
+    existing ids, one bulk INSERT and one bulk UPDATE, so the number of queries does not depend
+    on the number of rows either.
+
+    Args:
+        rows (list): The statistics to write, dicts with all the columns of the statistics table.
+        update_fields (tuple): Columns overwritten on the existing rows.
+        fill_fields (tuple): Columns only set on the existing rows if they are empty.
+        commit (bool): Commit the session after writing. Defaults to True.
+
+    Returns:
+        None
+    """
+    if not rows:
+        return
+
+    if statistics_table is None:
+        define_tables()
+
+    # Deduplicate by id, the last row wins
+    rows = list({row['id']: row for row in rows}.values())
+    dialect = model.Session.get_bind().dialect.name
+    insert = None
+
+    try:
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+    except ImportError:
+        insert = None
+
+    try:
+        if insert is not None and hasattr(insert(statistics_table), 'on_conflict_do_update'):
+            stmt = insert(statistics_table).values(rows)
+            set_ = {field: stmt.excluded[field] for field in update_fields}
+            for field in fill_fields:
+                set_[field] = sa.func.coalesce(
+                    sa.func.nullif(statistics_table.c[field], ''),
+                    stmt.excluded[field]
+                )
+            stmt = stmt.on_conflict_do_update(index_elements=[statistics_table.c.id], set_=set_)
+            model.Session.execute(stmt)
+        else:
+            _bulk_upsert_statistics_fallback(rows, update_fields, fill_fields)
+
+        if commit:
+            model.Session.commit()
+    except Exception:
         model.Session.rollback()
-        
+        raise
+
+def _bulk_upsert_statistics_fallback(rows: List[Dict[str, Any]], update_fields, fill_fields) -> None:
+    """
+    Portable version of `bulk_upsert_statistics`: a SELECT of the existing rows, a bulk INSERT
+    of the new ones and a bulk UPDATE (executemany) of the existing ones.
+    """
+    ids = [row['id'] for row in rows]
+    existing = {
+        row.id: row for row in model.Session.query(statistics_table)
+        .filter(statistics_table.c.id.in_(ids))
+    }
+
+    new_rows = [row for row in rows if row['id'] not in existing]
+    if new_rows:
+        model.Session.execute(statistics_table.insert(), new_rows)
+
+    updated_rows = []
+    for row in rows:
+        current = existing.get(row['id'])
+        if current is None:
+            continue
+        # Bind parameters can not share the column names in an UPDATE
+        values = {'_id': row['id']}
+        for field in update_fields:
+            values[f'_{field}'] = row[field]
+        for field in fill_fields:
+            values[f'_{field}'] = getattr(current, field) or row[field]
+        updated_rows.append(values)
+
+    if updated_rows:
+        fields = list(update_fields) + list(fill_fields)
+        stmt = statistics_table.update() \
+            .where(statistics_table.c.id == sa.bindparam('_id')) \
+            .values({field: sa.bindparam(f'_{field}') for field in fields})
+        model.Session.execute(stmt, updated_rows)
+
 def get_spatial_datasets(count=10, return_count=False):
     """
     This helper function retrieves a specified number of featured datasets from the CKAN instance. 
@@ -350,4 +467,179 @@ def get_spatial_datasets(count=10, return_count=False):
     if return_count:
         return result['count']
     else:
-        return result['results']
\ No newline at end of file
+        return result['results']
+
+def incremental_enabled() -> bool:
+    """
+    Checks if the statistics are updated incrementally from the signal payloads.
+
+    Returns:
+        bool: The value of `ckanext.schemingdcat.open_data_statistics.incremental`.
+    """
+    return p.toolkit.asbool(p.toolkit.config.get('ckanext.schemingdcat.open_data_statistics.incremental', False))
+
+def get_dataset_snapshot(package_id: str, theme_field: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Retrieves the values of a dataset that contribute to the statistics.
+
+    Args:
+        package_id (str): The id or name of the dataset.
+        theme_field (str, optional): The theme field. Defaults to `ckanext.schemingdcat.default_package_item_icon`.
+
+    Returns:
+        dict: The dataset `id`, whether it is `counted` (an active and public dataset), whether it is
+            a `spatial` (INSPIRE) dataset, and its `themes`. None if the dataset does not exist.
+    """
+    pkg = model.Package.get(package_id)
+    if pkg is None:
+        return None
+
+    if theme_field is None:
+        theme_field = schemingdcat_get_default_package_item_icon()
+
+    extras = pkg.extras or {}
+    themes = extras.get(theme_field) or []
+    if isinstance(themes, str):
+        try:
+            themes = json.loads(themes)
+        except ValueError:
+            themes = [themes]
+    if isinstance(themes, str):
+        themes = [themes]
+
+    return {
+        'id': pkg.id,
+        'counted': pkg.type == 'dataset' and pkg.state == 'active' and not pkg.private,
+        'spatial': 'inspire' in (extras.get('dcat_type') or '').lower(),
+        'themes': set(themes),
+    }
+
+def remember_dataset_snapshot(package_id: str) -> None:
+    """
+    Stores the statistics snapshot of a dataset before it is changed, for the current request.
+
+    Args:
+        package_id (str): The id or name of the dataset.
+    """
+    snapshot = get_dataset_snapshot(package_id)
+    if snapshot is None:
+        return
+    try:
+        snapshots = getattr(p.toolkit.g, _SNAPSHOTS_ATTR, None)
+        if snapshots is None:
+            snapshots = {}
+            setattr(p.toolkit.g, _SNAPSHOTS_ATTR, snapshots)
+        snapshots[snapshot['id']] = snapshot
+    except (AttributeError, RuntimeError):
+        # Outside of an application context
+        pass
+
+def pop_dataset_snapshot(package_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Retrieves and forgets the snapshot stored by `remember_dataset_snapshot`.
+
+    Args:
+        package_id (str): The id or name of the dataset.
+
+    Returns:
+        dict: The snapshot, or None if there is none.
+    """
+    pkg = model.Package.get(package_id)
+    if pkg is None:
+        return None
+    try:
+        snapshots = getattr(p.toolkit.g, _SNAPSHOTS_ATTR, None) or {}
+    except (AttributeError, RuntimeError):
+        return None
+    return snapshots.pop(pkg.id, None)
+
+def _theme_stat_id(theme_field: str, theme: str) -> str:
+    return f"{theme_field}_{theme.split('/')[-1]}"
+
+def apply_dataset_delta(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]], theme_field: Optional[str] = None) -> None:
+    """
+    Applies to the statistics the difference between two snapshots of a dataset in one transaction.
+
+    A created dataset has no `old` snapshot, a deleted dataset has no `new` snapshot (or is no
+    longer counted). Theme rows are incremented for the added themes and decremented for the
+    removed ones.
+
+    Args:
+        old (dict, optional): The snapshot before the change, see `get_dataset_snapshot`.
+        new (dict, optional): The snapshot after the change.
+        theme_field (str, optional): The theme field. Defaults to `ckanext.schemingdcat.default_package_item_icon`.
+    """
+    if theme_field is None:
+        theme_field = schemingdcat_get_default_package_item_icon()
+
+    old_counted = bool(old and old['counted'])
+    new_counted = bool(new and new['counted'])
+    old_themes = old['themes'] if old_counted else set()
+    new_themes = new['themes'] if new_counted else set()
+
+    deltas = defaultdict(int)
+    deltas[('datasets', 'portal')] += int(new_counted) - int(old_counted)
+    deltas[('spatial_datasets', 'portal')] += int(new_counted and new['spatial']) - int(old_counted and old['spatial'])
+
+    themes = {}
+    for theme in new_themes - old_themes:
+        stat_id = _theme_stat_id(theme_field, theme)
+        deltas[(stat_id, theme_field)] += 1
+        themes[stat_id] = theme
+    for theme in old_themes - new_themes:
+        stat_id = _theme_stat_id(theme_field, theme)
+        deltas[(stat_id, theme_field)] -= 1
+        themes[stat_id] = theme
+
+    _apply_deltas(deltas, themes)
+
+def apply_counter_delta(stat_name: str, delta: int) -> None:
+    """
+    Increments or decrements a portal statistic (e.g. `group` or `organization`).
+
+    Args:
+        stat_name (str): The name of the statistic, as used in `update_portal_stats`.
+        delta (int): The value to add to the statistic.
+    """
+    _apply_deltas({(f"{stat_name}s", 'portal'): delta})
+
+def _apply_deltas(deltas: Dict[tuple, int], themes: Optional[Dict[str, str]] = None) -> None:
+    """
+    Adds the deltas to the statistics rows, creating the missing theme rows, and commits once.
+
+    Args:
+        deltas (dict): The values to add by `(id, stat_type)`.
+        themes (dict, optional): The theme value by statistic id, used to create missing theme rows.
+    """
+    themes = themes or {}
+    icons_dir = None
+
+    try:
+        for (stat_id, stat_type), delta in deltas.items():
+            if not delta:
+                continue
+            updated = model.Session.query(PortalStatistics) \
+                .filter_by(id=stat_id, stat_type=stat_type) \
+                .update({'stat_count': PortalStatistics.stat_count + delta}, synchronize_session=False)
+
+            if not updated and delta > 0 and stat_id in themes:
+                if icons_dir is None:
+                    icons_dir = schemingdcat_get_icons_dir(field_name=stat_type)
+                theme = themes[stat_id]
+                model.Session.add(PortalStatistics(
+                    id=stat_id,
+                    stat_count=delta,
+                    stat_type=stat_type,
+                    value=theme,
+                    icon=schemingdcat_get_icon(icons_dir=icons_dir, choice_value=theme),
+                    label=theme.split('/')[-1]
+                ))
+            elif not updated:
+                log.debug("Statistic '%s' (%s) not found, it will be fixed in the next full update", stat_id, stat_type)
+
+        model.Session.commit()
+        invalidate_open_data_statistics_cache()
+    except Exception as e:
+        log.error("Error applying statistics deltas: %s", e)
+        model.Session.rollback()
+        raise
@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+import ckan.plugins as p
+from ckan import model
+
+from ckanext.schemingdcat.statistics import model as stats_model
+
+log = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 60
+
+
+class StatisticsRefreshScheduler(object):
+    """
+    Coalesces Open Data site statistics refresh requests.
+
+    Events only mark the statistics as dirty. The first event of a burst schedules a
+    single refresh after the configured interval, which runs in a background thread.
+    Events received while a refresh is running schedule one more refresh afterwards.
+
+    The pending refresh is also flagged in the database, so `flush` refreshes the changes
+    made by other processes, and the changes of a process that exits before its timer runs
+    are not lost.
+    """
+
+    def __init__(self, refresh: Optional[Callable[[], Any]] = None, interval: Optional[int] = None):
+        """
+        Args:
+            refresh (callable, optional): The function that recomputes the statistics. Defaults to
+                `ckanext.schemingdcat.statistics.model.update_table`.
+            interval (int, optional): Seconds to wait before a refresh. Defaults to the
+                `ckanext.schemingdcat.open_data_statistics.refresh_interval` config option.
+        """
+        self._refresh = refresh
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._timer = None
+        self._app = None
+        self._dirty = False
+        self._running = False
+        self._pending_events = 0
+        self.last_run = None
+        self.last_duration = None
+        self.last_error = None
+        self.last_events = 0
+
+    @property
+    def interval(self) -> int:
+        """
+        Returns the number of seconds refresh requests are coalesced for.
+        """
+        if self._interval is not None:
+            return self._interval
+        try:
+            return int(p.toolkit.config.get(
+                'ckanext.schemingdcat.open_data_statistics.refresh_interval',
+                DEFAULT_REFRESH_INTERVAL
+            ))
+        except (TypeError, ValueError):
+            return DEFAULT_REFRESH_INTERVAL
+
+    def mark_dirty(self, sender: Optional[str] = None) -> None:
+        """
+        Flags the statistics as outdated and schedules a refresh if none is pending.
+
+        Args:
+            sender (str, optional): The name of the event that changed the statistics.
+        """
+        with self._lock:
+            first_event = not self._dirty
+            self._dirty = True
+            self._pending_events += 1
+            self._capture_app()
+            if self._timer is None and not self._running:
+                self._start_timer(self.interval)
+        if first_event:
+            self._set_refresh_pending(True)
+        log.debug('[%s] -> Open Data site statistics marked as dirty', sender)
+
+    def flush(self, sender: Optional[str] = None) -> None:
+        """
+        Runs the pending refresh now, in the calling thread (e.g. at the end of a harvest job).
+
+        The refresh runs if this process has pending events or another process has flagged a
+        pending refresh in the database (e.g. the harvester fetch consumer, while the harvest
+        jobs are run by the CLI).
+
+        Args:
+            sender (str, optional): The name of the event that requested the refresh.
+        """
+        with self._lock:
+            pending = self._dirty
+        if not pending:
+            try:
+                pending = stats_model.is_refresh_pending()
+            except Exception as e:
+                log.error('Failed to check the pending Open Data site statistics refresh: %s', e)
+        if not pending:
+            return
+
+        with self._lock:
+            self._dirty = True
+            self._capture_app()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        log.debug('[%s] -> Open Data site statistics refresh requested', sender)
+        self._run(remove_session=False)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Returns the state of the scheduler.
+
+        Returns:
+            dict: `last_run` (ISO 8601), `last_duration` (seconds), `last_events` (number of
+                events coalesced in the last refresh), `last_error`, `dirty`, `running`,
+                `pending_events` and `interval`.
+        """
+        with self._lock:
+            return {
+                'last_run': self.last_run.isoformat() if self.last_run else None,
+                'last_duration': self.last_duration,
+                'last_events': self.last_events,
+                'last_error': self.last_error,
+                'dirty': self._dirty,
+                'running': self._running,
+                'pending_events': self._pending_events,
+                'interval': self.interval,
+            }
+
+    def _capture_app(self) -> None:
+        """
+        Keeps a reference to the current Flask app, so the refresh thread can run the CKAN
+        actions inside an application context.
+        """
+        try:
+            from flask import current_app, has_app_context
+            if has_app_context():
+                self._app = current_app._get_current_object()
+        except ImportError:
+            pass
+
+    def _start_timer(self, delay: int) -> None:
+        self._timer = threading.Timer(max(delay, 0), self._run)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _run(self, remove_session: bool = True) -> None:
+        """
+        Runs the pending refresh, unless another one is running.
+
+        Args:
+            remove_session (bool): Remove the scoped session of the thread afterwards. Set to False
+                when the refresh runs in the thread of the caller (`flush`).
+        """
+        with self._lock:
+            self._timer = None
+            if not self._dirty or self._running:
+                return
+            self._dirty = False
+            self._running = True
+            events = self._pending_events
+            self._pending_events = 0
+            app = self._app
+
+        start = time.monotonic()
+        error = None
+        try:
+            # Cleared before the refresh, so the events received meanwhile flag it again
+            self._set_refresh_pending(False)
+            if app is not None:
+                with app.test_request_context():
+                    self._do_refresh()
+            else:
+                self._do_refresh()
+        except Exception as e:
+            error = str(e)
+            log.error('Failed to Update Open Data site statistics: %s', e)
+            self._set_refresh_pending(True)
+        finally:
+            if remove_session:
+                model.Session.remove()
+
+        with self._lock:
+            self._running = False
+            self.last_run = datetime.now(timezone.utc)
+            self.last_duration = time.monotonic() - start
+            self.last_error = error
+            self.last_events = events
+            if self._dirty and self._timer is None:
+                self._start_timer(self.interval)
+
+        log.info('Updated Open Data site statistics in %.2fs (%s events coalesced)', self.last_duration, events)
+
+    def _set_refresh_pending(self, pending: bool) -> None:
+        try:
+            stats_model.set_refresh_pending(pending)
+        except Exception as e:
+            log.error('Failed to flag the pending Open Data site statistics refresh: %s', e)
+
+    def _do_refresh(self) -> None:
+        refresh = self._refresh or stats_model.update_table
+        refresh()
+
+
+refresh_scheduler = StatisticsRefreshScheduler()
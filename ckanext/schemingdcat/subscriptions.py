@@ -8,6 +8,7 @@ from ckan.logic import NotFound
 from ckan.lib import helpers as ckan_helpers
 
 import ckanext.schemingdcat.statistics.model as sdct_model
+from ckanext.schemingdcat.statistics.scheduler import refresh_scheduler
 from ckanext.schemingdcat.config import (
     DCAT_AP_DATASTORE_DATASERVICE
 )
@@ -15,18 +16,33 @@ from ckanext.schemingdcat.helpers import schemingdcat_get_ckan_site_url
 
 log = logging.getLogger(__name__)
 
+# Events that change a dataset: the statistics delta is computed from the dataset before/after the change.
+# Harvested datasets are created and updated with these actions too, so the harvest signals are not
+# subscribed, the delta of each harvested dataset is applied once
+PACKAGE_CREATE_EVENTS = ["package_create", "package_create_rest"]
+PACKAGE_CHANGE_EVENTS = ["package_update", "package_update_rest", "package_patch", "package_delete"]
+
+# Events that change a portal counter: (statistic, delta) or None if the counters do not change
+COUNTER_EVENTS = {
+    "group_create": ("group", 1),
+    "group_update": None,
+    "group_delete": ("group", -1),
+    "organization_create": ("organization", 1),
+    "organization_update": None,
+    "organization_delete": ("organization", -1),
+}
+
 def get_subscriptions():
     return {
         p.toolkit.signals.action_succeeded: [
             {"sender": "bulk_update_public", "receiver": schemingdcat_stats_changed},
             {"sender": "bulk_update_private", "receiver": schemingdcat_stats_changed},
             {"sender": "bulk_update_delete", "receiver": schemingdcat_stats_changed},
-            {"sender": "schemingdcat_harvest_package_updated", "receiver": schemingdcat_stats_changed},
-            {"sender": "schemingdcat_harvest_package_created", "receiver": schemingdcat_stats_changed},
             {"sender": "package_create", "receiver": schemingdcat_stats_changed},
             {"sender": "package_create_rest", "receiver": schemingdcat_stats_changed},
             {"sender": "package_update", "receiver": schemingdcat_stats_changed},
             {"sender": "package_update_rest", "receiver": schemingdcat_stats_changed},
+            {"sender": "package_patch", "receiver": schemingdcat_stats_changed},
             {"sender": "package_delete", "receiver": schemingdcat_stats_changed},
             {"sender": "group_create", "receiver": schemingdcat_stats_changed},
             {"sender": "group_update", "receiver": schemingdcat_stats_changed},
@@ -34,6 +50,8 @@ def get_subscriptions():
             {"sender": "organization_create", "receiver": schemingdcat_stats_changed},
             {"sender": "organization_update", "receiver": schemingdcat_stats_changed},
             {"sender": "organization_delete", "receiver": schemingdcat_stats_changed},
+            {"sender": "harvest_jobs_run", "receiver": schemingdcat_stats_flush},
+            {"sender": "harvest_job_abort", "receiver": schemingdcat_stats_flush},
             {"sender": "datastore_create", "receiver": schemingdcat_update_dcat_dataservice},
         ]
     }
@@ -42,6 +60,12 @@ def schemingdcat_stats_changed(sender: str, **kwargs: Any):
     """
     Handles the event when certain actions are performed and updates site statistics.
 
+    If `ckanext.schemingdcat.open_data_statistics.incremental` is enabled, the delta of the
+    event is applied to the statistics. Otherwise (or if the delta cannot be computed from the
+    event) the statistics are only marked as dirty, bursts of events are coalesced into one
+    update per `ckanext.schemingdcat.open_data_statistics.refresh_interval`, run off
+    the request thread.
+
     Args:
         sender (str): The name of the sender that triggered the event.
         **kwargs (Any): Additional keyword arguments passed to the function.
@@ -50,10 +74,74 @@ def schemingdcat_stats_changed(sender: str, **kwargs: Any):
         Exception: If updating site statistics fails, an error is logged.
     """
     try:
-        log.debug(f"[{sender}] -> Update Open Data site statistics")
-        sdct_model.update_table()
+        if sdct_model.incremental_enabled() and _apply_stats_delta(sender, kwargs.get("data_dict") or {}):
+            log.debug(f"[{sender}] -> Applied Open Data site statistics delta")
+            return
+        refresh_scheduler.mark_dirty(sender)
     except Exception as e:
         log.error(f"Failed to Update Open Data site statistics: {e}")
+        refresh_scheduler.mark_dirty(sender)
+
+def _apply_stats_delta(sender: str, data_dict: dict) -> bool:
+    """
+    Applies the statistics delta of an action event.
+
+    Args:
+        sender (str): The name of the action.
+        data_dict (dict): The data dict of the action.
+
+    Returns:
+        bool: True if the delta was applied, False if a full update is needed.
+    """
+    if sender in COUNTER_EVENTS:
+        counter = COUNTER_EVENTS[sender]
+        if counter:
+            sdct_model.apply_counter_delta(*counter)
+        return True
+
+    package_id = data_dict.get("id") or data_dict.get("name")
+    if not package_id:
+        return False
+    if sender in PACKAGE_CREATE_EVENTS:
+        return _apply_package_delta(package_id, created=True)
+    if sender in PACKAGE_CHANGE_EVENTS:
+        return _apply_package_delta(package_id, created=False)
+    return False
+
+def _apply_package_delta(package_id: str, created: bool) -> bool:
+    """
+    Applies the statistics delta between the dataset before the change (stored by the chained
+    `package_update`/`package_delete` actions) and the dataset after the change.
+
+    Args:
+        package_id (str): The id or name of the dataset.
+        created (bool): Whether the dataset was created (there is no previous snapshot).
+
+    Returns:
+        bool: True if the delta was applied, False if the previous snapshot is missing.
+    """
+    old = sdct_model.pop_dataset_snapshot(package_id)
+    if old is None and not created:
+        return False
+    new = sdct_model.get_dataset_snapshot(package_id)
+    sdct_model.apply_dataset_delta(old, new)
+    return True
+
+def schemingdcat_stats_flush(sender: str, **kwargs: Any):
+    """
+    Handles the end of a harvest job and runs the pending site statistics update, if any.
+
+    Args:
+        sender (str): The name of the sender that triggered the event.
+        **kwargs (Any): Additional keyword arguments passed to the function.
+
+    Raises:
+        Exception: If scheduling the site statistics update fails, an error is logged.
+    """
+    try:
+        refresh_scheduler.flush(sender)
+    except Exception as e:
+        log.error(f"Failed to schedule Open Data site statistics update: {e}")
 
 def schemingdcat_update_dcat_dataservice(sender: str, **kwargs: Any):
     """
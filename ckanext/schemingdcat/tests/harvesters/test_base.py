@@ -0,0 +1,554 @@
+import io
+import os
+import time
+from types import SimpleNamespace
+
+import openpyxl
+import pandas as pd
+import pytest
+import requests
+
+from ckanext.schemingdcat.harvesters import base as harvester_base
+from ckanext.schemingdcat.harvesters import xls as harvester_xls
+from ckanext.schemingdcat.harvesters.xls import SchemingDCATXLSHarvester
+
+# The timing comparisons only run if the number of rows is set, e.g. SCHEMINGDCAT_TABULAR_BENCHMARK_ROWS=100000
+BENCHMARK_ROWS = int(os.environ.get("SCHEMINGDCAT_TABULAR_BENCHMARK_ROWS", 0))
+
+
+def _merge_values_by_row(df, fields):
+    """Row-wise merge of the fields, as it was done before the vectorized version."""
+    def merge_values(row):
+        merged = []
+        for field in fields:
+            if field in row:
+                val = row[field]
+                if isinstance(val, list):
+                    merged.append(','.join(str(v).strip() for v in val))
+                else:
+                    merged.append(str(val).strip())
+        return ','.join(merged)
+
+    return df.apply(merge_values, axis=1)
+
+
+def _keywords_frame(size):
+    return pd.DataFrame({
+        'identifier': [str(i) for i in range(size)],
+        'title': [f'Dataset {i}' for i in range(size)],
+        'keyword_1': [' Environment '] * size,
+        'keyword_2': ['Land use, Soil'] * size,
+        'keyword_3': ['Hydrography'] * size,
+        'unused': [''] * size,
+    })
+
+
+class TestStandardizeDfFieldsFromFieldMapping:
+
+    def setup_method(self):
+        self.harvester = SchemingDCATXLSHarvester()
+
+    def test_merge_rename_and_drop(self):
+        df = _keywords_frame(3)
+        field_mapping = {
+            'identifier': {'field_name': 'identifier'},
+            'name_title': {'field_name': 'title'},
+            'tag_string': {'field_name': ['keyword_1', 'keyword_2', 'keyword_3', 'missing']},
+        }
+
+        result, field_mapping = self.harvester._standardize_df_fields_from_field_mapping(df.copy(), field_mapping)
+
+        assert sorted(result.columns) == ['identifier', 'name_title', 'tag_string']
+        assert result['tag_string'].tolist() == ['Environment,Land use, Soil,Hydrography'] * 3
+        assert result['name_title'].tolist() == df['title'].tolist()
+        assert field_mapping['name_title']['field_name'] == 'name_title'
+
+    def test_merge_field_positions_and_lists(self):
+        df = pd.DataFrame({'identifier': ['a', 'b'], 'keywords': [[' x', 'y '], 'z'], 'theme': ['t1', None]})
+        field_mapping = {
+            'identifier': {'field_position': 'A'},
+            'tag_string': {'field_position': ['B', 'C']},
+        }
+
+        result, _ = self.harvester._standardize_df_fields_from_field_mapping(df, field_mapping)
+
+        assert result.to_dict('records') == [
+            {'identifier': 'a', 'tag_string': 'x,y,t1'},
+            {'identifier': 'b', 'tag_string': 'z,'},
+        ]
+
+    def test_plan_is_applied_to_every_chunk(self, tmp_path):
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = 'Dataset'
+        sheet.append(['ID', 'Title EN', 'Title ES', 'keyword_1', 'keyword_2', 'unused'])
+        for i in range(5):
+            sheet.append([f'id-{i}', f'Dataset {i}', f'Conjunto {i}', 'Environment', 'Soil', 'x'])
+        path = tmp_path / 'datasets.xlsx'
+        workbook.save(path)
+
+        field_mapping = {
+            'identifier': {'field_name': 'ID'},
+            'title': {'languages': {'en': {'field_name': 'Title EN'}, 'es': {'field_name': 'Title ES'}}},
+            'tag_string': {'field_name': ['keyword_1', 'keyword_2']},
+        }
+        plan = self.harvester._get_field_mapping_plan(field_mapping)
+
+        read_only_workbook = openpyxl.load_workbook(path, read_only=True)
+        chunks = [
+            self.harvester._apply_field_mapping_plan(chunk, plan)
+            for chunk in self.harvester._iter_sheet_chunks(read_only_workbook, 'Dataset', 2)
+        ]
+        read_only_workbook.close()
+
+        assert len(chunks) == 3
+        for chunk in chunks:
+            assert sorted(chunk.columns) == ['identifier', 'tag_string', 'title-en', 'title-es']
+        assert pd.concat(chunks)['title-es'].tolist() == [f'Conjunto {i}' for i in range(5)]
+        assert plan['field_mapping']['title']['languages']['es']['field_name'] == 'title-es'
+        # The field_mapping of the source config is not modified
+        assert field_mapping['identifier'] == {'field_name': 'ID'}
+        assert field_mapping['title']['languages']['es'] == {'field_name': 'Title ES'}
+
+    def test_merge_matches_row_wise(self):
+        df = _keywords_frame(BENCHMARK_ROWS or 1000)
+        fields = ['keyword_1', 'keyword_2', 'keyword_3']
+        field_mapping = {
+            'identifier': {'field_name': 'identifier'},
+            'tag_string': {'field_name': fields},
+        }
+
+        start = time.perf_counter()
+        expected = _merge_values_by_row(df, fields)
+        row_wise = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result, _ = self.harvester._standardize_df_fields_from_field_mapping(df.copy(), field_mapping)
+        vectorized = time.perf_counter() - start
+
+        assert result['tag_string'].tolist() == expected.tolist()
+        if BENCHMARK_ROWS:
+            assert vectorized < row_wise
+
+
+class TestSplitListColumns:
+
+    def setup_method(self):
+        self.harvester = SchemingDCATXLSHarvester()
+
+    def _set_list_fields(self, fields):
+        self.harvester._get_list_fields = lambda schema_type='dataset': frozenset(fields)
+
+    def test_split_list_fields(self):
+        self._set_list_fields(['tag_string', 'theme'])
+        df = pd.DataFrame({
+            'title': ['A, B', 'C'],
+            'tag_string': ['apple, banana, -orange', ''],
+            'theme': ['apple, banana, -orange', ' x ,, y'],
+        })
+
+        result = self.harvester._split_list_columns(df).to_dict('records')
+
+        assert result[0]['title'] == 'A, B'
+        assert result[0]['tag_string'] == ['apple', 'banana', 'orange']
+        assert result[1]['tag_string'] == []
+        assert result[1]['theme'] == ['x', 'y']
+        # Each row gets its own list
+        assert result[0]['tag_string'] is not result[0]['theme']
+
+    def test_keeps_values_that_are_not_strings(self):
+        self._set_list_fields(['groups'])
+        df = pd.DataFrame({'groups': ['a,b', ['c'], 3]})
+
+        result = self.harvester._split_list_columns(df)
+
+        assert result['groups'].tolist() == [['a', 'b'], ['c'], 3]
+
+    def test_split_many_rows(self):
+        size = BENCHMARK_ROWS or 1000
+        fields = [f'list_field_{i}' for i in range(20)]
+        self._set_list_fields(fields)
+        df = pd.DataFrame({field: ['Environment, Land use, - Soil, Hydrography'] * size for field in fields})
+
+        start = time.perf_counter()
+        result = self.harvester._split_list_columns(df)
+        elapsed = time.perf_counter() - start
+
+        assert all(result[field].iloc[-1] == ['Environment', 'Land use', 'Soil', 'Hydrography'] for field in fields)
+        if BENCHMARK_ROWS:
+            # The budget of the original benchmark, 5s for 50000 rows of 20 list fields
+            assert elapsed < 5 * BENCHMARK_ROWS / 50000
+
+
+def _tabular_content(size, distributions_per_dataset=2):
+    datasets = [
+        {'identifier': f'id-{i}', 'alternate_identifier': f'alt-{i}', 'inspire_id': f'inspire-{i}', 'title': f'Dataset {i}'}
+        for i in range(size)
+    ]
+    distributions = {
+        f'id-{i}': [{'id': f'res-{i}-{j}', 'dataset_id': f'id-{i}'} for j in range(distributions_per_dataset)]
+        for i in range(size)
+    }
+    datadictionaries = {f'res-{i}-0': [{'id': 'field', 'resource_id': f'res-{i}-0'}] for i in range(size)}
+    return datasets, distributions, datadictionaries
+
+
+class TestAddDistributionsAndDatadictionaries:
+
+    def setup_method(self):
+        self.harvester = SchemingDCATXLSHarvester()
+        self.harvester.config = {}
+
+    def test_join_on_alternative_identifiers(self):
+        datasets = [
+            {'identifier': 'a', 'inspire_id': 'a'},
+            {'identifier': 'b', 'alternate_identifier': 'alt-b'},
+            {'inspire_id': 'c'},
+            {'identifier': 'd'},
+        ]
+        distributions = {
+            'a': [{'id': 'r1'}],
+            'alt-b': [{'id': 'r2'}],
+            'c': [{'id': 'r3'}],
+            'orphan': [{'id': 'r4'}, {'id': 'r5'}],
+        }
+        datadictionaries = {'r1': [{'id': 'f1'}], 'r9': [{'id': 'f9'}]}
+
+        result = self.harvester._add_distributions_and_datadictionaries_to_datasets(datasets, distributions, datadictionaries)
+
+        assert [[r['id'] for r in d['resources']] for d in result] == [['r1'], ['r2'], ['r3'], []]
+        assert result[0]['resources'][0]['datadictionaries'] == [{'id': 'f1'}]
+        assert result[1]['resources'][0]['datadictionaries'] == []
+        # The input dicts are not modified
+        assert 'resources' not in datasets[0]
+        assert 'datadictionaries' not in distributions['a'][0]
+
+    def test_report_orphan_rows(self):
+        datasets, distributions, datadictionaries = _tabular_content(3)
+        distributions['missing'] = [{'id': 'res-missing'}]
+        datadictionaries['res-missing-dd'] = [{'id': 'field'}]
+        matched_ids = {'distributions': set(), 'datadictionaries': set()}
+
+        self.harvester._add_distributions_and_datadictionaries_to_datasets(datasets, distributions, datadictionaries, matched_ids=matched_ids)
+        orphans = self.harvester._report_orphan_rows(distributions, datadictionaries, matched_ids)
+
+        assert orphans == {'distributions': ['missing'], 'datadictionaries': ['res-missing-dd']}
+
+    def test_join_many_datasets(self):
+        sizes = (BENCHMARK_ROWS // 10, BENCHMARK_ROWS) if BENCHMARK_ROWS else (1000,)
+        timings = {}
+        for size in sizes:
+            datasets, distributions, datadictionaries = _tabular_content(size)
+
+            start = time.perf_counter()
+            result = self.harvester._add_distributions_and_datadictionaries_to_datasets(datasets, distributions, datadictionaries)
+            timings[size] = time.perf_counter() - start
+
+            assert sum(len(d['resources']) for d in result) == size * 2
+            assert result[-1]['resources'][0]['datadictionaries'] == [{'id': 'field', 'resource_id': f'res-{size - 1}-0'}]
+
+        if BENCHMARK_ROWS:
+            # 10x the rows should take about 10x the time, far from the 100x of a quadratic join
+            assert timings[sizes[1]] < timings[sizes[0]] * 50
+
+
+class RecordingSession:
+    """Records the bulk inserts and commits of the harvest objects, instead of writing them."""
+
+    def __init__(self):
+        self.inserts = []
+        self.commits = 0
+
+    def bulk_insert_mappings(self, mapper, mappings):
+        self.inserts.append((mapper, list(mappings)))
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def saved(self):
+        """Returns the saved harvest objects by GUID, with their extras by key."""
+        objects = {row['id']: dict(row, extras={}) for mapper, rows in self.inserts if mapper is harvester_base.HarvestObject for row in rows}
+        for mapper, rows in self.inserts:
+            if mapper is harvester_base.HarvestObjectExtra:
+                for row in rows:
+                    objects[row['harvest_object_id']]['extras'][row['key']] = row['value']
+        return {obj['guid']: obj for obj in objects.values()}
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = RecordingSession()
+    monkeypatch.setattr(harvester_base.model, 'Session', session)
+    return session
+
+
+class TestSaveHarvestObjects:
+
+    def setup_method(self):
+        self.harvester = SchemingDCATXLSHarvester()
+        self.harvester.config = {}
+        self.harvest_job = SimpleNamespace(id='job-1', source_id='source-1', source=None)
+        self.datasets = {guid: {'identifier': guid, 'name': f'dataset-{guid}', 'title': f'Dataset {guid}'} for guid in 'abcde'}
+
+    def test_objects_are_inserted_in_chunks_with_status_extras(self, session):
+        self.harvester.config = {'bulk_chunk_size': 2}
+
+        ids = self.harvester._save_harvest_objects(
+            self.harvest_job, {'a', 'b', 'c'}, {'d'}, {'x'}, self.datasets, {'d': 'pkg-d', 'x': 'pkg-x'}, current_hashes={})
+
+        # 5 objects in chunks of 2, each chunk with one insert of objects, one of extras and a commit
+        assert [mapper for mapper, _ in session.inserts] == [harvester_base.HarvestObject, harvester_base.HarvestObjectExtra] * 3
+        assert [len(rows) for mapper, rows in session.inserts if mapper is harvester_base.HarvestObject] == [2, 2, 1]
+        assert session.commits == 3
+
+        saved = session.saved()
+        assert {guid: obj['extras']['status'] for guid, obj in saved.items()} == {'a': 'new', 'b': 'new', 'c': 'new', 'd': 'change', 'x': 'delete'}
+        assert all(obj['state'] == 'WAITING' and not obj['current'] and obj['harvest_job_id'] == 'job-1' for obj in saved.values())
+        assert saved['d']['package_id'] == 'pkg-d'
+        assert saved['a']['extras']['content_hash'] == self.harvester._get_content_hash(self.datasets['a'])
+        # Deleted datasets have no content, the import stage only needs their package
+        assert saved['x']['content'] is None and saved['x']['package_id'] == 'pkg-x'
+        assert 'content_hash' not in saved['x']['extras']
+        assert sorted(item['identifier'] for item in ids) == ['a', 'b', 'c', 'd', 'x']
+        assert {item['id'] for item in ids} == {obj['id'] for obj in saved.values()}
+
+    def test_unchanged_datasets_are_skipped(self, session):
+        current_hashes = {'a': self.harvester._get_content_hash(self.datasets['a']), 'b': 'outdated'}
+
+        ids = self.harvester._save_harvest_objects(
+            self.harvest_job, set(), {'a', 'b'}, set(), self.datasets, {'a': 'pkg-a', 'b': 'pkg-b'}, current_hashes=current_hashes)
+
+        assert [item['identifier'] for item in ids] == ['b']
+        assert session.saved()['b']['extras']['status'] == 'change'
+
+    def test_force_all_updates_unchanged_datasets(self, session):
+        self.harvester.config = {'force_all': True}
+        current_hashes = {guid: self.harvester._get_content_hash(self.datasets[guid]) for guid in 'ab'}
+
+        ids = self.harvester._save_harvest_objects(
+            self.harvest_job, set(), {'a', 'b'}, set(), self.datasets, {'a': 'pkg-a', 'b': 'pkg-b'}, current_hashes=current_hashes)
+
+        assert sorted(item['identifier'] for item in ids) == ['a', 'b']
+        assert {obj['extras']['status'] for obj in session.saved().values()} == {'change'}
+
+
+class PackageNamesSession:
+    """Returns the given existing package names to the name allocator queries."""
+
+    def __init__(self, names):
+        self.names = names
+        self.queries = 0
+
+    def query(self, *args):
+        self.queries += 1
+        return self
+
+    def filter(self, *args):
+        return [(name,) for name in self.names]
+
+
+class TestAllocateName:
+
+    def setup_method(self):
+        self.harvester = SchemingDCATXLSHarvester()
+        self.harvester.config = {}
+
+    def test_names_taken_by_existing_packages_get_next_suffix(self, monkeypatch):
+        session = PackageNamesSession(['my-dataset', 'my-dataset-1', 'my-dataset-2'])
+        monkeypatch.setattr(harvester_base.model, 'Session', session)
+        datasets = [{'title': 'My dataset'}, {'title': 'My dataset'}, {'name': 'other-dataset', 'title': 'My dataset'}]
+
+        self.harvester._init_name_allocator(datasets)
+        names = [self.harvester._allocate_name(dataset.get('name'), dataset.get('title')) for dataset in datasets]
+
+        # Datasets with name are not seeded, only the names generated from the titles
+        assert session.queries == 1
+        assert names == ['my-dataset-3', 'my-dataset-4', 'other-dataset']
+
+    def test_names_are_unique_within_a_batch(self, monkeypatch):
+        monkeypatch.setattr(harvester_base.model, 'Session', PackageNamesSession([]))
+        datasets = [{'title': 'My dataset'}] * 3 + [{'name': 'my-dataset'}]
+
+        self.harvester._init_name_allocator(datasets)
+        names = [self.harvester._allocate_name(dataset.get('name'), dataset.get('title')) for dataset in datasets]
+
+        assert names == ['my-dataset', 'my-dataset-1', 'my-dataset-2', 'my-dataset-3']
+
+    def test_titles_not_seeded_are_seeded_on_allocation(self, monkeypatch):
+        session = PackageNamesSession(['translated-title'])
+        monkeypatch.setattr(harvester_base.model, 'Session', session)
+
+        self.harvester._init_name_allocator([])
+        assert self.harvester._allocate_name(title='Translated title') == 'translated-title-1'
+        assert self.harvester._allocate_name(title='Translated title') == 'translated-title-2'
+        assert session.queries == 1
+
+    def test_name_or_title_is_required(self):
+        self.harvester._init_name_allocator([])
+        with pytest.raises(ValueError):
+            self.harvester._allocate_name()
+
+
+class FakeResponse:
+    """A streamed `requests` response of a remote workbook."""
+
+    def __init__(self, content=b'', status_code=200, headers=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.read = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=self)
+
+    def iter_content(self, chunk_size=1):
+        self.read = True
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+@pytest.fixture
+def remote_workbook(monkeypatch):
+    """Serves the given response to the workbook downloads, recording the request headers."""
+    def setup(response):
+        requested = []
+
+        def get(url, headers=None, **kwargs):
+            requested.append(headers or {})
+            return response
+
+        monkeypatch.setattr(harvester_xls.requests, 'get', get)
+        return requested
+    return setup
+
+
+def _workbook_content(sheet_names):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name in sheet_names:
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append(['identifier', 'title'])
+        sheet.append([f'{sheet_name}-1', f'{sheet_name} 1'])
+    content = io.BytesIO()
+    workbook.save(content)
+    return content.getvalue()
+
+
+class TestRemoteWorkbook:
+
+    url = 'https://example.org/catalog.xlsx'
+
+    def setup_method(self):
+        self.harvester = SchemingDCATXLSHarvester()
+        self.harvester.config = {}
+        self.harvest_job = SimpleNamespace(id='job-2', source=SimpleNamespace(id='source-1'))
+
+    def test_all_sheets_are_read_from_a_single_download(self, remote_workbook, monkeypatch):
+        sheet_names = ['Dataset', 'Distribution', 'DataDictionary']
+        requested = remote_workbook(FakeResponse(_workbook_content(sheet_names), headers={'ETag': '"v1"'}))
+        reads = []
+        read_excel = harvester_xls.pd.read_excel
+
+        def counting_read_excel(*args, **kwargs):
+            reads.append(kwargs.get('sheet_name'))
+            return read_excel(*args, **kwargs)
+
+        monkeypatch.setattr(harvester_xls.pd, 'read_excel', counting_read_excel)
+
+        workbook, validators = self.harvester._download_workbook(self.url, self.harvest_job)
+        sheets = self.harvester._read_remote_sheets(workbook, sheet_names + [None], 'onedrive', harvest_job=self.harvest_job)
+
+        assert len(requested) == 1
+        assert reads == [sheet_names]
+        assert list(sheets) == sheet_names
+        assert sheets['Distribution'].to_dict('records') == [{'identifier': 'Distribution-1', 'title': 'Distribution 1'}]
+        assert validators['etag'] == '"v1"'
+        assert validators['sha256']
+
+    def test_not_modified_workbook_is_not_downloaded(self, remote_workbook):
+        stored = {'etag': '"v1"', 'last_modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+        requested = remote_workbook(FakeResponse(status_code=304))
+
+        workbook, validators = self.harvester._download_workbook(self.url, self.harvest_job, validators=stored)
+
+        assert workbook is None
+        assert validators == stored
+        assert requested == [{'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}]
+
+    def test_unchanged_validators_skip_the_body(self, remote_workbook):
+        # Servers ignoring the conditional headers
+        response = FakeResponse(_workbook_content(['Dataset']), headers={'ETag': '"v1"'})
+        remote_workbook(response)
+
+        workbook, validators = self.harvester._download_workbook(self.url, self.harvest_job, validators={'etag': '"v1"'})
+
+        assert workbook is None
+        assert validators['etag'] == '"v1"'
+        assert not response.read
+
+    def test_changed_workbook_is_downloaded(self, remote_workbook):
+        remote_workbook(FakeResponse(_workbook_content(['Dataset']), headers={'ETag': '"v2"'}))
+
+        workbook, validators = self.harvester._download_workbook(self.url, self.harvest_job, validators={'etag': '"v1"'})
+
+        assert workbook is not None
+        assert validators['etag'] == '"v2"'
+        workbook.close()
+
+
+class TestStoredValidators:
+
+    def setup_method(self):
+        self.harvester = SchemingDCATXLSHarvester()
+        self.harvester.config = {}
+        self.harvest_job = SimpleNamespace(id='job-2', source=SimpleNamespace(id='source-1'))
+
+    def _stored(self, monkeypatch, job, last_error_free_job):
+        stored = {'etag': '"v1"', 'config': self.harvester._get_config_hash(), 'job': job}
+        monkeypatch.setattr(self.harvester, '_get_source_state', lambda source_id, key: stored)
+        monkeypatch.setattr(self.harvester, 'last_error_free_job', lambda harvest_job: last_error_free_job, raising=False)
+        return stored
+
+    def test_validators_of_the_last_error_free_job_are_trusted(self, monkeypatch):
+        stored = self._stored(monkeypatch, 'job-1', SimpleNamespace(id='job-1'))
+
+        assert self.harvester._get_stored_validators(self.harvest_job) == stored
+
+    def test_validators_of_a_job_with_errors_are_not_trusted(self, monkeypatch):
+        # The job that stored them was not the last error-free one, e.g. its import failed
+        self._stored(monkeypatch, 'job-1', SimpleNamespace(id='job-0'))
+        assert self.harvester._get_stored_validators(self.harvest_job) is None
+
+        self._stored(monkeypatch, 'job-1', None)
+        assert self.harvester._get_stored_validators(self.harvest_job) is None
+
+    def test_validators_are_not_trusted_after_a_config_change(self, monkeypatch):
+        self._stored(monkeypatch, 'job-1', SimpleNamespace(id='job-1'))
+        self.harvester.config = {'dataset_sheet': 'Other'}
+
+        assert self.harvester._get_stored_validators(self.harvest_job) is None
+
+    def test_force_all_ignores_the_validators(self, monkeypatch):
+        self._stored(monkeypatch, 'job-1', SimpleNamespace(id='job-1'))
+        self.harvester.config = {'force_all': True}
+
+        assert self.harvester._get_stored_validators(self.harvest_job) is None
+
+    def test_validators_are_stored_with_the_job(self, monkeypatch):
+        stored = {}
+        monkeypatch.setattr(self.harvester, '_set_source_state', lambda source_id, key, value: stored.update({key: value}))
+
+        self.harvester._store_validators(self.harvest_job, {'etag': '"v1"'})
+
+        assert stored[self.harvester._validators_extra_key] == {
+            'etag': '"v1"', 'config': self.harvester._get_config_hash(), 'job': 'job-2'}
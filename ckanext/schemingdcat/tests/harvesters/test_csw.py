@@ -0,0 +1,77 @@
+import copy
+import glob
+import os
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from lxml import etree
+from owslib.iso import MD_Metadata
+
+from ckanext.schemingdcat.harvesters import csw
+from ckanext.schemingdcat.harvesters.csw import SchemingDCATCSWHarvester
+from ckanext.schemingdcat.lib.csw.csw_metadata_extractor import CSWMetadataExtractor
+
+GMD_NS = "http://www.isotc211.org/2005/gmd"
+GCO_NS = "http://www.isotc211.org/2005/gco"
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "examples", "csw")
+
+
+def make_records(count):
+    """Returns `count` MD_Metadata records, copies of the ISO 19139 examples with distinct file identifiers."""
+    templates = []
+    for path in sorted(glob.glob(os.path.join(EXAMPLES_DIR, "*.xml"))):
+        with open(path, "rb") as f:
+            content = f.read()
+        # Some examples were saved from a browser, with a note before the XML
+        root = etree.fromstring(content[content.index(b"<"):])
+        templates.extend(root.iter(f"{{{GMD_NS}}}MD_Metadata"))
+
+    records = OrderedDict()
+    for i in range(count):
+        md = copy.deepcopy(templates[i % len(templates)])
+        md.find(f"{{{GMD_NS}}}fileIdentifier/{{{GCO_NS}}}CharacterString").text = f"record-{i:03d}"
+        records[f"record-{i:03d}"] = MD_Metadata(md)
+    return records
+
+
+def kill_worker(xml_content):
+    os._exit(1)
+
+
+@pytest.fixture
+def harvester():
+    harvester = SchemingDCATCSWHarvester()
+    harvester.config = {"csw_extraction_workers": 2}
+    harvester.gather_errors = []
+    harvester._save_gather_error = lambda message, harvest_job: harvester.gather_errors.append(message)
+    return harvester
+
+
+class TestCSWExtraction:
+    def test_parallel_extraction_keeps_the_serial_order(self, harvester):
+        records = make_records(20)
+        csw_extractor = CSWMetadataExtractor()
+        serial = harvester._extract_csw_records(records, csw_extractor, None)
+
+        executor = harvester._get_extraction_executor()
+        try:
+            parallel = harvester._extract_csw_records(records, csw_extractor, None, executor)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        assert [dataset["identifier"] for dataset in serial] == list(records)
+        assert parallel == serial
+        assert harvester.gather_errors == []
+
+    def test_broken_extraction_pool_fails_the_page(self, harvester, monkeypatch):
+        monkeypatch.setattr(csw, "extract_from_csw_xml", kill_worker)
+        executor = harvester._get_extraction_executor()
+        try:
+            with pytest.raises(BrokenProcessPool):
+                harvester._extract_csw_records(make_records(4), CSWMetadataExtractor(), None, executor)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        # The page is not read as records with errors
+        assert harvester.gather_errors == []
@@ -0,0 +1,62 @@
+from ckanext.schemingdcat.harvesters.sql.postgres import PostgresDatabaseManager
+
+
+class FakeCursor(object):
+    description = [("identifier",), ("title",)]
+
+    def __init__(self, connection, name=None):
+        self.connection = connection
+        self.name = name
+        self.itersize = None
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def execute(self, query, params=None):
+        self.connection.executed.append((self.name, query, params))
+
+    def fetchmany(self, size):
+        rows, self.connection.rows = self.connection.rows[:size], self.connection.rows[size:]
+        return rows
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection(object):
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+        self.cursors = []
+
+    def cursor(self, name=None):
+        cursor = FakeCursor(self, name)
+        self.cursors.append(cursor)
+        return cursor
+
+
+class TestPostgresDatabaseManager(object):
+    def test_query_is_streamed_from_a_named_cursor(self):
+        manager = PostgresDatabaseManager()
+        connection = FakeConnection([(f"ds-{i}", f"Dataset {i}") for i in range(5)])
+        manager._local.connection = connection
+
+        chunks = list(manager.execute_query_stream(
+            "SET search_path TO main; SELECT id AS identifier, title FROM main.dataset WHERE modified > %(watermark)s",
+            itersize=2,
+            params={"watermark": "2024-01-01"},
+        ))
+
+        assert [len(rows) for rows, _ in chunks] == [2, 2, 1]
+        assert chunks[0][1] == ["identifier", "title"]
+        # The SET statement runs on a regular cursor, the SELECT on a server-side (named) cursor
+        (set_cursor, set_query, _), (select_cursor, select_query, params) = connection.executed
+        assert set_cursor is None and set_query == "SET search_path TO main"
+        assert select_cursor.startswith("schemingdcat_") and select_query.startswith("SELECT")
+        assert params == {"watermark": "2024-01-01"}
+        assert connection.cursors[1].itersize == 2
+        assert all(cursor.closed for cursor in connection.cursors)
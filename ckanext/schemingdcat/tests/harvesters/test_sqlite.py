@@ -0,0 +1,240 @@
+import argparse
+import copy
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+import pytest
+
+import ckan.plugins as p
+
+from ckanext.schemingdcat.harvesters.sql.sqlite import SchemingDCATSQLiteHarvester
+
+FIELD_MAPPINGS = {
+    "dataset_field_mapping": {
+        "identifier": {"field_name": "main.dataset.id"},
+        "title": {"field_name": "main.dataset.title"},
+        "notes": {"field_name": "main.dataset.notes"},
+        "keywords": {"field_name": "main.dataset.keywords"},
+        "modified": {"field_name": "main.dataset.modified", "modified_column": True},
+    },
+    "distribution_field_mapping": {
+        "id": {"field_name": "main.distribution.id"},
+        "dataset_id": {"field_name": "main.distribution.dataset_id"},
+        "url": {"field_name": "main.distribution.url"},
+        "format": {"field_name": "main.distribution.format"},
+    },
+    "datadictionary_field_mapping": None,
+}
+
+
+def make_sqlite_source(path, datasets=1000, distributions_per_dataset=2):
+    """
+    Creates a synthetic SQLite metadata export with `datasets` rows and `distributions_per_dataset`
+    distributions per dataset. The `modified` dates grow with the dataset number.
+    """
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(
+            """
+            CREATE TABLE dataset (id TEXT PRIMARY KEY, title TEXT, notes TEXT, keywords TEXT, modified TEXT);
+            CREATE TABLE distribution (id TEXT PRIMARY KEY, dataset_id TEXT REFERENCES dataset (id), url TEXT, format TEXT);
+            CREATE INDEX distribution_dataset_id ON distribution (dataset_id);
+            CREATE INDEX dataset_modified ON dataset (modified);
+            """
+        )
+        connection.executemany(
+            "INSERT INTO dataset VALUES (?, ?, ?, ?, ?)",
+            (
+                (f"ds-{i}", f"Dataset {i}", f"Description of the dataset {i}", f"kw{i % 10},kw{i % 7}",
+                 f"2024-01-01T00:00:{i:08d}")
+                for i in range(datasets)
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO distribution VALUES (?, ?, ?, ?)",
+            (
+                (f"ds-{i}-{j}", f"ds-{i}", f"https://example.org/ds-{i}/{j}.csv", "CSV")
+                for i in range(datasets)
+                for j in range(distributions_per_dataset)
+            ),
+        )
+        connection.commit()
+    finally:
+        connection.close()
+    return path
+
+
+# Number of datasets of the opt-in benchmark
+BENCHMARK_DATASETS = int(os.environ.get("SCHEMINGDCAT_SQLITE_BENCHMARK_DATASETS", 0))
+
+
+@pytest.fixture
+def base_dir(tmp_path, monkeypatch):
+    monkeypatch.setitem(p.toolkit.config, "ckanext.schemingdcat.sqlite.base_dir", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def harvester():
+    harvester = SchemingDCATSQLiteHarvester()
+    harvester.config = {"itersize": 100, "max_parallel_queries": 3}
+    return harvester
+
+
+class TestSQLiteHarvester:
+    def test_streams_datasets_with_related_content(self, harvester, tmp_path):
+        conn_url = harvester.get_sqlite_uri(make_sqlite_source(str(tmp_path / "source.sqlite"), datasets=250))
+
+        chunks = list(harvester._iter_remote_database(FIELD_MAPPINGS, conn_url))
+
+        assert [len(chunk["datasets"]) for chunk in chunks] == [100, 100, 50]
+        assert list(chunks[0]["datasets"].columns) == ["identifier", "title", "notes", "keywords", "modified"]
+        assert len(chunks[0]["distributions"]) == 500
+        assert harvester.db_manager.connection is None
+
+    def test_field_mapping_is_applied_to_every_chunk(self, harvester, tmp_path):
+        conn_url = harvester.get_sqlite_uri(make_sqlite_source(str(tmp_path / "source.sqlite"), datasets=250))
+        field_mappings = copy.deepcopy(FIELD_MAPPINGS)
+        field_mappings["dataset_field_mapping"]["description"] = {"languages": {"en": {"field_name": "main.dataset.notes"}}}
+        plan = harvester._get_field_mapping_plan(field_mappings["dataset_field_mapping"])
+
+        chunks = [
+            harvester._apply_field_mapping_plan(chunk["datasets"], plan)
+            for chunk in harvester._iter_remote_database(field_mappings, conn_url)
+        ]
+
+        assert len(chunks) == 3
+        for chunk in chunks:
+            assert list(chunk.columns) == ["identifier", "title", "notes", "keywords", "modified", "description-en"]
+        assert chunks[1]["description-en"].iloc[0] == "Description of the dataset 100"
+        # The field mappings used to build the queries are not modified
+        assert field_mappings["dataset_field_mapping"]["identifier"] == {"field_name": "main.dataset.id"}
+
+    def test_incremental_reads_modified_datasets(self, harvester, tmp_path):
+        conn_url = harvester.get_sqlite_uri(make_sqlite_source(str(tmp_path / "source.sqlite"), datasets=250))
+        incremental = {"watermark": "2024-01-01T00:00:00000199"}
+
+        chunks = list(harvester._iter_remote_database(FIELD_MAPPINGS, conn_url, incremental))
+
+        assert sum(len(chunk["datasets"]) for chunk in chunks) == 50
+        assert incremental["next_watermark"] == "2024-01-01T00:00:00000249"
+        assert len(incremental["remote_ids"]) == 250
+
+    def test_parallel_and_serial_queries_read_the_same_content(self, harvester, tmp_path, monkeypatch):
+        conn_url = harvester.get_sqlite_uri(make_sqlite_source(str(tmp_path / "source.sqlite"), datasets=250))
+        results = {}
+        for max_parallel_queries in (3, 1):
+            harvester.config = {"itersize": 100, "max_parallel_queries": max_parallel_queries}
+            threaded = []
+            read_query_in_thread = SchemingDCATSQLiteHarvester._read_query_in_thread
+            monkeypatch.setattr(harvester, "_read_query_in_thread",
+                                lambda *args: threaded.append(args[2]) or read_query_in_thread(harvester, *args))
+            incremental = {"watermark": "2024-01-01T00:00:00000099"}
+
+            chunks = list(harvester._iter_remote_database(FIELD_MAPPINGS, conn_url, incremental))
+
+            results[max_parallel_queries] = {
+                "datasets": pd.concat([chunk["datasets"] for chunk in chunks], ignore_index=True),
+                "distributions": [chunk["distributions"] for chunk in chunks],
+                "incremental": incremental,
+                "threaded": len(threaded),
+            }
+            assert harvester.db_manager.connection is None
+
+        parallel, serial = results[3], results[1]
+        # The distributions and remote identifiers queries only run on worker threads in parallel
+        assert parallel["threaded"] == 2 and serial["threaded"] == 0
+        assert len(parallel["datasets"]) == 150
+        pd.testing.assert_frame_equal(parallel["datasets"], serial["datasets"])
+        for parallel_distributions, serial_distributions in zip(parallel["distributions"], serial["distributions"]):
+            pd.testing.assert_frame_equal(parallel_distributions, serial_distributions)
+        assert len(parallel["incremental"]["remote_ids"]) == 250
+        assert parallel["incremental"] == serial["incremental"]
+
+    def test_incremental_deletes_datasets_missing_from_the_source(self, harvester, tmp_path):
+        path = make_sqlite_source(str(tmp_path / "source.sqlite"), datasets=10)
+        conn_url = harvester.get_sqlite_uri(path)
+        full = {"watermark": None}
+        guids_in_db = {identifier for chunk in harvester._iter_remote_database(FIELD_MAPPINGS, conn_url, full)
+                       for identifier in chunk["datasets"]["identifier"]}
+        assert harvester._get_guids_to_delete(guids_in_db, guids_in_db, full) == set()
+
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute("DELETE FROM distribution WHERE dataset_id IN ('ds-2', 'ds-7')")
+            connection.execute("DELETE FROM dataset WHERE id IN ('ds-2', 'ds-7')")
+            connection.execute("UPDATE dataset SET modified = '2024-02-01' WHERE id = 'ds-4'")
+        connection.close()
+
+        incremental = {"watermark": full["next_watermark"]}
+        guids_in_harvest = {identifier for chunk in harvester._iter_remote_database(FIELD_MAPPINGS, conn_url, incremental)
+                            for identifier in chunk["datasets"]["identifier"]}
+
+        assert guids_in_harvest == {"ds-4"}
+        # The datasets that were not modified are kept, the ones removed from the source are deleted
+        assert harvester._get_guids_to_delete(guids_in_db, guids_in_harvest, incremental) == {"ds-2", "ds-7"}
+        assert harvester._get_guids_to_delete(guids_in_db, guids_in_harvest) == guids_in_db - {"ds-4"}
+
+    def test_database_is_read_only(self, harvester, tmp_path):
+        conn_url = harvester.get_sqlite_uri(make_sqlite_source(str(tmp_path / "source.sqlite"), datasets=1))
+        harvester.db_manager.connect(conn_url)
+        try:
+            with pytest.raises(ValueError):
+                harvester.db_manager.execute_query("DELETE FROM dataset")
+        finally:
+            harvester.db_manager.disconnect()
+
+    def test_validate_config(self, harvester, base_dir):
+        config = {
+            "database_type": "sqlite",
+            "database_path": "catalog.sqlite",
+            "field_mapping_schema_version": 1,
+            "dataset_field_mapping": FIELD_MAPPINGS["dataset_field_mapping"],
+        }
+        assert json.loads(harvester.validate_config(json.dumps(config)))["database_type"] == "sqlite"
+
+        with pytest.raises(ValueError):
+            harvester.validate_config(json.dumps(dict(config, database_type="postgres")))
+        with pytest.raises(ValueError):
+            harvester.validate_config(json.dumps(dict(config, database_path="../catalog.sqlite")))
+
+    def test_database_path_must_be_inside_the_base_dir(self, harvester, base_dir, tmp_path_factory):
+        (base_dir / "exports").mkdir()
+        outside = tmp_path_factory.mktemp("outside") / "catalog.sqlite"
+        (base_dir / "exports" / "link.sqlite").symlink_to(outside)
+
+        assert harvester.get_allowed_database_path("exports/catalog.sqlite") == str(base_dir / "exports" / "catalog.sqlite")
+        assert harvester.get_allowed_database_path(str(base_dir / "catalog.sqlite")) == str(base_dir / "catalog.sqlite")
+        for db_path in ("/etc/passwd", "../catalog.sqlite", "exports/link.sqlite", str(outside)):
+            with pytest.raises(ValueError):
+                harvester.get_allowed_database_path(db_path)
+
+    def test_base_dir_is_required(self, harvester, monkeypatch):
+        monkeypatch.setitem(p.toolkit.config, "ckanext.schemingdcat.sqlite.base_dir", "")
+        with pytest.raises(ValueError):
+            harvester.get_allowed_database_path("catalog.sqlite")
+
+    @pytest.mark.skipif(not BENCHMARK_DATASETS, reason="Set SCHEMINGDCAT_SQLITE_BENCHMARK_DATASETS to run the benchmark")
+    def test_benchmark(self, harvester, tmp_path, record_property):
+        """Reads a synthetic source, its size is set by SCHEMINGDCAT_SQLITE_BENCHMARK_DATASETS."""
+        harvester.config = {"itersize": 2000}
+        conn_url = harvester.get_sqlite_uri(make_sqlite_source(str(tmp_path / "benchmark.sqlite"), datasets=BENCHMARK_DATASETS))
+
+        start = time.perf_counter()
+        read = sum(len(chunk["datasets"]) for chunk in harvester._iter_remote_database(FIELD_MAPPINGS, conn_url))
+        record_property("datasets_per_second", read / max(time.perf_counter() - start, 1e-9))
+
+        assert read == BENCHMARK_DATASETS
+
+if __name__ == "__main__":
+    # Generates a synthetic source for offline load tests of the SQLite harvester
+    parser = argparse.ArgumentParser(description="Generate a synthetic SQLite source for the SQLite harvester.")
+    parser.add_argument("path")
+    parser.add_argument("--datasets", type=int, default=100000)
+    parser.add_argument("--distributions-per-dataset", type=int, default=2)
+    args = parser.parse_args()
+    make_sqlite_source(args.path, args.datasets, args.distributions_per_dataset)
+    print(f"Created {args.path} with {args.datasets} datasets")
@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+
+import pytest
+import sqlalchemy as sa
+
+from ckan import model
+
+from ckanext.schemingdcat.lib.csw.csw_harvester_utils import (
+    IdentifierPackageResolver,
+    find_package_for_identifier,
+)
+
+
+@contextmanager
+def count_queries():
+    """Collects the SQL statements executed on the CKAN engine."""
+    engine = model.Session.get_bind()
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _create_package(name, identifier, state="active"):
+    package = model.Package(name=name, state=state)
+    model.Session.add(package)
+    model.Session.flush()
+    model.Session.add(model.PackageExtra(package_id=package.id, key="identifier", value=identifier))
+    model.Session.commit()
+    return package
+
+
+@pytest.mark.usefixtures("clean_db")
+class TestIdentifierPackageResolver:
+
+    def test_resolves_identifiers_in_chunks(self):
+        packages = {f"id-{i}": _create_package(f"dataset-{i}", f"id-{i}") for i in range(5)}
+        resolver = IdentifierPackageResolver(chunk_size=2)
+
+        with count_queries() as statements:
+            resolved = resolver.resolve(list(packages) + ["missing"])
+
+        assert {identifier: info.package_id for identifier, info in resolved.items()} == {
+            identifier: package.id for identifier, package in packages.items()
+        }
+        # 6 identifiers, 2 per query
+        assert len(statements) == 3
+
+    def test_deleted_packages_are_ignored(self):
+        _create_package("deleted-dataset", "id-deleted", state="deleted")
+        assert IdentifierPackageResolver().resolve(["id-deleted"]) == {}
+
+    def test_lookups_reuse_the_resolved_map(self):
+        package = _create_package("dataset", "id-1")
+        resolver = IdentifierPackageResolver()
+        resolver.resolve(["id-1", "missing"])
+
+        with count_queries() as statements:
+            assert find_package_for_identifier("id-1", resolver).package_id == package.id
+            assert find_package_for_identifier("missing", resolver) is None
+
+        assert statements == []
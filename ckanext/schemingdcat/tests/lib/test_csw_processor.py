@@ -0,0 +1,213 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from lxml import etree
+
+from ckanext.schemingdcat.lib.csw.processor import SchemingDCATCatalogueServiceWeb
+
+CSW_NS = "http://www.opengis.net/cat/csw/2.0.2"
+OGC_NS = "http://www.opengis.net/ogc"
+
+CAPABILITIES = b"""<?xml version="1.0" encoding="UTF-8"?>
+<csw:Capabilities xmlns:csw="http://www.opengis.net/cat/csw/2.0.2" xmlns:ows="http://www.opengis.net/ows" version="2.0.2"/>
+"""
+
+RECORD = """<gmd:MD_Metadata xmlns:gmd="http://www.isotc211.org/2005/gmd" xmlns:gco="http://www.isotc211.org/2005/gco">
+  <gmd:fileIdentifier><gco:CharacterString>{identifier}</gco:CharacterString></gmd:fileIdentifier>
+</gmd:MD_Metadata>"""
+
+RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<csw:GetRecordsResponse xmlns:csw="http://www.opengis.net/cat/csw/2.0.2" version="2.0.2">
+  <csw:SearchStatus timestamp="2024-01-01T00:00:00Z"/>
+  <csw:SearchResults numberOfRecordsMatched="{matches}" numberOfRecordsReturned="{returned}" nextRecord="{nextrecord}" elementSet="full">
+    {records}
+  </csw:SearchResults>
+</csw:GetRecordsResponse>"""
+
+
+class StandInCSW(object):
+    """
+    A local stand-in CSW server with `matches` ISO 19139 records. It answers GetCapabilities
+    and POST GetRecords (hits and results), and can fail the first request of some pages. Requests
+    with a modified-since constraint only match the `modified` record numbers.
+    """
+
+    def __init__(self, matches, delay=0, failing_positions=(), modified=()):
+        self.matches = matches
+        self.modified = sorted(modified)
+        self.element_sets = []
+        self.delay = delay
+        self.failing_positions = set(failing_positions)
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply(200, CAPABILITIES)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                status, response = stand_in.get_records(etree.fromstring(body))
+                self._reply(status, response)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/csw"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get_records(self, request):
+        result_type = request.get("resultType", "results")
+        start = int(request.get("startPosition", 1))
+        maxrecords = int(request.get("maxRecords", 10))
+        numbers = list(range(1, self.matches + 1))
+        if request.find(f".//{{{OGC_NS}}}PropertyIsGreaterThanOrEqualTo") is not None:
+            numbers = self.modified
+        with self._lock:
+            self.requests.append((result_type, start))
+            self.element_sets.append(request.findtext(f".//{{{CSW_NS}}}ElementSetName"))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = result_type == "results" and start in self.failing_positions
+            self.failing_positions.discard(start)
+        try:
+            time.sleep(self.delay)
+            if fail:
+                return 500, b"Internal Server Error"
+
+            if result_type == "hits":
+                identifiers = []
+            else:
+                identifiers = [f"record-{i:05d}" for i in numbers[start - 1:start - 1 + maxrecords]]
+            nextrecord = start + len(identifiers) if start + len(identifiers) <= len(numbers) else 0
+            response = RESPONSE.format(
+                matches=len(numbers),
+                returned=len(identifiers),
+                nextrecord=nextrecord,
+                records="".join(RECORD.format(identifier=identifier) for identifier in identifiers),
+            )
+            return 200, response.encode("utf-8")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(SchemingDCATCatalogueServiceWeb, "_page_retry_delay", 0)
+
+
+class TestGetCSWRecords:
+    def test_pages_are_reassembled_in_order(self):
+        with StandInCSW(matches=230) as csw:
+            client = SchemingDCATCatalogueServiceWeb(csw.url)
+            record_ids = client.get_csw_records(maxrecords=20, max_workers=4)
+
+        assert record_ids == [f"record-{i:05d}" for i in range(1, 231)]
+        assert list(client.csw.records) == record_ids
+        # One hits-only request, then one request per page
+        assert [request for request in csw.requests if request[0] == "hits"] == [("hits", 1)]
+        assert sorted(start for result_type, start in csw.requests if result_type == "results") == list(range(1, 231, 20))
+
+    def test_pages_are_requested_concurrently(self):
+        with StandInCSW(matches=200, delay=0.1) as csw:
+            client = SchemingDCATCatalogueServiceWeb(csw.url)
+            start = time.perf_counter()
+            record_ids = client.get_csw_records(maxrecords=20, max_workers=5)
+            elapsed = time.perf_counter() - start
+
+        assert len(record_ids) == 200
+        assert csw.max_in_flight > 1
+        # 10 pages of 0.1s plus the hits request, in parallel
+        assert elapsed < 0.9
+
+    def test_failed_page_is_retried(self):
+        with StandInCSW(matches=60, failing_positions=[21]) as csw:
+            client = SchemingDCATCatalogueServiceWeb(csw.url)
+            record_ids = client.get_csw_records(maxrecords=20, max_workers=2, retries=1)
+
+        assert record_ids == [f"record-{i:05d}" for i in range(1, 61)]
+        assert [start for result_type, start in csw.requests if result_type == "results"].count(21) == 2
+
+    def test_page_failing_every_retry_raises(self):
+        with StandInCSW(matches=60, failing_positions=[41]) as csw:
+            client = SchemingDCATCatalogueServiceWeb(csw.url)
+            with pytest.raises(Exception):
+                client.get_csw_records(maxrecords=20, max_workers=2, retries=0)
+
+    def test_limit(self):
+        with StandInCSW(matches=230) as csw:
+            client = SchemingDCATCatalogueServiceWeb(csw.url)
+            record_ids = client.get_csw_records(maxrecords=20, limit=50)
+
+        assert record_ids == [f"record-{i:05d}" for i in range(1, 51)]
+        assert len([request for request in csw.requests if request[0] == "results"]) == 3
+
+    def test_no_matches(self):
+        with StandInCSW(matches=0) as csw:
+            client = SchemingDCATCatalogueServiceWeb(csw.url)
+            assert client.get_csw_records() == []
+        assert csw.requests == [("hits", 1)]
+
+
+class TestIterCSWPages:
+    def test_pages_are_requested_ahead_of_consumption_only(self):
+        with StandInCSW(matches=500) as csw:
+            client = SchemingDCATCatalogueServiceWeb(csw.url)
+            pages = client.iter_csw_pages(maxrecords=20, max_workers=2)
+            first_page = next(pages)
+            pages.close()
+
+        assert list(first_page) == [f"record-{i:05d}" for i in range(1, 21)]
+        assert client.matches == 500
+        # The page being consumed and the pages requested ahead of it, not the 25 pages of the result set
+        assert len([request for request in csw.requests if request[0] == "results"]) <= 3
+
+
+class TestIncrementalCSW:
+    def test_modified_since_requests_modified_records_only(self):
+        with StandInCSW(matches=230, modified=[3, 120, 229]) as csw:
+            client = SchemingDCATCatalogueServiceWeb(csw.url)
+            record_ids = client.get_csw_records(modified_since="2024-01-01T00:00:00Z", cql_query="AnyText", cql_search_term="water")
+
+        assert record_ids == ["record-00003", "record-00120", "record-00229"]
+        assert csw.requests == [("hits", 1), ("results", 1)]
+
+    def test_identifiers_are_listed_with_brief_records(self):
+        with StandInCSW(matches=230, modified=[3]) as csw:
+            client = SchemingDCATCatalogueServiceWeb(csw.url)
+            record_ids = client.get_csw_identifiers(maxrecords=100)
+
+        assert record_ids == {f"record-{i:05d}" for i in range(1, 231)}
+        assert set(csw.element_sets) == {"brief"}
+
+    def test_modified_since_constraint_is_combined_with_the_search(self):
+        client = SchemingDCATCatalogueServiceWeb.__new__(SchemingDCATCatalogueServiceWeb)
+        csw_args = client._get_query_args(cql_query="AnyText", cql_search_term="water", modified_since="2024-01-01T00:00:00Z")
+        assert len(csw_args["constraints"]) == 1 and len(csw_args["constraints"][0]) == 2
+
+        csw_args = client._get_query_args(cql="AnyText like '%water%'", modified_since="2024-01-01T00:00:00Z")
+        assert csw_args["cql"] == "(AnyText like '%water%') AND apiso:Modified >= '2024-01-01T00:00:00Z'"
+        assert "constraints" not in csw_args
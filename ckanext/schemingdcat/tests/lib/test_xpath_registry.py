@@ -0,0 +1,99 @@
+import glob
+import os
+import time
+
+import pytest
+from lxml import etree
+from owslib.iso import MD_Metadata
+
+from ckanext.schemingdcat.lib.csw import csw_inspire
+from ckanext.schemingdcat.lib.csw import xpath_registry
+
+GMD_NS = "http://www.isotc211.org/2005/gmd"
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "examples", "csw")
+# Rounds of the opt-in benchmark, its timings are recorded as properties of the JUnit report
+BENCHMARK_ROUNDS = int(os.environ.get("SCHEMINGDCAT_XPATH_BENCHMARK_ROUNDS", 0))
+
+EXTRACTORS = [
+    csw_inspire.IdentificationExtractor,
+    csw_inspire.ExtentExtractor,
+    csw_inspire.QualityExtractor,
+    csw_inspire.ConstraintsExtractor,
+    csw_inspire.ResponsiblePartyExtractor,
+]
+
+
+def load_corpus():
+    """
+    Loads the ISO 19139 records of the examples, and of the directory set in
+    SCHEMINGDCAT_ISO19139_CORPUS if any (e.g. GetRecords responses of a real catalogue).
+    """
+    paths = glob.glob(os.path.join(EXAMPLES_DIR, "*.xml"))
+    corpus_dir = os.environ.get("SCHEMINGDCAT_ISO19139_CORPUS")
+    if corpus_dir:
+        paths.extend(glob.glob(os.path.join(corpus_dir, "*.xml")))
+
+    records = []
+    for path in sorted(paths):
+        with open(path, "rb") as f:
+            content = f.read()
+        # Some examples were saved from a browser, with a note before the XML
+        root = etree.fromstring(content[content.index(b"<"):])
+        records.extend(etree.tostring(md) for md in root.iter(f"{{{GMD_NS}}}MD_Metadata"))
+    return records
+
+
+def extract(records, get_namespaces):
+    results = []
+    for root, metadata in records:
+        namespaces = get_namespaces(root)
+        result = {}
+        for extractor in EXTRACTORS:
+            result.update(extractor(namespaces, root, metadata).extract())
+        results.append(result)
+    return results
+
+
+@pytest.fixture(scope="module")
+def records():
+    records = []
+    for xml in load_corpus():
+        root = etree.fromstring(xml)
+        records.append((root, MD_Metadata(root)))
+    assert records
+    return records
+
+
+class TestXPathRegistry:
+
+    def test_namespace_maps_are_interned(self, records):
+        root = records[0][0]
+        namespaces = xpath_registry.get_namespaces(dict(root.nsmap))
+        assert xpath_registry.get_namespaces(etree.fromstring(etree.tostring(root)).nsmap) is namespaces
+        assert None not in xpath_registry.get_namespaces({None: GMD_NS, "gmd": GMD_NS})
+
+    def test_compiled_expressions_are_shared(self, records):
+        namespaces = xpath_registry.get_namespaces(records[0][0].nsmap)
+        expression = ".//gmd:EX_GeographicBoundingBox"
+        assert xpath_registry.get_xpath(expression, namespaces) is xpath_registry.get_xpath(expression, dict(namespaces))
+
+    def test_results_match_string_expressions(self, records, monkeypatch):
+        compiled = extract(records, lambda root: xpath_registry.get_namespaces(root.nsmap))
+
+        monkeypatch.setattr(csw_inspire, "xpath", lambda element, expression, namespaces: element.xpath(expression, namespaces=namespaces))
+        assert extract(records, lambda root: root.nsmap) == compiled
+        assert compiled[0]["title"]
+
+    @pytest.mark.skipif(not BENCHMARK_ROUNDS, reason="Set SCHEMINGDCAT_XPATH_BENCHMARK_ROUNDS to run the benchmark")
+    def test_benchmark(self, records, monkeypatch, record_property):
+        """Per-record extraction time of the INSPIRE extractors, with and without the registry."""
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_ROUNDS):
+            extract(records, lambda root: xpath_registry.get_namespaces(root.nsmap))
+        record_property("compiled_seconds_per_record", (time.perf_counter() - start) / (BENCHMARK_ROUNDS * len(records)))
+
+        monkeypatch.setattr(csw_inspire, "xpath", lambda element, expression, namespaces: element.xpath(expression, namespaces=namespaces))
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_ROUNDS):
+            extract(records, lambda root: root.nsmap)
+        record_property("uncompiled_seconds_per_record", (time.perf_counter() - start) / (BENCHMARK_ROUNDS * len(records)))
@@ -0,0 +1,163 @@
+from contextlib import contextmanager
+
+import pytest
+import sqlalchemy as sa
+
+from ckan import model
+
+from ckanext.schemingdcat.statistics import model as stats_model
+
+
+@contextmanager
+def count_queries():
+    """Collects the SQL statements executed on the CKAN engine."""
+    engine = model.Session.get_bind()
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _theme_rows(count, stat_count=1):
+    return [
+        {
+            "id": f"theme_t{i}",
+            "stat_count": stat_count,
+            "stat_type": "theme",
+            "value": f"http://inspire.ec.europa.eu/theme/t{i}",
+            "icon": None,
+            "label": f"t{i}",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def statistics_table(clean_db):
+    if stats_model.statistics_table is None:
+        stats_model.define_tables()
+    stats_model.statistics_table.create(bind=model.Session.get_bind(), checkfirst=True)
+    model.Session.execute(stats_model.statistics_table.delete())
+    model.Session.commit()
+    yield stats_model.statistics_table
+    model.Session.execute(stats_model.statistics_table.delete())
+    model.Session.commit()
+
+
+@pytest.mark.usefixtures("statistics_table")
+class TestBulkUpsertStatistics:
+
+    def test_inserts_and_updates_rows(self):
+        stats_model.bulk_upsert_statistics(_theme_rows(3), fill_fields=("icon", "label"))
+
+        rows = _theme_rows(3, stat_count=5)
+        rows[0]["icon"] = "/images/icons/theme/t0.svg"
+        rows[1]["label"] = "new-label"
+        stats_model.bulk_upsert_statistics(rows, fill_fields=("icon", "label"))
+
+        stats = {stat.id: stat for stat in stats_model.PortalStatistics.all()}
+        assert len(stats) == 3
+        assert all(stat.stat_count == 5 for stat in stats.values())
+        # Empty icons are filled, existing labels are kept
+        assert stats["theme_t0"].icon == "/images/icons/theme/t0.svg"
+        assert stats["theme_t1"].label == "t1"
+
+    def test_query_count_is_constant(self):
+        queries = {}
+        for size in (10, 1000):
+            stats_model.bulk_upsert_statistics(_theme_rows(size))
+
+            with count_queries() as statements:
+                stats_model.bulk_upsert_statistics(_theme_rows(size, stat_count=2))
+            queries[size] = len(statements)
+
+            model.Session.execute(stats_model.statistics_table.delete())
+            model.Session.commit()
+
+        assert queries[10] == queries[1000]
+
+
+def _portal_rows(stat_count=10):
+    return [
+        {"id": stat_id, "stat_count": stat_count, "stat_type": "portal", "value": stat_id, "icon": None, "label": stat_id}
+        for stat_id in ("datasets", "spatial_datasets", "groups")
+    ]
+
+
+def _snapshot(themes, counted=True, spatial=False):
+    return {"id": "pkg", "counted": counted, "spatial": spatial, "themes": set(themes)}
+
+
+def _stat_counts():
+    return {stat.id: stat.stat_count for stat in stats_model.PortalStatistics.all()}
+
+
+@pytest.mark.usefixtures("statistics_table")
+class TestApplyDelta:
+
+    def setup_method(self):
+        self.theme = "http://inspire.ec.europa.eu/theme/"
+
+    def test_created_dataset(self):
+        stats_model.bulk_upsert_statistics(_portal_rows() + _theme_rows(1))
+
+        stats_model.apply_dataset_delta(None, _snapshot([self.theme + "t0", self.theme + "t1"], spatial=True), theme_field="theme")
+
+        counts = _stat_counts()
+        assert counts["datasets"] == 11
+        assert counts["spatial_datasets"] == 11
+        assert counts["theme_t0"] == 2
+        # Missing theme rows are created
+        assert counts["theme_t1"] == 1
+        assert stats_model.PortalStatistics.get(id="theme_t1").value == self.theme + "t1"
+
+    def test_updated_dataset(self):
+        stats_model.bulk_upsert_statistics(_portal_rows() + _theme_rows(2))
+        old = _snapshot([self.theme + "t0", self.theme + "t1"], spatial=True)
+        new = _snapshot([self.theme + "t1", self.theme + "t2"])
+
+        stats_model.apply_dataset_delta(old, new, theme_field="theme")
+
+        counts = _stat_counts()
+        assert counts["datasets"] == 10
+        assert counts["spatial_datasets"] == 9
+        assert counts["theme_t0"] == 0
+        assert counts["theme_t1"] == 1
+        assert counts["theme_t2"] == 1
+
+    def test_deleted_dataset(self):
+        stats_model.bulk_upsert_statistics(_portal_rows() + _theme_rows(1))
+        old = _snapshot([self.theme + "t0"])
+
+        stats_model.apply_dataset_delta(old, None, theme_field="theme")
+
+        counts = _stat_counts()
+        assert counts["datasets"] == 9
+        assert counts["spatial_datasets"] == 10
+        assert counts["theme_t0"] == 0
+
+    def test_dataset_no_longer_counted(self):
+        stats_model.bulk_upsert_statistics(_portal_rows() + _theme_rows(1))
+        old = _snapshot([self.theme + "t0"])
+
+        # e.g. a dataset made private
+        stats_model.apply_dataset_delta(old, _snapshot([self.theme + "t0"], counted=False), theme_field="theme")
+
+        counts = _stat_counts()
+        assert counts["datasets"] == 9
+        assert counts["theme_t0"] == 0
+
+    def test_counter_delta(self):
+        stats_model.bulk_upsert_statistics(_portal_rows())
+
+        stats_model.apply_counter_delta("group", 1)
+        assert _stat_counts()["groups"] == 11
+
+        stats_model.apply_counter_delta("group", -2)
+        assert _stat_counts()["groups"] == 9
@@ -0,0 +1,56 @@
+import pytest
+
+from ckan import model
+
+from ckanext.schemingdcat.statistics import model as stats_model
+from ckanext.schemingdcat.statistics.scheduler import StatisticsRefreshScheduler
+
+
+@pytest.mark.usefixtures("clean_db")
+class TestStatisticsRefreshScheduler:
+
+    def test_flush_refreshes_the_changes_of_other_processes(self):
+        # The fetch consumer marks the statistics as dirty, the harvest jobs run in another process
+        consumer = StatisticsRefreshScheduler(refresh=lambda: None, interval=3600)
+        consumer.mark_dirty("package_update")
+        consumer._timer.cancel()
+        assert stats_model.is_refresh_pending()
+
+        refreshes = []
+        scheduler = StatisticsRefreshScheduler(refresh=lambda: refreshes.append("refresh"), interval=3600)
+        scheduler.flush("harvest_jobs_run")
+
+        assert refreshes == ["refresh"]
+        assert not stats_model.is_refresh_pending()
+        assert scheduler.status()["last_events"] == 0
+
+    def test_flush_without_pending_changes_does_nothing(self):
+        refreshes = []
+        scheduler = StatisticsRefreshScheduler(refresh=lambda: refreshes.append("refresh"), interval=3600)
+        scheduler.flush("harvest_jobs_run")
+
+        assert refreshes == []
+        assert scheduler.status()["last_run"] is None
+
+    def test_failed_refresh_stays_pending(self):
+        def refresh():
+            raise RuntimeError("Solr is not available")
+
+        scheduler = StatisticsRefreshScheduler(refresh=refresh, interval=3600)
+        scheduler.mark_dirty("package_create")
+        scheduler.flush("harvest_jobs_run")
+        if scheduler._timer is not None:
+            scheduler._timer.cancel()
+
+        assert scheduler.status()["last_error"] == "Solr is not available"
+        assert stats_model.is_refresh_pending()
+
+    def test_pending_flag_does_not_commit_the_session(self):
+        model.Session.add(model.Package(name="uncommitted-dataset"))
+        scheduler = StatisticsRefreshScheduler(refresh=lambda: None, interval=3600)
+        scheduler.mark_dirty("package_create")
+        scheduler._timer.cancel()
+        model.Session.rollback()
+
+        assert stats_model.is_refresh_pending()
+        assert model.Package.by_name("uncommitted-dataset") is None
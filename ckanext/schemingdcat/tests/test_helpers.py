@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+import ckanext.schemingdcat.helpers as helpers
+
+
+class FakePackageSearch:
+    """Answers `package_search` with the given facets and datasets, recording the search dicts."""
+
+    def __init__(self, facets=None, datasets=()):
+        self.facets = facets or {}
+        self.datasets = list(datasets)
+        self.searches = []
+
+    def __call__(self, context, data_dict):
+        self.searches.append(dict(data_dict))
+        if 'facet.field' in data_dict:
+            return {'count': len(self.datasets), 'facets': self.facets, 'results': []}
+        if data_dict.get('rows') == 0:
+            return {'count': len(self.datasets), 'results': []}
+        start = data_dict['start']
+        return {'count': len(self.datasets), 'results': self.datasets[start:start + data_dict['rows']]}
+
+
+@pytest.fixture
+def package_search(monkeypatch):
+    def setup(**kwargs):
+        search = FakePackageSearch(**kwargs)
+        monkeypatch.setattr(helpers.logic, 'get_action', lambda name: search)
+        return search
+    return setup
+
+
+class TestGetThemeCounts:
+
+    def test_counts_come_from_a_single_facet_query(self, package_search):
+        search = package_search(facets={'theme': {'economy': 3, 'health': 1}})
+
+        assert helpers.get_theme_counts('theme') == {'economy': 3, 'health': 1}
+        assert len(search.searches) == 1
+        assert json.loads(search.searches[0]['facet.field']) == ['theme']
+        assert search.searches[0]['rows'] == 0
+
+    def test_no_datasets_with_the_field(self, package_search):
+        search = package_search()
+
+        assert helpers.get_theme_counts('theme') == {}
+        # The facet query and the check of the extras, without paging through the datasets
+        assert len(search.searches) == 2
+
+    def test_fallback_counts_the_dataset_extras(self, package_search):
+        datasets = [
+            {'extras_theme': json.dumps(['economy', 'health'])},
+            {'extras_theme': json.dumps('economy')},
+            {'extras_theme': '[invalid'},
+        ] * 60
+        search = package_search(datasets=datasets)
+
+        assert helpers.get_theme_counts('theme') == {'economy': 120, 'health': 60}
+        # The facet query, the check of the extras and two pages of 100 datasets
+        assert [s.get('start') for s in search.searches[2:]] == [0, 100]
+
+
+class TestOpenDataStatisticsCache:
+
+    @pytest.fixture(autouse=True)
+    def statistics(self, monkeypatch):
+        self.now = 1000.0
+        self.calls = 0
+
+        def statistics_list(context, data_dict):
+            self.calls += 1
+            return [{'id': 'datasets', 'value': 'datasets', 'label': 'Datasets', 'icon': None,
+                     'stat_count': self.calls, 'stat_type': 'portal'}]
+
+        monkeypatch.setattr(helpers, '_open_data_statistics', None)
+        monkeypatch.setattr(helpers, '_open_data_statistics_expires', 0)
+        monkeypatch.setattr(helpers.time, 'monotonic', lambda: self.now)
+        monkeypatch.setattr(helpers.logic, 'get_action', lambda name: statistics_list)
+        monkeypatch.setitem(helpers.p.toolkit.config, 'ckanext.schemingdcat.open_data_statistics.cache_ttl', '60')
+
+    def test_statistics_are_cached_until_the_ttl_expires(self):
+        assert helpers._get_cached_open_data_statistics()['datasets']['stat_count'] == 1
+
+        self.now += 59
+        assert helpers._get_cached_open_data_statistics()['datasets']['stat_count'] == 1
+        assert self.calls == 1
+
+        self.now += 1
+        assert helpers._get_cached_open_data_statistics()['datasets']['stat_count'] == 2
+        assert self.calls == 2
+
+    def test_invalidate_reloads_the_statistics(self):
+        helpers._get_cached_open_data_statistics()
+
+        helpers.invalidate_open_data_statistics_cache()
+
+        assert helpers._get_cached_open_data_statistics()['datasets']['stat_count'] == 2
+        assert helpers.schemingdcat_get_open_data_statistics(stat_type='portal')['datasets']['stat_count'] == 2
+        assert self.calls == 2